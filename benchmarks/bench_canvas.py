@@ -0,0 +1,60 @@
+"""Benchmark incremental canvas rasterization as the board grows.
+
+Adds strokes in batches and times ``InkCanvas.to_image`` after each batch. With the cached
+raster layer the per-stroke cost should stay flat regardless of how much ink is already on
+the board; the ``full`` column shows the cost of a cold redraw for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ink.canvas import InkCanvas  # noqa: E402
+
+
+def _random_stroke(rng: np.random.Generator, width: int, height: int, points: int) -> np.ndarray:
+    start = rng.integers((0, 0), (width, height))
+    steps = rng.integers(-6, 7, size=(points, 2))
+    return np.clip(start + np.cumsum(steps, axis=0), 0, (width - 1, height - 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--strokes-per-batch", type=int, default=200)
+    parser.add_argument("--points", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    canvas = InkCanvas(args.width, args.height)
+    canvas.render()
+    print(f"{'strokes':>8} {'points':>9} {'incr us/stroke':>15} {'full us/stroke':>15}")
+    for _ in range(args.batches):
+        for _ in range(args.strokes_per_batch):
+            canvas.new_stroke().extend(_random_stroke(rng, args.width, args.height, args.points))
+        start = time.perf_counter()
+        canvas.render()
+        incremental = time.perf_counter() - start
+
+        cold = InkCanvas(args.width, args.height, store=canvas.store)
+        start = time.perf_counter()
+        cold.render()
+        full = time.perf_counter() - start
+        cold.close()
+        print(
+            f"{len(canvas.strokes):>8} {canvas.strokes.total_points:>9} "
+            f"{incremental / args.strokes_per_batch * 1e6:>15.1f} "
+            f"{full / args.strokes_per_batch * 1e6:>15.1f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
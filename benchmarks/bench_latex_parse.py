@@ -0,0 +1,109 @@
+"""Benchmark the single-pass LaTeX parser against the legacy replace/regex pipeline.
+
+Builds long multi-line expressions in the LaTeX subset both implementations accept
+(spacing commands, ``\\cdot``, ``\\left``/``\\right``, braces, implicit products written
+with spaces) and times parsing each one to an :class:`Expression`, without caches.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import itertools
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from nl.expressions import Expression  # noqa: E402
+from nl.latex_parser import parse_latex  # noqa: E402
+
+
+def _legacy_parse(latex: str) -> Expression:
+    """The pre-parser pipeline: chained str.replace, uncompiled re.sub, then ast.parse."""
+
+    expr = latex.replace("\\,", " ").replace("\\!", " ")
+    expr = expr.replace("\\left", "").replace("\\right", "")
+    expr = expr.replace("{", "(").replace("}", ")")
+    expr = expr.replace("\\cdot", "*")
+    expr = expr.replace("\\times", "*")
+    expr = re.sub(r"(?<=\d)\s+(?=[A-Za-z(])", "*", expr)
+    expr = re.sub(r"(?<=[A-Za-z)])\s+(?=[A-Za-z(])", "*", expr)
+    expr = re.sub(r"\s+", "", expr)
+    expr = expr.replace("^", "**")
+    return Expression.parse(expr)
+
+
+def _term(rng: random.Random) -> str:
+    coeff = rng.randint(1, 99)
+    var = rng.choice("xyz")
+    power = rng.randint(1, 9)
+    shape = rng.randrange(4)
+    if shape == 0:
+        return f"{coeff} {var}^{{{power}}}"
+    if shape == 1:
+        return f"{coeff} \\cdot \\left( {var} + {rng.randint(1, 9)} \\right)^{power}"
+    if shape == 2:
+        return f"{coeff}\\,{var} {rng.choice('xyz')}"
+    return f"\\left( {var} - {coeff} \\right) \\left( {var} + {power} \\right)"
+
+
+def build_expression(terms: int, per_line: int = 4, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for start in range(0, terms, per_line):
+        count = min(per_line, terms - start)
+        lines.append(" + ".join(_term(rng) for _ in range(count)))
+    return " \n+ ".join(lines)
+
+
+def _same_tree(left: ast.AST, right: ast.AST) -> bool:
+    """Structural equality without recursion (``ast.dump`` overflows on 1000-term sums)."""
+
+    for a, b in itertools.zip_longest(ast.walk(left), ast.walk(right)):
+        if type(a) is not type(b):
+            return False
+        fields_a = [v for _, v in ast.iter_fields(a) if not isinstance(v, (ast.AST, list))]
+        fields_b = [v for _, v in ast.iter_fields(b) if not isinstance(v, (ast.AST, list))]
+        if fields_a != fields_b:
+            return False
+    return True
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terms", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--count", type=int, default=200, help="expressions per batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'terms':>6} {'chars':>8} {'legacy ms':>10} {'parser ms':>10} {'speedup':>8} {'MB/s':>7}")
+    for terms in args.terms:
+        count = max(1, args.count * 10 // terms)
+        batch = [build_expression(terms, seed=seed) for seed in range(count)]
+        for latex in batch[:3]:
+            parsed, _ = parse_latex(latex)
+            assert _same_tree(parsed.node, _legacy_parse(latex).node)
+        legacy_ms = _time(lambda: [_legacy_parse(latex) for latex in batch], args.repeat)
+        parser_ms = _time(lambda: [parse_latex(latex) for latex in batch], args.repeat)
+        chars = sum(map(len, batch))
+        print(
+            f"{terms:>6} {chars // count:>8} {legacy_ms / count:>10.3f} {parser_ms / count:>10.3f} "
+            f"{legacy_ms / max(parser_ms, 1e-9):>7.2f}x {chars / 1e3 / max(parser_ms, 1e-9):>7.1f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
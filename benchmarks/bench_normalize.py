@@ -0,0 +1,111 @@
+"""Benchmark the precompiled OCR normalizer against the legacy replace/regex chain.
+
+Generates beam-search-like candidate lists (near-duplicate LaTeX strings containing the
+characters and patterns the normalizer rewrites), checks that every implementation returns
+identical output, then times the legacy function, ``normalize_text`` per candidate and
+``normalize_batch`` per crop.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ocr.normalize import COMMON_REPLACEMENTS, normalize_batch, normalize_text  # noqa: E402
+
+# Adversarial pieces for the equivalence check: every rewrite trigger, densely mixed.
+PIECES = [
+    "x", "l", "L", "O", " ", "  ", "\n", "−", "–", "—", "÷", "×", "∠", "°", "\\angle", "\\angle ",
+    "mathrm{dx}", "\\mathrm{dx}", " \\mathrm{dx}", "2", "10", "+", "=", "\\frac{1}{2}", "y^2", "(",
+    ")", "lO", "Ol", "\\int_0^1",
+]
+# Typical recognizer output for timing: mostly clean LaTeX with occasional misreads.
+REALISTIC = [
+    "x", "y", "^{2}", "^{3}", " - ", " + ", "5", "12", "=", "0", " ", "\\frac{1}{2}", "\\int_{0}^{1}",
+    "\\,", "dx", "(", ")", "\\sqrt{x}", "\\cdot", "a", "b",
+] * 8 + ["l", "O", "−", "×", "°", "\\mathrm{dx}"]
+
+
+def _legacy_normalize(text: str) -> str:
+    def replace(match: re.Match[str]) -> str:
+        token = match.group(0)
+        return "1" if token.lower() == "l" else token
+
+    result = text
+    for src, dst in COMMON_REPLACEMENTS.items():
+        result = result.replace(src, dst)
+    result = re.sub(r"(?<=\\angle)\s+", "", result)
+    result = re.sub(r"\b[lL]\b", replace, result)
+    result = result.replace("O", "0")
+    result = re.sub(r"\\?mathrm\{dx\}", " dx", result)
+    result = re.sub(r"\s+", " ", result)
+    return result.strip()
+
+
+def beams(
+    rng: random.Random, width: int, pieces: int, alphabet: Sequence[str] = PIECES
+) -> List[str]:
+    """A best candidate plus ``width - 1`` variants that differ in a few pieces."""
+
+    best = [rng.choice(alphabet) for _ in range(pieces)]
+    result = ["".join(best)]
+    for _ in range(width - 1):
+        variant = list(best)
+        for _ in range(rng.randint(0, 3)):
+            variant[rng.randrange(pieces)] = rng.choice(alphabet)
+        result.append("".join(variant))
+    return result
+
+
+def verify(samples: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(samples):
+        batch = beams(rng, rng.randint(1, 8), rng.randint(1, 12))
+        expected = [_legacy_normalize(text) for text in batch]
+        assert [normalize_text(text) for text in batch] == expected, batch
+        assert normalize_batch(batch) == expected, batch
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crops", type=int, default=2000)
+    parser.add_argument("--beams", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--pieces", type=int, default=24)
+    parser.add_argument("--verify", type=int, default=20000, help="random equivalence checks")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    verify(args.verify, seed=1)
+    print(f"verified {args.verify} random candidate lists against the legacy normalizer")
+    print(f"{'beams':>6} {'legacy ms':>10} {'text ms':>10} {'batch ms':>10} {'speedup':>8}")
+    rng = random.Random(0)
+    for width in args.beams:
+        crops = [beams(rng, width, args.pieces, REALISTIC) for _ in range(args.crops)]
+        legacy_ms = _time(
+            lambda: [[_legacy_normalize(text) for text in crop] for crop in crops], args.repeat
+        )
+        text_ms = _time(lambda: [[normalize_text(text) for text in crop] for crop in crops], args.repeat)
+        batch_ms = _time(lambda: [normalize_batch(crop) for crop in crops], args.repeat)
+        print(
+            f"{width:>6} {legacy_ms:>10.2f} {text_ms:>10.2f} {batch_ms:>10.2f} "
+            f"{legacy_ms / max(min(text_ms, batch_ms), 1e-9):>7.1f}x"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark the dense Polynomial engine against the legacy Dict[int, float] path.
+
+Times ``(x + 1)**n`` expansion, a product of two high-degree polynomials and ``x**n`` built
+from an AST the way OCR output reaches the solvers.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from solve.polynomials import Polynomial, combine, multiply, poly_from_ast  # noqa: E402
+
+
+def _legacy_pow(base: Dict[int, float], exponent: int) -> Dict[int, float]:
+    result = {0: 1.0}
+    for _ in range(exponent):
+        result = multiply(result, base)
+    return result
+
+
+def _legacy_from_ast(node: ast.AST, variable: str) -> Dict[int, float]:
+    """The pre-dense from_ast: repeated dict multiplication for powers."""
+
+    if isinstance(node, ast.Constant):
+        return {0: float(node.value)}
+    if isinstance(node, ast.Name):
+        return {1: 1.0}
+    if isinstance(node, ast.BinOp):
+        left = _legacy_from_ast(node.left, variable)
+        if isinstance(node.op, ast.Pow):
+            return _legacy_pow(left, int(node.right.value))  # type: ignore[attr-defined]
+        right = _legacy_from_ast(node.right, variable)
+        if isinstance(node.op, ast.Add):
+            return combine(left, right)
+        if isinstance(node.op, ast.Mult):
+            return multiply(left, right)
+    raise ValueError(ast.dump(node))
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--degrees", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'case':<22} {'degree':>7} {'dict ms':>10} {'dense ms':>10} {'speedup':>8}")
+    for degree in args.degrees:
+        binomial_dict = {0: 1.0, 1: 1.0}
+        binomial = Polynomial([1.0, 1.0])
+        dense_a = Polynomial(range(degree + 1))
+        dict_a = dense_a.to_dict()
+        node = ast.parse(f"x**{degree} + 3*x + 1", mode="eval").body
+        cases = {
+            "(x+1)**n": (
+                lambda: _legacy_pow(binomial_dict, degree),
+                lambda: binomial**degree,
+            ),
+            "p(x)*p(x)": (lambda: multiply(dict_a, dict_a), lambda: dense_a * dense_a),
+            "from_ast x**n": (
+                lambda: _legacy_from_ast(node, "x"),
+                lambda: poly_from_ast(node, "x"),
+            ),
+        }
+        for name, (legacy, dense) in cases.items():
+            legacy_ms = _time(legacy, args.repeat)
+            dense_ms = _time(dense, args.repeat)
+            print(
+                f"{name:<22} {degree:>7} {legacy_ms:>10.3f} {dense_ms:>10.3f} "
+                f"{legacy_ms / max(dense_ms, 1e-9):>7.1f}x"
+            )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,462 @@
+"""End-to-end benchmark suite for the ink, OCR-normalize, parse, solve and render hot paths.
+
+Each case times one hot path on synthetic inputs of increasing size (boards with more
+strokes, longer expressions, higher-degree polynomials) or on the fixtures in
+``benchmarks/fixtures`` (``*.board.json`` ink boards, ``*.tex`` expression corpora - drop
+recorded sessions there to include them). Results are written as JSON; with ``--baseline``
+the run is compared against a stored result and exits non-zero when any case got slower by
+more than ``--threshold``. Comparisons use the best round (``--statistic min``) by default,
+which is far less sensitive to background load than the median, and baseline timings are
+scaled by the ratio of a fixed calibration workload timed next to each case in both runs, so
+a machine that is uniformly slower or faster (or drifts during a run) does not read as a
+regression or hide one.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline benchmarks/baselines/default.json
+    python benchmarks/suite.py --quick --save-baseline benchmarks/baselines/default.json
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ink.canvas import InkCanvas  # noqa: E402
+from ink.shapes import TriangleDetector  # noqa: E402
+from nl.latex_to_sympy import clear_parse_cache, latex_to_sympy  # noqa: E402
+from ocr.normalize import normalize_batch  # noqa: E402
+from render.latex import clear_render_cache, render_latex  # noqa: E402
+from solve.polynomials import from_ast  # noqa: E402
+from solve.triangle import solve_triangle, solve_triangles  # noqa: E402
+from storage.session import open_session, save_session  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SCHEMA_VERSION = 1
+
+# A case is a name, its parameters and a factory returning the zero-argument callable to
+# time (setup work happens in the factory, outside the timed region).
+Factory = Callable[[], Callable[[], object]]
+
+
+@dataclass
+class Case:
+    name: str
+    factory: Factory
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CaseResult:
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    rounds: int
+    params: Dict[str, Any]
+    calibration_ms: float = 0.0
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms > 0 else float("inf")
+
+
+# -- synthetic inputs --------------------------------------------------------
+
+
+def _scribble(rng: np.random.Generator, width: int, height: int, points: int) -> np.ndarray:
+    start = rng.integers((0, 0), (width, height))
+    steps = rng.integers(-6, 7, size=(points, 2))
+    return np.clip(start + np.cumsum(steps, axis=0), 0, (width - 1, height - 1))
+
+
+def _board(strokes: int, width: int = 1280, height: int = 720, seed: int = 0) -> InkCanvas:
+    rng = np.random.default_rng(seed)
+    canvas = InkCanvas(width, height)
+    for _ in range(strokes):
+        canvas.new_stroke().extend(_scribble(rng, width, height, 40))
+    return canvas
+
+
+def _triangle_board(count: int, seed: int = 0) -> InkCanvas:
+    rng = np.random.default_rng(seed)
+    columns = max(1, int(np.ceil(np.sqrt(count))))
+    canvas = InkCanvas(columns * 260, columns * 260)
+    for idx in range(count):
+        x, y = (idx % columns) * 260 + 30, (idx // columns) * 260 + 30
+        corners = np.array([(x, y + 200), (x + 200, y + 200), (x + 100, y), (x, y + 200)])
+        jitter = rng.integers(-3, 4, size=corners.shape)
+        canvas.new_stroke().extend(corners + jitter)
+    return canvas
+
+
+def _long_expression(terms: int) -> str:
+    parts = [
+        f"{k + 1} x^{{{k % 7 + 1}}}" if k % 3 else f"\\frac{{{k}}}{{2}} y" for k in range(terms)
+    ]
+    return " + ".join(parts) + " = 0"
+
+
+def _load_board(path: Path) -> InkCanvas:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    canvas = InkCanvas(int(data["width"]), int(data["height"]))
+    for stroke in data["strokes"]:
+        canvas.new_stroke(thickness=int(stroke.get("thickness", 3))).extend(stroke["points"])
+    return canvas
+
+
+def _load_corpus(path: Path) -> List[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if line.strip() and not line.startswith("%")]
+
+
+# -- cases -------------------------------------------------------------------
+
+
+def _cold_render(canvas: InkCanvas) -> Callable[[], object]:
+    def run() -> object:
+        cold = InkCanvas(canvas.width, canvas.height, store=canvas.store)
+        image = cold.to_image()
+        cold.close()
+        return image
+
+    return run
+
+
+def _incremental_render(strokes: int) -> Callable[[], object]:
+    canvas = _board(strokes)
+    canvas.to_image()
+    rng = np.random.default_rng(1)
+
+    def run() -> object:
+        canvas.new_stroke().extend(_scribble(rng, canvas.width, canvas.height, 40))
+        return canvas.to_image()
+
+    return run
+
+
+def _detect(canvas: InkCanvas) -> Callable[[], object]:
+    detector = TriangleDetector()
+    strokes = list(canvas.strokes)
+
+    def run() -> object:
+        detector.clear_cache()
+        return detector.detect(strokes)
+
+    return run
+
+
+_SCRATCH: Optional[tempfile.TemporaryDirectory] = None
+
+
+def _scratch() -> Path:
+    """One temporary directory per run for files cases need; removed by ``_cleanup``."""
+
+    global _SCRATCH
+    if _SCRATCH is None:
+        _SCRATCH = tempfile.TemporaryDirectory(prefix="inkmath-bench-")
+    return Path(_SCRATCH.name)
+
+
+def _cleanup() -> None:
+    global _SCRATCH
+    if _SCRATCH is not None:
+        _SCRATCH.cleanup()
+        _SCRATCH = None
+
+
+def _session(strokes: int, rect: Optional[Tuple[int, int, int, int]]) -> Callable[[], object]:
+    # Boards are seeded, so every case and re-timing with the same size shares one file.
+    path = _scratch() / f"board-{strokes}.inkm"
+    if not path.exists():
+        save_session(path, _board(strokes))
+
+    def run() -> object:
+        with open_session(path) as session:
+            if rect is None:
+                return len(session)
+            return session.points_of(session.strokes_in(rect))
+
+    return run
+
+
+def _parse(expressions: Sequence[str]) -> Callable[[], object]:
+    def run() -> object:
+        clear_parse_cache()
+        return [latex_to_sympy(latex) for latex in expressions]
+
+    return run
+
+
+def _from_ast(degree: int) -> Callable[[], object]:
+    expression, _ = latex_to_sympy(f"(x + 1)^{{{degree}}} + 3 x^{{{degree // 2}}} - 7")
+    node = expression.node
+    return lambda: from_ast(node, "x")
+
+
+def _triangles_scalar(count: int) -> Callable[[], object]:
+    rows = [{"a": 3.0 + i % 5, "b": 4.0 + i % 3, "C": 20.0 + i % 120} for i in range(count)]
+    return lambda: [solve_triangle(dict(row)) for row in rows]
+
+
+def _triangles_batch(count: int) -> Callable[[], object]:
+    idx = np.arange(count)
+    columns = {"a": 3.0 + idx % 5, "b": 4.0 + idx % 3, "C": 20.0 + idx % 120}
+    return lambda: solve_triangles(columns)
+
+
+def _render(latex: str) -> Callable[[], object]:
+    def run() -> object:
+        clear_render_cache()
+        return render_latex(latex)
+
+    return run
+
+
+def _normalize(crops: int, beams: int) -> Callable[[], object]:
+    base = ["x^{2} − 5 x + 6 = O", "\\int_{0}^{l} x \\mathrm{dx}", "∠C = 9O°", "a × b ÷ 2"]
+    batches = [[f"{base[(i + j) % len(base)]} + {j}" for j in range(beams)] for i in range(crops)]
+    return lambda: [normalize_batch(batch) for batch in batches]
+
+
+def build_cases(quick: bool = False) -> List[Case]:
+    strokes = (100, 1000) if quick else (100, 1000, 5000)
+    triangles = (4, 16) if quick else (4, 16, 64)
+    terms = (10, 100) if quick else (10, 100, 1000)
+    degrees = (50, 400) if quick else (50, 400, 2000)
+    cases: List[Case] = []
+
+    def add(name: str, factory: Factory, **params: Any) -> None:
+        cases.append(Case(name, factory, params))
+
+    for n in strokes:
+        add(f"ink.to_image.cold[{n}]", lambda n=n: _cold_render(_board(n)), strokes=n)
+        add(f"ink.to_image.incremental[{n}]", lambda n=n: _incremental_render(n), strokes=n)
+    for n in triangles:
+        add(f"ink.detect_triangles[{n}]", lambda n=n: _detect(_triangle_board(n)), triangles=n)
+    for n in terms:
+        add(f"nl.latex_to_sympy[{n}]", lambda n=n: _parse([_long_expression(n)]), terms=n)
+    for n in degrees:
+        add(f"solve.from_ast[{n}]", lambda n=n: _from_ast(n), degree=n)
+    for n in strokes:
+        add(f"storage.open_session[{n}]", lambda n=n: _session(n, None), strokes=n)
+        add(f"storage.viewport[{n}]", lambda n=n: _session(n, (0, 0, 320, 180)), strokes=n)
+    add("solve.solve_triangle[1000]", lambda: _triangles_scalar(1000), count=1000)
+    add("solve.solve_triangles[10000]", lambda: _triangles_batch(10000), count=10000)
+    add("ocr.normalize_batch[200x8]", lambda: _normalize(200, 8), crops=200, beams=8)
+    for label, latex in (("short", "x^2 + 1"), ("long", _long_expression(12)[: -len(" = 0")])):
+        add(f"render.render_latex[{label}]", lambda latex=latex: _render(latex))
+    for path in sorted(FIXTURES.glob("*.board.json")):
+        name = path.name[: -len(".board.json")]
+        add(f"fixture.to_image[{name}]", lambda path=path: _cold_render(_load_board(path)))
+        add(f"fixture.detect_triangles[{name}]", lambda path=path: _detect(_load_board(path)))
+    for path in sorted(FIXTURES.glob("*.tex")):
+        add(f"fixture.latex_to_sympy[{path.stem}]", lambda path=path: _parse(_load_corpus(path)))
+    return cases
+
+
+# -- running and comparing ---------------------------------------------------
+
+
+def time_case(case: Case, min_rounds: int, min_time: float) -> CaseResult:
+    fn = case.factory()
+    fn()  # warm-up: imports, caches of unrelated layers, first-call allocation
+    before = calibrate()
+    samples: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+        if len(samples) >= 1000:
+            break
+    return CaseResult(
+        median_ms=statistics.median(samples),
+        min_ms=min(samples),
+        max_ms=max(samples),
+        rounds=len(samples),
+        params=case.params,
+        calibration_ms=(before + calibrate()) / 2.0,
+    )
+
+
+def run_suite(
+    cases: Sequence[Case], min_rounds: int = 5, min_time: float = 0.2
+) -> Iterator[Tuple[str, CaseResult]]:
+    for case in cases:
+        yield case.name, time_case(case, min_rounds, min_time)
+
+
+def _calibration_workload() -> float:
+    # A fixed mix of interpreter-bound and NumPy-bound work, similar to the cases above.
+    total = 0.0
+    for i in range(20000):
+        total += (i * 7) % 13
+    values = np.random.default_rng(0).random(200_000)
+    return total + float(np.sort(values)[::1000].sum())
+
+
+def calibrate(rounds: int = 5) -> float:
+    """Best-of time (ms) of the calibration workload on this machine right now."""
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _calibration_workload()
+        best = min(best, (time.perf_counter() - start) * 1000.0)
+    return best
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    statistic: str = "min_ms",
+    normalize: bool = True,
+    min_ms: float = 0.05,
+) -> Tuple[List[Comparison], List[Comparison]]:
+    """Return ``(all comparisons, regressions)`` for cases present in both result sets.
+
+    With ``normalize`` each baseline timing is scaled by the ratio of the calibration times
+    recorded around that case in the two runs. Cases whose baseline is below ``min_ms`` are
+    compared but never flagged, since timer noise dominates at that scale.
+    """
+
+    comparisons: List[Comparison] = []
+    regressions: List[Comparison] = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        scale = 1.0
+        if normalize and previous.get("calibration_ms") and result.get("calibration_ms"):
+            scale = result["calibration_ms"] / previous["calibration_ms"]
+        item = Comparison(name, previous[statistic] * scale, result[statistic])
+        comparisons.append(item)
+        if item.baseline_ms >= min_ms and item.ratio > 1.0 + threshold:
+            regressions.append(item)
+    return comparisons, regressions
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _report(comparisons: Sequence[Comparison], regressions: Sequence[Comparison]) -> None:
+    print(f"\n{'case':<40} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for item in comparisons:
+        flag = "  REGRESSION" if item in regressions else ""
+        print(
+            f"{item.name:<40} {item.baseline_ms:>12.3f} {item.current_ms:>11.3f} "
+            f"{(item.ratio - 1) * 100:>+7.1f}%{flag}"
+        )
+
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for CI smoke runs")
+    parser.add_argument("--filter", action="append", default=[], metavar="GLOB",
+                        help="only run cases matching GLOB (repeatable)")
+    parser.add_argument("--rounds", type=int, default=5, help="minimum timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per case")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--save-baseline", type=Path, help="write results as a baseline file")
+    parser.add_argument("--baseline", type=Path, help="compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of a case before failing (0.25 = 25%%)")
+    parser.add_argument("--statistic", choices=("min", "median"), default="min",
+                        help="per-case timing compared against the baseline")
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="compare raw timings without the calibration adjustment")
+    parser.add_argument("--confirm", type=int, default=2, metavar="N",
+                        help="re-time regressed cases up to N times before failing")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(quick=args.quick)
+    if args.filter:
+        cases = [c for c in cases if any(fnmatch.fnmatch(c.name, p) for p in args.filter)]
+    if args.list:
+        print("\n".join(case.name for case in cases))
+        return 0
+
+    try:
+        return _run(cases, args)
+    finally:
+        _cleanup()
+
+
+def _run(cases: List[Case], args: argparse.Namespace) -> int:
+    results: Dict[str, Any] = {}
+    print(f"{'case':<40} {'median ms':>11} {'min ms':>10} {'rounds':>7}")
+    for name, result in run_suite(cases, args.rounds, args.min_time):
+        results[name] = asdict(result)
+        print(f"{name:<40} {result.median_ms:>11.3f} {result.min_ms:>10.3f} {result.rounds:>7}")
+    payload = {"schema": SCHEMA_VERSION, "environment": environment(), "results": results}
+
+    regressions: List[Comparison] = []
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        statistic = f"{args.statistic}_ms"
+
+        def check() -> Tuple[List[Comparison], List[Comparison]]:
+            return compare(
+                baseline, payload, args.threshold, statistic, normalize=not args.no_normalize
+            )
+
+        comparisons, regressions = check()
+        # A one-off stall must not fail the run: re-time flagged cases and keep the best.
+        by_name = {case.name: case for case in cases}
+        for attempt in range(args.confirm):
+            if not regressions:
+                break
+            print(f"\nre-timing {len(regressions)} flagged case(s), attempt {attempt + 1}")
+            for item in regressions:
+                retry = asdict(time_case(by_name[item.name], args.rounds, args.min_time))
+                if retry[statistic] < results[item.name][statistic]:
+                    results[item.name] = retry
+            comparisons, regressions = check()
+        _report(comparisons, regressions)
+
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            _write_json(path, payload)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
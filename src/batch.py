@@ -0,0 +1,78 @@
+"""Headless batch recognition of scanned worksheets.
+
+    python src/batch.py scans/ --output results.jsonl --workers 4 --render-dir answers/
+
+Streams a directory of images (or a manifest listing them) through OCR → parse → solve →
+render in worker processes and appends one JSON record per image to the output file.
+Re-running the same command resumes after the last recorded image.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+LOGGER = logging.getLogger("inkmath.batch")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="InkMath headless batch recognition")
+    parser.add_argument("source", type=Path, help="directory of images, or a manifest file")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL results file")
+    parser.add_argument(
+        "--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+        help="worker processes (0 runs in this process)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=8, help="images per OCR batch")
+    parser.add_argument("--render-dir", type=Path, help="write rendered answers (PNG) here")
+    parser.add_argument(
+        "--solve-timeout-ms", type=float,
+        help="hard per-image solver timeout (default: solve.timeout_ms_symbolic; 0 disables)",
+    )
+    parser.add_argument("--retry-errors", action="store_true",
+                        help="on resume, redo images whose previous record has an error")
+    parser.add_argument("--engine", choices=["pix2tex", "trocr"], help="OCR engine override")
+    parser.add_argument("--device", choices=["cpu", "cuda"], help="Torch device override")
+    parser.add_argument("--progress-interval", type=float, default=10.0, metavar="SECONDS")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    from core.config import load_config
+    from core.logging_setup import setup_logging
+    from pipeline.batch import BatchError, BatchOptions, iter_inputs, run_batch
+    from run import bootstrap_models, build_engine
+
+    config = load_config(args)
+    setup_logging(config.logging)
+    timeout = args.solve_timeout_ms
+    if timeout is None:
+        timeout = float(config.solve.timeout_ms_symbolic)
+    options = BatchOptions(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        solve_timeout_ms=timeout or None,
+        render_dir=args.render_dir,
+        retry_errors=args.retry_errors,
+        progress_interval_s=args.progress_interval,
+    )
+    try:
+        bootstrap_models(config)
+        # build_engine runs once in each worker process.
+        summary = run_batch(iter_inputs(args.source), args.output, build_engine, config, options)
+    except BatchError as exc:
+        LOGGER.error("%s", exc)
+        return 2
+    except KeyboardInterrupt:
+        LOGGER.warning("Interrupted; re-run the same command to resume")
+        return 130
+    return 1 if summary.errors and summary.errors == summary.processed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    sys.exit(main())
@@ -2,14 +2,27 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 from rich.console import Console
 
+from .config import CONFIG_DIR
+
 console = Console()
 
+# Digests of weights files that were hashed before, keyed by resolved path. A file whose
+# size, mtime and inode still match its stamp is trusted without streaming it again.
+STAMP_PATH = CONFIG_DIR / "models" / "verified.json"
+
+_stamp_lock = threading.Lock()
+_session_lock = threading.Lock()
+_session_checks: Dict[Tuple[str, str], threading.Event] = {}
+
 
 def _sha256(path: Path) -> str:
     digest = hashlib.sha256()
@@ -19,17 +32,50 @@ def _sha256(path: Path) -> str:
     return digest.hexdigest()
 
 
-def ensure_model(path: Path, url: str, checksum: str) -> None:
-    """Ensure that a model file exists, downloading if needed.
+def _load_stamps() -> Dict[str, Dict[str, object]]:
+    try:
+        with STAMP_PATH.open("r", encoding="utf-8") as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
 
-    The actual download is deferred to scripts/fetch_models.py to keep runtime fast and
-    avoid network operations during automated tests. If the model is missing this function
-    prints a helpful message so the user can fetch the assets manually.
-    """
 
+def _file_signature(stat: os.stat_result) -> Dict[str, object]:
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+
+def _digest(path: Path) -> str:
+    """Return the SHA-256 of ``path``, reusing the stamp cache when the file is unchanged."""
+
+    key = str(path.resolve())
+    signature = _file_signature(path.stat())
+    with _stamp_lock:
+        stamp = _load_stamps().get(key)
+    if isinstance(stamp, dict) and all(stamp.get(k) == v for k, v in signature.items()):
+        digest = stamp.get("digest")
+        if isinstance(digest, str):
+            return digest
+
+    digest = _sha256(path)
+    with _stamp_lock:
+        stamps = _load_stamps()
+        stamps[key] = {**signature, "digest": digest}
+        try:
+            STAMP_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = STAMP_PATH.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(stamps, fh, indent=2, sort_keys=True)
+            os.replace(tmp, STAMP_PATH)
+        except OSError:
+            pass
+    return digest
+
+
+def _check_model(path: Path, url: str, checksum: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     if path.exists():
-        current = _sha256(path)
+        current = _digest(path)
         if current != checksum:
             console.print(f"[yellow]Checksum mismatch for {path}. Expected {checksum}, got {current}.")
             console.print("Please re-run scripts/fetch_models.py to refresh the weights.")
@@ -41,9 +87,54 @@ def ensure_model(path: Path, url: str, checksum: str) -> None:
     )
 
 
+def ensure_model(path: Path, url: str, checksum: str) -> None:
+    """Ensure that a model file exists, downloading if needed.
+
+    The actual download is deferred to scripts/fetch_models.py to keep runtime fast and
+    avoid network operations during automated tests. If the model is missing this function
+    prints a helpful message so the user can fetch the assets manually.
+
+    Each ``(path, checksum)`` pair is checked once per process; concurrent callers wait for
+    the first check instead of hashing the same file again.
+    """
+
+    key = (str(Path(path).expanduser()), checksum)
+    with _session_lock:
+        done: Optional[threading.Event] = _session_checks.get(key)
+        owner = done is None
+        if owner:
+            done = _session_checks[key] = threading.Event()
+    assert done is not None
+    if not owner:
+        done.wait()
+        return
+    try:
+        _check_model(Path(path).expanduser(), url, checksum)
+    except BaseException:
+        with _session_lock:
+            _session_checks.pop(key, None)
+        raise
+    finally:
+        done.set()
+
+
 def verify_models(models: Iterable[Tuple[Path, str, str]]) -> None:
-    for path, url, checksum in models:
-        ensure_model(path, url, checksum)
+    pending = list(models)
+    if len(pending) <= 1:
+        for path, url, checksum in pending:
+            ensure_model(path, url, checksum)
+        return
+    # hashlib releases the GIL on large updates, so threads hash files in parallel.
+    with ThreadPoolExecutor(max_workers=min(4, len(pending))) as pool:
+        for future in [pool.submit(ensure_model, *model) for model in pending]:
+            future.result()
+
+
+def reset_session_checks() -> None:
+    """Forget which models were already checked in this process."""
+
+    with _session_lock:
+        _session_checks.clear()
 
 
-__all__ = ["ensure_model", "verify_models"]
+__all__ = ["ensure_model", "verify_models", "reset_session_checks"]
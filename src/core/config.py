@@ -24,6 +24,8 @@ class OcrConfig(BaseModel):
     engine: str = "pix2tex"
     debounce_ms: int = 600
     min_confidence: float = 0.4
+    cache_entries: int = 512
+    cache_to_disk: bool = True
 
 
 class ModelConfig(BaseModel):
@@ -41,6 +43,7 @@ class RenderConfig(BaseModel):
     dpi: int = 160
     font_size: int = 14
     theme: str = "dark"
+    history_in_memory: int = 200
 
 
 class LoggingConfig(BaseModel):
@@ -48,6 +51,17 @@ class LoggingConfig(BaseModel):
     to_file: bool = True
 
 
+class MetricsConfig(BaseModel):
+    enabled: bool = False
+    directory: str = Field(default_factory=lambda: str(CONFIG_DIR / "metrics"))
+    interval_s: float = 10.0
+    csv: bool = True
+    csv_max_bytes: int = 1_000_000
+    csv_backups: int = 3
+    prometheus_file: bool = True
+    http_port: int = 0  # serve /metrics on 127.0.0.1 when non-zero
+
+
 class AppConfig(BaseModel):
     canvas: CanvasConfig = Field(default_factory=CanvasConfig)
     ocr: OcrConfig = Field(default_factory=OcrConfig)
@@ -55,6 +69,7 @@ class AppConfig(BaseModel):
     solve: SolveConfig = Field(default_factory=SolveConfig)
     render: RenderConfig = Field(default_factory=RenderConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
 
     def merge_overrides(self, overrides: Dict[str, Any]) -> "AppConfig":
         data = self.dict()
@@ -107,4 +122,13 @@ def parse_cli(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--engine", choices=["pix2tex", "trocr"], help="OCR engine override")
     parser.add_argument("--device", choices=["cpu", "cuda"], help="Torch device override")
     parser.add_argument("--theme", choices=["light", "dark"], help="UI theme override")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="JSON",
+        help="Report import/initialization timings once the UI is ready, then exit. "
+        "Optionally write the report as JSON to the given path.",
+    )
     return parser.parse_args(argv)
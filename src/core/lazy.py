@@ -0,0 +1,48 @@
+"""Deferred module imports."""
+from __future__ import annotations
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, List, Optional
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        target: Optional[ModuleType] = self.__dict__["_lazy_target"]
+        if target is None:
+            with self.__dict__["_lazy_lock"]:
+                target = self.__dict__["_lazy_target"]
+                if target is None:
+                    target = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = target
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_lazy_target"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._load(), attr)
+        # Cache on the proxy so later lookups skip __getattr__ entirely.
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> Any:
+    """Return a proxy for ``name`` that imports the real module when first used."""
+
+    return LazyModule(name)
+
+
+__all__ = ["LazyModule", "lazy_module"]
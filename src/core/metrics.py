@@ -0,0 +1,389 @@
+"""Per-stage latency metrics with local CSV and Prometheus-text export.
+
+Code under measurement wraps each pipeline stage in ``METRICS.span("ocr")`` and counts
+events with ``METRICS.increment("ocr.cache_hits")``. Latencies go into fixed log-spaced
+histograms (about 19% wide buckets from 50 µs to a minute), so recording is one bisect and
+memory does not grow with traffic; p50/p95/p99 are interpolated from the buckets. While the
+registry is disabled - the default - ``span`` hands back one shared no-op context manager
+and ``observe``/``increment`` return immediately.
+
+:class:`MetricsExporter` periodically appends snapshots to a size-rotated CSV file and
+rewrites a Prometheus text-format file (atomically, for a node-exporter textfile collector);
+:func:`serve_prometheus` exposes the same text on a localhost HTTP endpoint. Snapshots are
+cumulative since the registry was enabled or reset. Only the standard library is imported.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .config import MetricsConfig
+
+LOGGER = logging.getLogger(__name__)
+
+# Pipeline stages, in order; other names are allowed but these are what the app records.
+STAGES = ("capture", "crop", "ocr", "normalize", "parse", "solve", "render")
+QUANTILES = (0.5, 0.95, 0.99)
+
+_BUCKET_GROWTH = 2**0.25
+# Upper bounds in milliseconds; one extra overflow bucket follows the last bound.
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(0.05 * _BUCKET_GROWTH**i for i in range(82))
+
+CSV_FIELDS = (
+    "timestamp", "name", "type", "count", "sum_ms", "min_ms",
+    "p50_ms", "p95_ms", "p99_ms", "max_ms", "value",
+)
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms < self.minimum:
+            self.minimum = ms
+        if ms > self.maximum:
+            self.maximum = ms
+
+    def percentile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0-1) by interpolating inside its bucket."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket in enumerate(self.counts):
+            if bucket and seen + bucket >= rank:
+                lower = BUCKET_BOUNDS[idx - 1] if idx else 0.0
+                upper = BUCKET_BOUNDS[idx] if idx < len(BUCKET_BOUNDS) else self.maximum
+                estimate = lower + (upper - lower) * (rank - seen) / bucket
+                return min(max(estimate, self.minimum), self.maximum)
+            seen += bucket
+        return self.maximum
+
+    def summary(self) -> "HistogramSummary":
+        p50, p95, p99 = (self.percentile(q) for q in QUANTILES)
+        return HistogramSummary(
+            count=self.count,
+            sum_ms=self.total,
+            min_ms=self.minimum if self.count else 0.0,
+            max_ms=self.maximum,
+            p50_ms=p50,
+            p95_ms=p95,
+            p99_ms=p99,
+        )
+
+
+@dataclass
+class HistogramSummary:
+    count: int
+    sum_ms: float
+    min_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class MetricsSnapshot:
+    timestamp: datetime
+    latencies: Dict[str, HistogramSummary]
+    counters: Dict[str, float]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_registry", "_name", "_start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str) -> None:
+        self._registry = registry
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = self._registry._clock()
+
+    def __exit__(self, exc_type: object, *_exc: object) -> None:
+        registry = self._registry
+        registry.observe(self._name, (registry._clock() - self._start) * 1000.0)
+        if exc_type is not None:
+            registry.increment(f"{self._name}.errors")
+
+
+class MetricsRegistry:
+    def __init__(
+        self, enabled: bool = False, clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, float] = {}
+
+    def span(self, name: str) -> Union[_Span, _NullSpan]:
+        """Time a ``with`` block into the ``name`` histogram; a raised error is also counted."""
+
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name: str, ms: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._latencies.get(name)
+            if histogram is None:
+                histogram = self._latencies[name] = LatencyHistogram()
+            histogram.observe(ms)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            latencies = {name: h.summary() for name, h in sorted(self._latencies.items())}
+            counters = dict(sorted(self._counters.items()))
+        return MetricsSnapshot(datetime.now(timezone.utc), latencies, counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._counters.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+# -- export --------------------------------------------------------------------
+
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def render_prometheus(snapshot: MetricsSnapshot, prefix: str = "inkmath") -> str:
+    """Format ``snapshot`` in the Prometheus text exposition format."""
+
+    lines: List[str] = []
+    if snapshot.latencies:
+        metric = f"{prefix}_stage_latency_milliseconds"
+        lines += [
+            f"# HELP {metric} Latency of pipeline stages.",
+            f"# TYPE {metric} summary",
+        ]
+        for name, summary in snapshot.latencies.items():
+            label = f'stage="{name}"'
+            for q, value in zip(QUANTILES, (summary.p50_ms, summary.p95_ms, summary.p99_ms)):
+                lines.append(f'{metric}{{{label},quantile="{q}"}} {value:.6g}')
+            lines.append(f"{metric}_sum{{{label}}} {summary.sum_ms:.6g}")
+            lines.append(f"{metric}_count{{{label}}} {summary.count}")
+    for name, value in snapshot.counters.items():
+        metric = f"{prefix}_{_metric_name(name)}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Path, snapshot: MetricsSnapshot) -> None:
+    """Rewrite ``path`` atomically so scrapers never read a half-written file."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(render_prometheus(snapshot), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class CsvMetricsWriter:
+    """Append snapshot rows to ``path``, rotating to ``path.1`` … ``path.N`` by size."""
+
+    def __init__(self, path: Path, max_bytes: int = 1_000_000, backups: int = 3) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def _rotate(self) -> None:
+        for idx in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{idx}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{idx + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self._rotate()
+        new_file = not self.path.exists()
+        stamp = snapshot.timestamp.isoformat(timespec="seconds")
+        with self.path.open("a", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            if new_file:
+                writer.writerow(CSV_FIELDS)
+            for name, s in snapshot.latencies.items():
+                writer.writerow(
+                    [stamp, name, "latency", s.count, f"{s.sum_ms:.3f}", f"{s.min_ms:.3f}",
+                     f"{s.p50_ms:.3f}", f"{s.p95_ms:.3f}", f"{s.p99_ms:.3f}", f"{s.max_ms:.3f}", ""]
+                )
+            for name, value in snapshot.counters.items():
+                writer.writerow([stamp, name, "counter", "", "", "", "", "", "", "", f"{value:g}"])
+
+
+def serve_prometheus(
+    registry: MetricsRegistry, port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` on a daemon thread; call ``shutdown()`` on the result to stop."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus(registry.snapshot()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            LOGGER.debug("metrics endpoint: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="inkmath-metrics-http", daemon=True).start()
+    return server
+
+
+class MetricsExporter:
+    """Flush ``registry`` to CSV and/or a Prometheus file every ``interval_s`` seconds."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        csv_writer: Optional[CsvMetricsWriter] = None,
+        prometheus_path: Optional[Path] = None,
+        interval_s: float = 10.0,
+        server: Optional[ThreadingHTTPServer] = None,
+    ) -> None:
+        self.registry = registry
+        self.csv_writer = csv_writer
+        self.prometheus_path = prometheus_path
+        self.interval_s = interval_s
+        self.server = server
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsExporter":
+        if self._thread is None and (self.csv_writer or self.prometheus_path):
+            self._thread = threading.Thread(
+                target=self._run, name="inkmath-metrics-export", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.flush()
+
+    def flush(self) -> None:
+        snapshot = self.registry.snapshot()
+        try:
+            if self.csv_writer is not None:
+                self.csv_writer.write(snapshot)
+            if self.prometheus_path is not None:
+                write_prometheus(self.prometheus_path, snapshot)
+        except OSError:
+            LOGGER.warning("Could not export metrics", exc_info=True)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def configure_metrics(
+    config: MetricsConfig, registry: MetricsRegistry = METRICS
+) -> Optional[MetricsExporter]:
+    """Enable ``registry`` per ``config`` and start its exporter; ``None`` when disabled."""
+
+    registry.enabled = config.enabled
+    if not config.enabled:
+        return None
+    directory = Path(config.directory).expanduser()
+    csv_writer = None
+    if config.csv:
+        csv_writer = CsvMetricsWriter(
+            directory / "metrics.csv", config.csv_max_bytes, config.csv_backups
+        )
+    prometheus_path = directory / "metrics.prom" if config.prometheus_file else None
+    server = None
+    if config.http_port:
+        try:
+            server = serve_prometheus(registry, config.http_port)
+        except OSError:
+            LOGGER.warning("Metrics endpoint unavailable on port %s", config.http_port)
+    exporter = MetricsExporter(registry, csv_writer, prometheus_path, config.interval_s, server)
+    return exporter.start()
+
+
+__all__ = [
+    "METRICS",
+    "STAGES",
+    "CsvMetricsWriter",
+    "HistogramSummary",
+    "LatencyHistogram",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "MetricsSnapshot",
+    "configure_metrics",
+    "render_prometheus",
+    "serve_prometheus",
+    "write_prometheus",
+]
@@ -0,0 +1,171 @@
+"""Startup-time profiling.
+
+``StartupProfiler`` wraps ``builtins.__import__`` to time every module imported for the
+first time (cumulative and self time, per thread) and records named initialization stages.
+The report is printed as a table and can be written as JSON so CI can track cold start.
+Only the standard library is imported here so the profiler can be installed before
+anything heavy is loaded.
+"""
+from __future__ import annotations
+
+import builtins
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from importlib.util import resolve_name
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    cumulative_ms: float
+    self_ms: float
+    thread: str
+
+
+@dataclass
+class StageTiming:
+    name: str
+    start_ms: float
+    duration_ms: float
+    thread: str
+
+
+class StartupProfiler:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._origin = clock()
+        self._original_import: Optional[Callable[..., Any]] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.imports: List[ImportTiming] = []
+        self.stages: List[StageTiming] = []
+
+    # -- import hook -------------------------------------------------------
+    def install(self) -> "StartupProfiler":
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(
+        self,
+        name: str,
+        globals: Optional[Mapping[str, Any]] = None,
+        locals: Optional[Mapping[str, Any]] = None,
+        fromlist: Sequence[str] = (),
+        level: int = 0,
+    ) -> Any:
+        original = self._original_import or builtins.__import__
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            try:
+                module = resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                module = name
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack: List[float] = getattr(self._local, "stack", None) or []
+        self._local.stack = stack
+        stack.append(0.0)
+        start = self._clock()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = self._clock() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            timing = ImportTiming(
+                module=module,
+                cumulative_ms=elapsed * 1000.0,
+                self_ms=(elapsed - children) * 1000.0,
+                thread=threading.current_thread().name,
+            )
+            with self._lock:
+                self.imports.append(timing)
+
+    # -- stages ------------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            end = self._clock()
+            timing = StageTiming(
+                name=name,
+                start_ms=(start - self._origin) * 1000.0,
+                duration_ms=(end - start) * 1000.0,
+                thread=threading.current_thread().name,
+            )
+            with self._lock:
+                self.stages.append(timing)
+
+    def mark(self, name: str) -> None:
+        """Record an instantaneous milestone such as "first frame shown"."""
+
+        with self.stage(name):
+            pass
+
+    # -- reporting ---------------------------------------------------------
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._origin) * 1000.0
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        with self._lock:
+            imports = sorted(self.imports, key=lambda t: t.self_ms, reverse=True)
+            stages = list(self.stages)
+        return {
+            "total_ms": self.elapsed_ms(),
+            "import_ms": sum(t.self_ms for t in imports),
+            "stages": [asdict(s) for s in stages],
+            "imports": [asdict(t) for t in imports[:top]],
+        }
+
+    def write_json(self, path: Path, top: int = 200) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fh:
+            json.dump(self.report(top=top), fh, indent=2)
+
+    def print_report(self, top: int = 25) -> None:
+        from rich.console import Console
+        from rich.table import Table
+
+        report = self.report(top=top)
+        console = Console()
+        stages = Table(title="Startup stages")
+        for column in ("stage", "start ms", "duration ms", "thread"):
+            stages.add_column(column)
+        for stage in report["stages"]:
+            stages.add_row(
+                stage["name"], f"{stage['start_ms']:.1f}", f"{stage['duration_ms']:.1f}", stage["thread"]
+            )
+        imports = Table(title=f"Slowest imports (self time, top {top})")
+        for column in ("module", "self ms", "cumulative ms", "thread"):
+            imports.add_column(column)
+        for item in report["imports"]:
+            imports.add_row(
+                item["module"], f"{item['self_ms']:.1f}", f"{item['cumulative_ms']:.1f}", item["thread"]
+            )
+        console.print(stages)
+        console.print(imports)
+        console.print(
+            f"Total {report['total_ms']:.1f} ms, of which {report['import_ms']:.1f} ms importing modules"
+        )
+
+
+__all__ = ["StartupProfiler", "ImportTiming", "StageTiming"]
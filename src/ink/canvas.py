@@ -2,39 +2,156 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional, Tuple
 
+import cv2
 import numpy as np
 
-from .strokes import Stroke
+from .spatial import StrokeIndex
+from .strokes import Stroke, StrokeStore
+
+Rect = Tuple[int, int, int, int]
 
 
 @dataclass
 class InkCanvas:
+    """Stroke container with a cached raster layer.
+
+    ``to_image`` only rasterizes ink added since the previous call. Erasing or clearing
+    strokes records dirty rectangles which are repainted from the remaining strokes on the
+    next call, so the cost of a refresh follows the amount of changed ink rather than the
+    total amount of ink on the board.
+    """
+
     width: int
     height: int
-    strokes: List[Stroke] = field(default_factory=list)
+    store: StrokeStore = field(default_factory=StrokeStore)
+    index: StrokeIndex = field(init=False, repr=False)
+    _raster: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _drawn: List[int] = field(default_factory=list, init=False, repr=False)
+    _dirty: List[Rect] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.index = StrokeIndex(self.store)
+
+    @property
+    def strokes(self) -> StrokeStore:
+        """All strokes on the canvas, in drawing order."""
+
+        return self.store
 
     def new_stroke(self, color=(0, 0, 0), thickness: int = 3) -> Stroke:
-        stroke = Stroke(color=color, thickness=thickness)
-        self.strokes.append(stroke)
-        return stroke
+        return self.store.new_stroke(color=color, thickness=thickness)
 
-    def to_image(self) -> np.ndarray:
-        img = np.ones((self.height, self.width, 3), dtype=np.uint8) * 255
-        for stroke in self.strokes:
+    def erase(self, stroke: Stroke) -> None:
+        """Remove ``stroke`` and mark the area it covered for repaint."""
+
+        index = stroke.index
+        rect = self._stroke_rect(index)
+        if rect is not None:
+            self._dirty.append(rect)
+        self.store.remove(index)
+        if index < len(self._drawn):
+            del self._drawn[index]
+
+    def select(self, rect: Rect, contained: bool = False) -> List[Stroke]:
+        """Box-select strokes touching (or, with ``contained``, inside) ``rect``."""
+
+        return self.index.query_rect(rect, contained=contained)
+
+    def strokes_near(self, x: float, y: float, radius: float) -> List[Stroke]:
+        return self.index.query_radius(x, y, radius)
+
+    def erase_at(self, x: float, y: float, radius: float) -> List[Stroke]:
+        """Eraser tool: remove every stroke within ``radius`` of the cursor."""
+
+        hits = self.index.query_radius(x, y, radius)
+        for stroke in reversed(hits):
+            self.erase(stroke)
+        return hits
+
+    def _stroke_rect(self, index: int) -> Optional[Rect]:
+        bounds = self.store.bounds_of(index)
+        if bounds is None:
+            return None
+        # Anti-aliased lines bleed a pixel past half the thickness.
+        pad = int(self.store.thicknesses[index]) // 2 + 2
+        x0, y0, x1, y1 = bounds
+        return (x0 - pad, y0 - pad, x1 + pad + 1, y1 + pad + 1)
+
+    def _clip(self, rect: Rect) -> Optional[Rect]:
+        x0, y0, x1, y1 = rect
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0, y0, x1, y1)
+
+    def _repaint(self, raster: np.ndarray, rect: Rect) -> None:
+        x0, y0, x1, y1 = rect
+        region = raster[y0:y1, x0:x1]
+        region[:] = 255
+        bounds = self.store.bounds
+        lengths = self.store.lengths
+        hits = np.nonzero(
+            (lengths > 1)
+            & (bounds[:, 0] - self.store.thicknesses < x1)
+            & (bounds[:, 2] + self.store.thicknesses >= x0)
+            & (bounds[:, 1] - self.store.thicknesses < y1)
+            & (bounds[:, 3] + self.store.thicknesses >= y0)
+        )[0]
+        origin = np.array([x0, y0], dtype=np.int32)
+        for index in hits:
+            stroke = self.store[int(index)]
+            # Drawing into the view clips to the dirty rectangle for free.
+            points = stroke.to_array() - origin
+            cv2.polylines(region, [points], False, stroke.color, stroke.thickness, cv2.LINE_AA)
+
+    def render(self) -> np.ndarray:
+        """Bring the cached raster up to date and return it without copying."""
+
+        raster = self._raster
+        if raster is None or raster.shape[:2] != (self.height, self.width):
+            raster = self._raster = np.full((self.height, self.width, 3), 255, dtype=np.uint8)
+            self._drawn = []
+            self._dirty.clear()
+        for rect in self._dirty:
+            clipped = self._clip(rect)
+            if clipped is not None:
+                self._repaint(raster, clipped)
+        self._dirty.clear()
+
+        drawn = self._drawn
+        if len(drawn) < len(self.store):
+            drawn.extend([0] * (len(self.store) - len(drawn)))
+        lengths = self.store.lengths
+        for index in np.nonzero(lengths != np.asarray(drawn, dtype=lengths.dtype))[0]:
+            index = int(index)
+            stroke = self.store[index]
             points = stroke.to_array()
-            if len(points) > 1:
-                for start, end in zip(points, points[1:]):
-                    start_t = tuple(int(v) for v in start)
-                    end_t = tuple(int(v) for v in end)
-                    import cv2
+            # Restart from the last drawn point so the new segment joins the old one.
+            start = max(drawn[index] - 1, 0)
+            if len(points) - start > 1:
+                cv2.polylines(
+                    raster, [points[start:]], False, stroke.color, stroke.thickness, cv2.LINE_AA
+                )
+            drawn[index] = len(points)
+        return raster
 
-                    cv2.line(img, start_t, end_t, stroke.color, stroke.thickness, lineType=cv2.LINE_AA)
-        return img
+    def to_image(self) -> np.ndarray:
+        return self.render().copy()
 
     def clear(self) -> None:
-        self.strokes.clear()
+        self.store.clear()
+        self._drawn.clear()
+        self._dirty.clear()
+        if self._raster is not None:
+            self._raster[:] = 255
+
+    def close(self) -> None:
+        """Detach the spatial index from the store; call when a shared store outlives the canvas."""
+
+        self.index.close()
 
 
 __all__ = ["InkCanvas"]
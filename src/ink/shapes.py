@@ -1,39 +1,126 @@
 """Shape heuristics for ink strokes."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import cv2
 import numpy as np
 
 from .strokes import Stroke
 
+GroupKey = Tuple[Tuple[int, int, int], ...]
+
 
 @dataclass
 class DetectedTriangle:
     vertices: List[Tuple[int, int]]
 
 
+def _group_strokes(strokes: Sequence[Stroke], pad: int) -> List[List[int]]:
+    """Cluster strokes whose padded bounding boxes overlap (sweep along x)."""
+
+    boxes: List[Tuple[int, int, int, int, int]] = []
+    for idx, stroke in enumerate(strokes):
+        bounds = stroke.bounds
+        if bounds is not None and len(stroke) > 1:
+            x0, y0, x1, y1 = bounds
+            boxes.append((x0 - pad, y0 - pad, x1 + pad, y1 + pad, idx))
+    boxes.sort()
+    parent: Dict[int, int] = {box[4]: box[4] for box in boxes}
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    active: List[Tuple[int, int, int, int, int]] = []
+    for box in boxes:
+        active = [other for other in active if other[2] >= box[0]]
+        for other in active:
+            if other[1] <= box[3] and box[1] <= other[3]:
+                parent[find(box[4])] = find(other[4])
+        active.append(box)
+
+    groups: Dict[int, List[int]] = {}
+    for _, _, _, _, idx in boxes:
+        groups.setdefault(find(idx), []).append(idx)
+    return [sorted(members) for members in groups.values()]
+
+
 class TriangleDetector:
-    def __init__(self, tolerance: float = 0.02) -> None:
+    """Find triangles among strokes.
+
+    Strokes are clustered by overlapping bounding boxes and each cluster is rasterized
+    into a mask covering only its own bounding box, optionally downsampled by ``scale``.
+    Results are cached per cluster content, so re-running detection after one new stroke
+    only re-processes the cluster that stroke touched.
+    """
+
+    def __init__(self, tolerance: float = 0.02, scale: float = 1.0, cache_size: int = 256) -> None:
+        if scale <= 0:
+            raise ValueError("scale must be positive")
         self.tolerance = tolerance
+        self.scale = scale
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[GroupKey, List[DetectedTriangle]]" = OrderedDict()
 
-    def detect(self, strokes: List[Stroke]) -> List[DetectedTriangle]:
-        mask = np.zeros((1024, 1024), dtype=np.uint8)
+    def _group_key(self, strokes: Sequence[Stroke]) -> GroupKey:
+        return tuple(
+            (len(stroke), stroke.thickness, hash(stroke.to_array().tobytes())) for stroke in strokes
+        )
+
+    def _detect_group(self, strokes: Sequence[Stroke]) -> List[DetectedTriangle]:
+        pad = max(stroke.thickness for stroke in strokes) + 2
+        x0 = min(stroke.bounds[0] for stroke in strokes) - pad
+        y0 = min(stroke.bounds[1] for stroke in strokes) - pad
+        x1 = max(stroke.bounds[2] for stroke in strokes) + pad
+        y1 = max(stroke.bounds[3] for stroke in strokes) + pad
+        scale = self.scale
+        width = max(1, int(np.ceil((x1 - x0 + 1) * scale)))
+        height = max(1, int(np.ceil((y1 - y0 + 1) * scale)))
+        mask = np.zeros((height, width), dtype=np.uint8)
+        origin = np.array([x0, y0], dtype=np.int32)
         for stroke in strokes:
-            pts = stroke.to_array()
-            if len(pts) > 1:
-                cv2.polylines(mask, [pts], False, 255, stroke.thickness)
+            pts = stroke.to_array() - origin
+            if scale != 1.0:
+                pts = np.round(pts * scale).astype(np.int32)
+            thickness = max(1, int(round(stroke.thickness * scale)))
+            cv2.polylines(mask, [pts], False, 255, thickness)
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         triangles: List[DetectedTriangle] = []
         for contour in contours:
             peri = cv2.arcLength(contour, True)
             approx = cv2.approxPolyDP(contour, self.tolerance * peri, True)
             if len(approx) == 3:
-                vertices = [(int(pt[0][0]), int(pt[0][1])) for pt in approx]
+                vertices = [
+                    (int(round(pt[0][0] / scale)) + x0, int(round(pt[0][1] / scale)) + y0)
+                    for pt in approx
+                ]
                 triangles.append(DetectedTriangle(vertices=vertices))
         return triangles
 
+    def detect(self, strokes: Sequence[Stroke]) -> List[DetectedTriangle]:
+        pad = max((stroke.thickness for stroke in strokes), default=0) + 2
+        triangles: List[DetectedTriangle] = []
+        for members in _group_strokes(strokes, pad):
+            group = [strokes[idx] for idx in members]
+            key = self._group_key(group)
+            cached = self._cache.get(key)
+            if cached is None:
+                cached = self._detect_group(group)
+                self._cache[key] = cached
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            triangles.extend(DetectedTriangle(vertices=list(t.vertices)) for t in cached)
+        return triangles
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
 
 __all__ = ["TriangleDetector", "DetectedTriangle"]
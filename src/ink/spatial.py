@@ -0,0 +1,199 @@
+"""Uniform-grid spatial index over stroke segments.
+
+The index subscribes to a :class:`~ink.strokes.StrokeStore` and files every new segment
+into the grid cells its (thickness-padded) bounding box touches as points are appended.
+Segments whose box would span more than ``MAX_SEGMENT_CELLS`` cells (long ruler lines, or
+far-off and corrupt coordinates from a loaded file) go to an oversize bucket that every
+query tests instead, so indexing cost never grows with a segment's length.
+Rectangle and radius queries only visit the cells under the query area and then run an
+exact vectorized test on the candidate segments, so box-select, eraser and hit testing
+cost time proportional to the ink near the cursor rather than the whole board.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .strokes import Stroke, StrokeStore
+
+Cell = Tuple[int, int]
+Rect = Tuple[int, int, int, int]
+
+MAX_SEGMENT_CELLS = 64
+
+
+def _slab(
+    origin: np.ndarray, delta: np.ndarray, lo: float, hi: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Parametric interval where ``origin + t * delta`` lies within ``[lo, hi]``."""
+
+    inside = (origin >= lo) & (origin <= hi)
+    flat = delta == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lo - origin) / delta
+        t2 = (hi - origin) / delta
+    t_min = np.where(flat, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    t_max = np.where(flat, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+    return t_min, t_max
+
+
+def _around(x: float, y: float, radius: float) -> Rect:
+    return (
+        int(np.floor(x - radius)),
+        int(np.floor(y - radius)),
+        int(np.ceil(x + radius)),
+        int(np.ceil(y + radius)),
+    )
+
+
+class StrokeIndex:
+    """Grid of ``cell_size`` pixel cells mapping to the stroke segments that cross them."""
+
+    def __init__(self, store: StrokeStore, cell_size: int = 64) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.store = store
+        self.cell_size = cell_size
+        self._grid: Dict[Cell, Dict[Stroke, Set[int]]] = {}
+        self._cells_of: Dict[Stroke, Set[Cell]] = {}
+        self._oversize: Dict[Stroke, Set[int]] = {}
+        for stroke in store:
+            self.on_points(stroke, 0)
+        store.subscribe(self)
+
+    def close(self) -> None:
+        self.store.unsubscribe(self)
+
+    # -- StrokeListener ----------------------------------------------------
+    def on_points(self, stroke: Stroke, start: int) -> None:
+        points = stroke.to_array()
+        count = len(points)
+        if not count:
+            return
+        # Segment i joins points i and i + 1; a lone point is a degenerate segment.
+        first = max(start - 1, 0)
+        last = max(count - 1, 1)
+        heads = points[first:last]
+        tails = points[np.minimum(np.arange(first + 1, last + 1), count - 1)]
+        pad = stroke.thickness / 2
+        size = self.cell_size
+        lo = np.floor((np.minimum(heads, tails) - pad) / size).astype(np.int64)
+        hi = np.floor((np.maximum(heads, tails) + pad) / size).astype(np.int64)
+        cells = (hi[:, 0] - lo[:, 0] + 1) * (hi[:, 1] - lo[:, 1] + 1)
+        oversize = np.flatnonzero(cells > MAX_SEGMENT_CELLS)
+        if len(oversize):
+            self._oversize.setdefault(stroke, set()).update((oversize + first).tolist())
+        touched = self._cells_of.setdefault(stroke, set())
+        for offset, (cx0, cy0, cx1, cy1) in enumerate(np.hstack([lo, hi]).tolist()):
+            if cells[offset] > MAX_SEGMENT_CELLS:
+                continue
+            segment = first + offset
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    cell = (cx, cy)
+                    self._grid.setdefault(cell, {}).setdefault(stroke, set()).add(segment)
+                    touched.add(cell)
+
+    def on_remove(self, stroke: Stroke) -> None:
+        self._oversize.pop(stroke, None)
+        for cell in self._cells_of.pop(stroke, ()):
+            bucket = self._grid.get(cell)
+            if bucket is None:
+                continue
+            bucket.pop(stroke, None)
+            if not bucket:
+                del self._grid[cell]
+
+    def on_clear(self) -> None:
+        self._grid.clear()
+        self._cells_of.clear()
+        self._oversize.clear()
+
+    # -- queries -----------------------------------------------------------
+    def _candidates(self, rect: Rect) -> Dict[Stroke, Set[int]]:
+        x0, y0, x1, y1 = rect
+        size = self.cell_size
+        cx0, cx1 = int(np.floor(x0 / size)), int(np.floor(x1 / size))
+        cy0, cy1 = int(np.floor(y0 / size)), int(np.floor(y1 / size))
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._grid):
+            # A query wider than the occupied area: scan the occupied cells instead.
+            cells = [c for c in self._grid if cx0 <= c[0] <= cx1 and cy0 <= c[1] <= cy1]
+        else:
+            cells = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        found: Dict[Stroke, Set[int]] = {
+            stroke: set(segments) for stroke, segments in self._oversize.items()
+        }
+        for cell in cells:
+            bucket = self._grid.get(cell)
+            if bucket:
+                for stroke, segments in bucket.items():
+                    found.setdefault(stroke, set()).update(segments)
+        return found
+
+    @staticmethod
+    def _segments(stroke: Stroke, segments: Set[int]) -> Tuple[np.ndarray, np.ndarray]:
+        points = stroke.to_array().astype(np.float64)
+        idx = np.fromiter(segments, dtype=np.int64, count=len(segments))
+        heads = points[idx]
+        tails = points[np.minimum(idx + 1, len(points) - 1)]
+        return heads, tails - heads
+
+    def query_rect(self, rect: Rect, contained: bool = False) -> List[Stroke]:
+        """Strokes touching ``rect`` (``x0, y0, x1, y1``), or lying fully inside it."""
+
+        x0, y0, x1, y1 = rect
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        hits: List[Stroke] = []
+        for stroke, segments in self._candidates((x0, y0, x1, y1)).items():
+            if contained:
+                sx0, sy0, sx1, sy1 = stroke.bounds or (x1 + 1, y1 + 1, x0 - 1, y0 - 1)
+                if sx0 >= x0 and sy0 >= y0 and sx1 <= x1 and sy1 <= y1:
+                    hits.append(stroke)
+                continue
+            pad = stroke.thickness / 2
+            heads, delta = self._segments(stroke, segments)
+            tx0, tx1 = _slab(heads[:, 0], delta[:, 0], x0 - pad, x1 + pad)
+            ty0, ty1 = _slab(heads[:, 1], delta[:, 1], y0 - pad, y1 + pad)
+            t_lo = np.maximum(np.maximum(tx0, ty0), 0.0)
+            t_hi = np.minimum(np.minimum(tx1, ty1), 1.0)
+            if np.any(t_lo <= t_hi):
+                hits.append(stroke)
+        hits.sort(key=lambda s: s.index)
+        return hits
+
+    def _distances(self, stroke: Stroke, segments: Set[int], x: float, y: float) -> np.ndarray:
+        heads, delta = self._segments(stroke, segments)
+        rel = np.array([x, y]) - heads
+        length_sq = np.einsum("ij,ij->i", delta, delta)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(length_sq > 0, np.einsum("ij,ij->i", rel, delta) / length_sq, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        closest = heads + delta * t[:, None]
+        return np.hypot(closest[:, 0] - x, closest[:, 1] - y)
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Stroke]:
+        """Strokes whose inked area comes within ``radius`` pixels of ``(x, y)``."""
+
+        hits: List[Stroke] = []
+        for stroke, segments in self._candidates(_around(x, y, radius)).items():
+            if np.any(self._distances(stroke, segments, x, y) <= radius + stroke.thickness / 2):
+                hits.append(stroke)
+        hits.sort(key=lambda s: s.index)
+        return hits
+
+    def hit_test(self, x: float, y: float, tolerance: float = 4.0) -> Optional[Stroke]:
+        """Topmost stroke within ``tolerance`` of ``(x, y)``, preferring the closest."""
+
+        best: Optional[Tuple[float, int, Stroke]] = None
+        for stroke, segments in self._candidates(_around(x, y, tolerance)).items():
+            gap = float(self._distances(stroke, segments, x, y).min()) - stroke.thickness / 2
+            if gap <= tolerance:
+                key = (max(gap, 0.0), -stroke.index, stroke)
+                if best is None or key[:2] < best[:2]:
+                    best = key
+        return best[2] if best is not None else None
+
+
+__all__ = ["StrokeIndex"]
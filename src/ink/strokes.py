@@ -1,23 +1,331 @@
-"""Stroke data structures."""
+"""Stroke data structures.
+
+Strokes live in a columnar :class:`StrokeStore`: every point on the board sits in one
+growable ``int32`` buffer and each stroke is an ``(offset, length)`` window into it, with
+colour and thickness kept in parallel per-stroke arrays. :class:`Stroke` objects are thin
+handles into a store, so reading a stroke's points is a zero-copy slice instead of a list
+of tuples converted to a fresh array on every pass.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, Union, overload
 
 import numpy as np
 
+_INITIAL_POINTS = 1024
+_INITIAL_STROKES = 64
+_INT32 = np.iinfo(np.int32)
+_EMPTY_BOUNDS = (_INT32.max, _INT32.max, _INT32.min, _INT32.min)
+
+
+def _grow(array: np.ndarray, min_rows: int) -> np.ndarray:
+    rows = max(min_rows, 2 * len(array))
+    grown = np.zeros((rows,) + array.shape[1:], dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class StrokeListener(Protocol):
+    """Receives mutation events from a :class:`StrokeStore`."""
+
+    def on_points(self, stroke: "Stroke", start: int) -> None:
+        """Points ``start:`` of ``stroke`` were just appended."""
+
+    def on_remove(self, stroke: "Stroke") -> None:
+        """``stroke`` is about to be removed; its data is still readable."""
+
+    def on_clear(self) -> None:
+        """All strokes were removed."""
+
+
+class StrokeStore:
+    """Contiguous storage for all strokes of a board."""
+
+    __slots__ = (
+        "_points",
+        "_size",
+        "_offsets",
+        "_lengths",
+        "_colors",
+        "_thickness",
+        "_bounds",
+        "_count",
+        "_handles",
+        "_listeners",
+    )
+
+    def __init__(
+        self, point_capacity: int = _INITIAL_POINTS, stroke_capacity: int = _INITIAL_STROKES
+    ) -> None:
+        self._points = np.zeros((max(1, point_capacity), 2), dtype=np.int32)
+        self._size = 0
+        self._offsets = np.zeros(max(1, stroke_capacity), dtype=np.int64)
+        self._lengths = np.zeros(max(1, stroke_capacity), dtype=np.int64)
+        self._colors = np.zeros((max(1, stroke_capacity), 3), dtype=np.int32)
+        self._thickness = np.zeros(max(1, stroke_capacity), dtype=np.int32)
+        self._bounds = np.zeros((max(1, stroke_capacity), 4), dtype=np.int32)
+        self._count = 0
+        self._handles: List[Stroke] = []
+        self._listeners: List[StrokeListener] = []
+
+    def subscribe(self, listener: StrokeListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: StrokeListener) -> None:
+        self._listeners.remove(listener)
+
+    # -- sequence protocol -------------------------------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator["Stroke"]:
+        return iter(self._handles)
+
+    @overload
+    def __getitem__(self, index: int) -> "Stroke": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List["Stroke"]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["Stroke", List["Stroke"]]:
+        return self._handles[index]
+
+    # -- bulk accessors ----------------------------------------------------
+    @property
+    def total_points(self) -> int:
+        return int(self._lengths[: self._count].sum())
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets[: self._count]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._lengths[: self._count]
+
+    @property
+    def colors(self) -> np.ndarray:
+        return self._colors[: self._count]
+
+    @property
+    def thicknesses(self) -> np.ndarray:
+        return self._thickness[: self._count]
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """Per-stroke ``(x0, y0, x1, y1)`` inclusive bounding boxes."""
+
+        return self._bounds[: self._count]
+
+    def bounds_of(self, index: int) -> Optional[Tuple[int, int, int, int]]:
+        if not self._lengths[index]:
+            return None
+        x0, y0, x1, y1 = self._bounds[index]
+        return (int(x0), int(y0), int(x1), int(y1))
+
+    def points_of(self, index: int) -> np.ndarray:
+        """Return a read-only view of the points of stroke ``index``."""
+
+        start = int(self._offsets[index])
+        view = self._points[start : start + int(self._lengths[index])]
+        view.flags.writeable = False
+        return view
+
+    # -- mutation ----------------------------------------------------------
+    def new_stroke(
+        self,
+        color: Tuple[int, int, int] = (0, 0, 0),
+        thickness: int = 3,
+        points: Iterable[Tuple[int, int]] = (),
+    ) -> "Stroke":
+        return Stroke(points=points, color=color, thickness=thickness, store=self)
+
+    def _register(self, handle: "Stroke", color: Tuple[int, int, int], thickness: int) -> int:
+        index = self._count
+        if index >= len(self._offsets):
+            self._offsets = _grow(self._offsets, index + 1)
+            self._lengths = _grow(self._lengths, index + 1)
+            self._colors = _grow(self._colors, index + 1)
+            self._thickness = _grow(self._thickness, index + 1)
+            self._bounds = _grow(self._bounds, index + 1)
+        self._offsets[index] = self._size
+        self._lengths[index] = 0
+        self._colors[index] = color
+        self._thickness[index] = thickness
+        self._bounds[index] = _EMPTY_BOUNDS
+        self._count += 1
+        self._handles.append(handle)
+        return index
+
+    def _reserve_tail(self, index: int, extra: int) -> int:
+        """Make room for ``extra`` points at the end of stroke ``index``; return write row."""
+
+        length = int(self._lengths[index])
+        if int(self._offsets[index]) + length != self._size:
+            # Another stroke was appended after this one: move it to the tail first.
+            self._ensure_points(self._size + length + extra)
+            offset = int(self._offsets[index])
+            if offset + length != self._size:
+                tail = self._size
+                self._points[tail : tail + length] = self._points[offset : offset + length]
+                self._offsets[index] = tail
+                self._size = tail + length
+        self._ensure_points(self._size + extra)
+        return int(self._offsets[index]) + length
+
+    def _ensure_points(self, needed: int) -> None:
+        if needed <= len(self._points):
+            return
+        if self._size > 2 * self.total_points + _INITIAL_POINTS:
+            # Mostly dead space from relocated strokes: reclaim it before growing.
+            shrink = self._size
+            self.compact()
+            needed -= shrink - self._size
+            if needed <= len(self._points):
+                return
+        self._points = _grow(self._points, needed)
+
+    def append_point(self, index: int, x: int, y: int) -> None:
+        row = self._reserve_tail(index, 1)
+        self._points[row, 0] = x
+        self._points[row, 1] = y
+        bounds = self._bounds[index]
+        bounds[0] = min(bounds[0], x)
+        bounds[1] = min(bounds[1], y)
+        bounds[2] = max(bounds[2], x)
+        bounds[3] = max(bounds[3], y)
+        self._lengths[index] += 1
+        self._size = row + 1
+        for listener in self._listeners:
+            listener.on_points(self._handles[index], row - int(self._offsets[index]))
+
+    def extend_points(
+        self, index: int, points: Union[np.ndarray, Sequence[Tuple[int, int]]]
+    ) -> None:
+        block = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        if not len(block):
+            return
+        row = self._reserve_tail(index, len(block))
+        self._points[row : row + len(block)] = block
+        bounds = self._bounds[index]
+        bounds[:2] = np.minimum(bounds[:2], block.min(axis=0))
+        bounds[2:] = np.maximum(bounds[2:], block.max(axis=0))
+        self._lengths[index] += len(block)
+        self._size = row + len(block)
+        for listener in self._listeners:
+            listener.on_points(self._handles[index], row - int(self._offsets[index]))
+
+    def compact(self) -> None:
+        """Drop gaps left behind by relocated strokes, preserving buffer order."""
+
+        lengths = self._lengths[: self._count]
+        packed = np.zeros_like(self._points)
+        cursor = 0
+        for index in np.argsort(self._offsets[: self._count], kind="stable"):
+            start = int(self._offsets[index])
+            length = int(lengths[index])
+            packed[cursor : cursor + length] = self._points[start : start + length]
+            self._offsets[index] = cursor
+            cursor += length
+        self._points = packed
+        self._size = cursor
+
+    def remove(self, index: int) -> None:
+        """Delete stroke ``index``; later strokes shift down by one and keep their handles."""
+
+        for listener in self._listeners:
+            listener.on_remove(self._handles[index])
+        handle = self._handles.pop(index)
+        handle._store = None
+        tail = slice(index + 1, self._count)
+        dest = slice(index, self._count - 1)
+        for column in (self._offsets, self._lengths, self._colors, self._thickness, self._bounds):
+            column[dest] = column[tail].copy()
+        self._count -= 1
+        for moved in self._handles[index:]:
+            moved._index -= 1
+        if self._count == 0:
+            self._size = 0
+
+    def clear(self) -> None:
+        """Remove all strokes. Handles obtained before the call become invalid."""
+
+        for handle in self._handles:
+            handle._store = None
+        self._handles.clear()
+        self._count = 0
+        self._size = 0
+        for listener in self._listeners:
+            listener.on_clear()
+
 
-@dataclass
 class Stroke:
-    points: List[Tuple[int, int]] = field(default_factory=list)
-    color: Tuple[int, int, int] = (0, 0, 0)
-    thickness: int = 3
+    """Handle to a single stroke inside a :class:`StrokeStore`."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(
+        self,
+        points: Iterable[Tuple[int, int]] = (),
+        color: Tuple[int, int, int] = (0, 0, 0),
+        thickness: int = 3,
+        store: Optional[StrokeStore] = None,
+    ) -> None:
+        self._store: Optional[StrokeStore] = store if store is not None else StrokeStore(
+            point_capacity=64, stroke_capacity=1
+        )
+        self._index = self._store._register(self, color, thickness)
+        points = list(points)
+        if points:
+            self._store.extend_points(self._index, points)
+
+    def _live_store(self) -> StrokeStore:
+        if self._store is None:
+            raise RuntimeError("Stroke handle was invalidated by StrokeStore.clear()")
+        return self._store
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._live_store().points_of(self._index)
+
+    @property
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        return self._live_store().bounds_of(self._index)
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        r, g, b = self._live_store()._colors[self._index]
+        return (int(r), int(g), int(b))
+
+    @property
+    def thickness(self) -> int:
+        return int(self._live_store()._thickness[self._index])
+
+    def __len__(self) -> int:
+        return int(self._live_store()._lengths[self._index])
+
+    def __repr__(self) -> str:
+        if self._store is None:
+            return "Stroke(<cleared>)"
+        return (
+            f"Stroke(index={self._index}, points={len(self)}, color={self.color}, "
+            f"thickness={self.thickness})"
+        )
 
     def add_point(self, point: Tuple[int, int]) -> None:
-        self.points.append(point)
+        self._live_store().append_point(self._index, int(point[0]), int(point[1]))
+
+    def extend(self, points: Union[np.ndarray, Sequence[Tuple[int, int]]]) -> None:
+        self._live_store().extend_points(self._index, points)
 
     def to_array(self) -> np.ndarray:
-        return np.array(self.points, dtype=np.int32)
+        """Return the stroke's points as an ``(N, 2)`` ``int32`` read-only view."""
+
+        return self.points
 
 
-__all__ = ["Stroke"]
+__all__ = ["Stroke", "StrokeListener", "StrokeStore"]
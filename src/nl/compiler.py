@@ -0,0 +1,132 @@
+"""Compile :class:`Expression` trees into vectorized NumPy callables.
+
+The validated AST is wrapped in a ``lambda`` over the expression's variables and compiled
+once with :func:`compile`, so evaluating it is a handful of NumPy ufunc calls instead of a
+Python tree walk per point. Constants are bound as ``np.float64`` so overflow and division
+by zero yield ``inf``/``nan`` like the rest of the array maths instead of raising.
+Compiled callables are cached per expression text.
+"""
+from __future__ import annotations
+
+import ast
+import copy
+from functools import lru_cache
+from typing import Callable, Dict, Mapping, Tuple, Union
+
+import numpy as np
+
+from .expressions import Expression, _assert_safe
+
+COMPILE_CACHE_SIZE = 1024
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class ExpressionCompileError(RuntimeError):
+    pass
+
+
+class _BindConstants(ast.NodeTransformer):
+    """Replace literals with names bound to ``np.float64`` values."""
+
+    def __init__(self) -> None:
+        self.constants: Dict[str, np.float64] = {}
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = np.float64(node.value)
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+
+
+class CompiledExpression:
+    """A compiled expression; call with arrays positionally (sorted variable order) or by name."""
+
+    __slots__ = ("text", "variables", "_function")
+
+    def __init__(
+        self, text: str, variables: Tuple[str, ...], function: Callable[..., ArrayLike]
+    ) -> None:
+        self.text = text
+        self.variables = variables
+        self._function = function
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r}, variables={self.variables})"
+
+    def __call__(self, *args: ArrayLike, **kwargs: ArrayLike) -> np.ndarray:
+        if kwargs:
+            try:
+                args = args + tuple(kwargs[name] for name in self.variables[len(args) :])
+            except KeyError as exc:
+                raise ExpressionCompileError(f"Missing value for variable {exc.args[0]}") from None
+        if len(args) != len(self.variables):
+            raise ExpressionCompileError(
+                f"Expected {len(self.variables)} values for {self.variables}, got {len(args)}"
+            )
+        arrays = [np.asarray(value, dtype=np.float64) for value in args]
+        with np.errstate(all="ignore"):
+            result = self._function(*arrays)
+        shape = np.broadcast_shapes(*(a.shape for a in arrays)) if arrays else ()
+        # Constant sub-results (or a variable-free expression) still broadcast to the inputs.
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), shape).copy()
+
+    def evaluate(self, values: Mapping[str, ArrayLike]) -> np.ndarray:
+        return self(**{name: values[name] for name in self.variables if name in values})
+
+    def scalar(self, **values: float) -> float:
+        return float(self(**values))
+
+
+def _build(node: ast.AST, text: str) -> CompiledExpression:
+    variables = tuple(sorted({n.id for n in ast.walk(node) if isinstance(n, ast.Name)}))
+    binder = _BindConstants()
+    body = binder.visit(copy.deepcopy(node))
+    clash = set(variables) & set(binder.constants)
+    if clash:
+        raise ExpressionCompileError(f"Reserved variable names: {sorted(clash)}")
+    arguments = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in variables],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    tree = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=arguments, body=body)))
+    namespace: Dict[str, object] = {"__builtins__": {}, **binder.constants}
+    function = eval(compile(tree, f"<expression {text!r}>", "eval"), namespace)  # noqa: S307
+    return CompiledExpression(text, variables, function)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_text(text: str) -> CompiledExpression:
+    try:
+        return _build(Expression.parse(text).node, text)
+    except (SyntaxError, ValueError, OverflowError) as exc:  # OverflowError: huge int literal
+        raise ExpressionCompileError(str(exc)) from exc
+
+
+def compile_expression(expression: Union[Expression, str]) -> CompiledExpression:
+    """Return the (cached) vectorized evaluator for ``expression``."""
+
+    text = expression.text if isinstance(expression, Expression) else expression
+    return _compile_text(text)
+
+
+def compile_node(node: ast.AST) -> CompiledExpression:
+    """Compile a bare AST node (uncached); the node is validated first."""
+
+    _assert_safe(node)
+    return _build(node, ast.unparse(node))
+
+
+def clear_compile_cache() -> None:
+    _compile_text.cache_clear()
+
+
+__all__ = [
+    "CompiledExpression",
+    "ExpressionCompileError",
+    "compile_expression",
+    "compile_node",
+    "clear_compile_cache",
+]
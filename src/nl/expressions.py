@@ -1,9 +1,14 @@
-"""Lightweight symbolic expression helpers."""
+"""Lightweight symbolic expression helpers.
+
+Expressions are immutable once parsed, so derived metadata (variables, node count, the
+difference form of an equation) is computed on first access and kept on the instance.
+"""
 from __future__ import annotations
 
 import ast
 from dataclasses import dataclass
-from typing import Optional, Set
+from functools import cached_property
+from typing import FrozenSet, Optional
 
 ALLOWED_NODES = (
     ast.Expression,
@@ -28,11 +33,11 @@ def _assert_safe(node: ast.AST) -> None:
             raise ValueError(f"Unsupported syntax in expression: {ast.dump(child)}")
 
 
-def _gather_symbols(node: ast.AST) -> Set[str]:
-    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+def _gather_symbols(node: ast.AST) -> FrozenSet[str]:
+    return frozenset(n.id for n in ast.walk(node) if isinstance(n, ast.Name))
 
 
-@dataclass
+@dataclass(frozen=True)
 class Expression:
     text: str
     node: ast.AST
@@ -43,25 +48,37 @@ class Expression:
         _assert_safe(parsed)
         return cls(text=text, node=parsed.body)
 
-    @property
-    def variables(self) -> Set[str]:
+    @cached_property
+    def variables(self) -> FrozenSet[str]:
         return _gather_symbols(self.node)
 
+    @cached_property
+    def node_count(self) -> int:
+        """Number of operand/operator nodes, a cheap size measure for untrusted input."""
+
+        return sum(1 for n in ast.walk(self.node) if isinstance(n, ast.expr))
 
-@dataclass
+
+@dataclass(frozen=True)
 class Equation:
     left: Expression
     right: Expression
 
-    @property
-    def variables(self) -> Set[str]:
+    @cached_property
+    def variables(self) -> FrozenSet[str]:
         return self.left.variables | self.right.variables
 
+    @cached_property
+    def difference(self) -> Expression:
+        # Both sides are already validated trees; join them instead of reparsing the text.
+        node = ast.BinOp(left=self.left.node, op=ast.Sub(), right=self.right.node)
+        return Expression(text=f"({self.left.text})-({self.right.text})", node=node)
+
     def as_difference(self) -> Expression:
-        return Expression.parse(f"({self.left.text})-({self.right.text})")
+        return self.difference
 
 
-@dataclass
+@dataclass(frozen=True)
 class IntegralExpr:
     integrand: Expression
     variable: str
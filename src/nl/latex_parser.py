@@ -0,0 +1,324 @@
+"""Single-pass LaTeX tokenizer and recursive-descent parser.
+
+The tokenizer is one compiled regular expression scanned once over the input. The parser
+builds the restricted :mod:`ast` trees used by :class:`~nl.expressions.Expression` directly
+(no intermediate Python source and no ``ast.parse``), together with a compact canonical
+text that round-trips to the same tree. Supported: ``+ - * / ^``, ``\\cdot``, ``\\times``,
+``\\div``, implicit multiplication (``2x``, ``3(x+1)``, ``xy``), ``\\frac``, ``\\sqrt`` and
+``\\sqrt[n]``, grouping with ``() {} []`` and ``\\left``/``\\right``, subscripted names
+(``x_1``), Greek letters, ``\\pi``, one ``=`` and ``\\int`` with optional bounds.
+"""
+from __future__ import annotations
+
+import ast
+import math
+import re
+import string
+from typing import Dict, List, Optional, Tuple, Union
+
+from .expressions import Equation, Expression, IntegralExpr
+
+
+class LatexParseError(RuntimeError):
+    pass
+
+
+# Leading spacing (including ``\\`` line breaks and ``&`` alignment marks of multi-line
+# input) is consumed as part of every match, so each match yields one raw token.
+_TOKEN = re.compile(
+    r"(?:\s|&|\\[,;:! \\]|\\q?quad(?![A-Za-z]))*"
+    r"(\d+\.?\d*|\.\d+|\\[A-Za-z]+|.|$)",
+    re.DOTALL,
+)
+
+GREEK = frozenset(
+    "alpha beta gamma delta epsilon varepsilon zeta eta theta vartheta iota kappa lambda mu "
+    "nu xi rho sigma tau upsilon phi varphi chi psi omega Gamma Delta Theta Lambda Xi Sigma "
+    "Phi Psi Omega".split()
+)
+# Greek names that are Python keywords get SymPy's spelling, so the canonical text reparses.
+_RENAMED = {"lambda": "lamda"}
+_IGNORED = frozenset({"left", "right", "displaystyle", "big", "Big", "bigl", "bigr"})
+_OPERATOR_COMMANDS = {"cdot": "*", "times": "*", "div": "/"}
+_DIGITS = frozenset(string.digits)
+_CLOSING = {"(": ")", "{": "}", "[": "]"}
+
+Token = Tuple[str, str]
+Node = Tuple[ast.expr, str, int]  # tree, canonical text, precedence of the text
+
+# Token kinds.
+NUM, NAME, OP, CMD = "num", "name", "op", "cmd"
+_EOF = ("eof", "")
+_CARET, _UNDERSCORE = (OP, "^"), (OP, "_")
+# Single letters and operators map straight to their (shared) token tuples.
+_SIMPLE_TOKENS: Dict[str, Token] = {
+    **{ch: (NAME, ch) for ch in string.ascii_letters},
+    **{ch: (OP, ch) for ch in "-+*/^_=()[]{}"},
+}
+
+# Precedence of the emitted text, used to parenthesize minimally.
+_P_ADD, _P_MUL, _P_UNARY, _P_POW, _P_ATOM = 1, 2, 3, 4, 5
+
+
+def tokenize(latex: str) -> List[Token]:
+    tokens: List[Token] = []
+    append = tokens.append
+    simple = _SIMPLE_TOKENS
+    for raw in _TOKEN.findall(latex):
+        token = simple.get(raw)
+        if token is not None:
+            append(token)
+        elif raw[:1] == "\\":
+            command = raw[1:]
+            if command in _IGNORED:
+                continue
+            replacement = _OPERATOR_COMMANDS.get(command)
+            if replacement is not None:
+                append((OP, replacement))
+            elif command in GREEK:
+                append((NAME, _RENAMED.get(command, command)))
+            else:
+                append((CMD, command))
+        elif raw[:1] in _DIGITS or (raw[:1] == "." and len(raw) > 1):
+            append((NUM, raw))
+        elif raw:
+            raise LatexParseError(f"Unexpected character {raw!r}")
+    return tokens
+
+
+# Operator nodes carry no state, so (like CPython's own parser) share one instance of each.
+_ADD, _SUB, _MULT, _DIV, _POW = ast.Add(), ast.Sub(), ast.Mult(), ast.Div(), ast.Pow()
+_USUB, _UADD, _LOAD = ast.USub(), ast.UAdd(), ast.Load()
+_OPENING = frozenset("({[")
+
+
+def _wrap(node: Node, minimum: int) -> str:
+    return node[1] if node[2] >= minimum else f"({node[1]})"
+
+
+def _binop(left: Node, op: str, right: Node) -> Node:
+    if op == "+" or op == "-":
+        text = f"{_wrap(left, _P_ADD)}{op}{_wrap(right, _P_MUL)}"
+        tree = ast.BinOp(left[0], _ADD if op == "+" else _SUB, right[0])
+        return tree, text, _P_ADD
+    if op == "*" or op == "/":
+        text = f"{_wrap(left, _P_MUL)}{op}{_wrap(right, _P_UNARY)}"
+        tree = ast.BinOp(left[0], _MULT if op == "*" else _DIV, right[0])
+        return tree, text, _P_MUL
+    # Power is right-associative and binds tighter than a unary minus on its left.
+    text = f"{_wrap(left, _P_ATOM)}**{_wrap(right, _P_UNARY)}"
+    return ast.BinOp(left[0], _POW, right[0]), text, _P_POW
+
+
+def _unary(sign: str, operand: Node) -> Node:
+    tree = ast.UnaryOp(_USUB if sign == "-" else _UADD, operand[0])
+    return tree, f"{sign}{_wrap(operand, _P_UNARY)}", _P_UNARY
+
+
+def _constant(value: Union[int, float]) -> Node:
+    return ast.Constant(value), repr(value), _P_ATOM
+
+
+def _number(text: str) -> Union[int, float]:
+    try:
+        number = float(text) if "." in text else int(text)
+    except ValueError as exc:  # integers beyond Python's int/str conversion digit limit
+        raise LatexParseError(f"Number with {len(text)} digits is too long") from exc
+    if isinstance(number, float) and not math.isfinite(number):
+        raise LatexParseError(f"Number {text[:20]}... is too large")
+    return number
+
+
+class _Parser:
+    def __init__(self, tokens: List[Token]) -> None:
+        self.tokens = tokens + [_EOF]  # the sentinel makes every lookahead in bounds
+        self.end = len(tokens)
+        self.pos = 0
+
+    def peek(self) -> Token:
+        return self.tokens[self.pos]
+
+    def take(self) -> Token:
+        token = self.tokens[self.pos]
+        if self.pos < self.end:
+            self.pos += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        token = self.take()
+        if token[1] != value or token[0] != OP:
+            found = token[1] or "end of input"
+            raise LatexParseError(f"Expected {value!r} but found {found!r}")
+
+    def at_end(self) -> bool:
+        return self.pos >= self.end
+
+    # expr := term (('+' | '-') term)*
+    def expr(self) -> Node:
+        node = self.term()
+        while True:
+            kind, value = self.tokens[self.pos]
+            if kind != OP or (value != "+" and value != "-"):
+                return node
+            self.pos += 1
+            node = _binop(node, value, self.term())
+
+    # term := unary (('*' | '/') unary | <implicit> power)*
+    def term(self) -> Node:
+        tokens = self.tokens
+        node = self.unary()
+        while True:
+            kind, value = tokens[self.pos]
+            if kind == OP:
+                if value == "*" or value == "/":
+                    self.pos += 1
+                    node = _binop(node, value, self.unary())
+                    continue
+                if value not in _OPENING:
+                    return node
+            elif kind != NUM and kind != NAME and (kind != CMD or value == "int"):
+                return node
+            node = _binop(node, "*", self.power())
+
+    # unary := ('-' | '+') unary | power
+    def unary(self) -> Node:
+        kind, value = self.tokens[self.pos]
+        if kind == OP and (value == "-" or value == "+"):
+            self.pos += 1
+            return _unary(value, self.unary())
+        return self.power()
+
+    # power := atom ('^' script)?
+    def power(self) -> Node:
+        base = self.atom()
+        if self.tokens[self.pos] == _CARET:
+            self.pos += 1
+            return _binop(base, "^", self.script())
+        return base
+
+    # script := ('-' | '+')* atom   (exponents and integral bounds; x^23 keeps the whole number)
+    def script(self) -> Node:
+        kind, value = self.tokens[self.pos]
+        if kind == OP and (value == "-" or value == "+"):
+            self.pos += 1
+            return _unary(value, self.script())
+        return self.atom()
+
+    def group(self, opening: str) -> Node:
+        self.expect(opening)
+        node = self.expr()
+        self.expect(_CLOSING[opening])
+        return node
+
+    def atom(self) -> Node:
+        kind, value = self.tokens[self.pos]
+        if kind == NAME:
+            self.pos += 1
+            if self.tokens[self.pos] == _UNDERSCORE:
+                self.pos += 1
+                value = f"{value}_{self.subscript()}"
+            return ast.Name(value, _LOAD), value, _P_ATOM
+        if kind == NUM:
+            self.pos += 1
+            return _constant(_number(value))
+        if kind == OP and value in _CLOSING:
+            return self.group(value)
+        self.pos += 1
+        if kind == CMD:
+            if value == "frac":
+                numerator = self.argument()
+                denominator = self.argument()
+                return _binop(numerator, "/", denominator)
+            if value == "sqrt":
+                index: Optional[Node] = None
+                if self.tokens[self.pos] == (OP, "["):
+                    index = self.group("[")
+                radicand = self.argument()
+                exponent = _constant(0.5) if index is None else _binop(_constant(1), "/", index)
+                return _binop(radicand, "^", exponent)
+            if value == "pi":
+                return _constant(math.pi)
+            raise LatexParseError(f"Unsupported LaTeX command \\{value}")
+        raise LatexParseError(f"Unexpected {value or 'end of input'!r}")
+
+    def argument(self) -> Node:
+        """A command argument: a braced group, else a single digit or atom (``\\frac12``)."""
+
+        kind, value = self.tokens[self.pos]
+        if kind == OP and value == "{":
+            return self.group("{")
+        if kind == NUM and value[1:2] in _DIGITS:
+            self.tokens[self.pos] = (NUM, value[1:])  # leave the remaining digits for later
+            return _constant(int(value[0]))
+        return self.atom()
+
+    def subscript(self) -> str:
+        kind, value = self.take()
+        if kind == NUM or kind == NAME:
+            return value
+        if (kind, value) == (OP, "{"):
+            parts = []
+            while self.peek()[0] in (NUM, NAME):
+                parts.append(self.take()[1])
+            self.expect("}")
+            if parts:
+                return "".join(parts)
+        raise LatexParseError("Subscripts must be letters or digits")
+
+    def finish(self) -> None:
+        if not self.at_end():
+            raise LatexParseError(f"Unexpected {self.peek()[1]!r}")
+
+
+def _expression(node: Node) -> Expression:
+    return Expression(text=node[1], node=node[0])
+
+
+def _parse_tokens(tokens: List[Token]) -> Expression:
+    if not tokens:
+        raise LatexParseError("Empty expression")
+    parser = _Parser(tokens)
+    node = parser.expr()
+    parser.finish()
+    return _expression(node)
+
+
+def _parse_integral(tokens: List[Token]) -> IntegralExpr:
+    parser = _Parser(tokens)
+    parser.pos = 1  # skip \int
+    lower = upper = None
+    while parser.peek() in ((OP, "_"), (OP, "^")):
+        marker = parser.take()[1]
+        bound = _expression(parser.script())
+        if marker == "_":
+            lower = bound
+        else:
+            upper = bound
+    # The differential is the trailing "d <variable>"; everything before it is the integrand.
+    if len(tokens) - parser.pos < 2 or tokens[-2] != (NAME, "d") or tokens[-1][0] != NAME:
+        raise LatexParseError("Integral missing differential")
+    variable = tokens[-1][1]
+    # Slice the parser's own tokens: argument() may have split a number inside the bounds.
+    body = parser.tokens[parser.pos : parser.end - 2]
+    integrand = _parse_tokens(body) if body else _expression(_constant(1))  # \int dx
+    return IntegralExpr(integrand, variable, lower, upper)
+
+
+def parse_latex(latex: str) -> Tuple[Union[Expression, Equation, IntegralExpr], str]:
+    """Parse LaTeX into ``(object, kind)``; kind is ``"expr"``, ``"equation"`` or ``"integral"``."""
+
+    tokens = tokenize(latex)
+    if not tokens:
+        raise LatexParseError("Empty LaTeX expression")
+    if tokens[0] == (CMD, "int"):
+        return _parse_integral(tokens), "integral"
+    split = [idx for idx, token in enumerate(tokens) if token == (OP, "=")]
+    if not split:
+        return _parse_tokens(tokens), "expr"
+    if len(split) > 1:
+        raise LatexParseError("Only a single '=' is supported")
+    left, right = tokens[: split[0]], tokens[split[0] + 1 :]
+    return Equation(_parse_tokens(left), _parse_tokens(right)), "equation"
+
+
+__all__ = ["parse_latex", "tokenize", "LatexParseError"]
@@ -0,0 +1,161 @@
+"""Content-addressed cache for OCR results.
+
+Crops are keyed by a hash of their normalized ink (grayscale, binarized, trimmed to the
+ink bounding box and resized to a fixed grid) together with the engine name and model
+checksum, so re-selecting the same expression or undoing and redoing strokes hits the
+cache even when the selection box moved by a few pixels. Entries live in a bounded LRU and
+can optionally be persisted as small JSON files under ``~/.inkmath/cache``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from core.config import CONFIG_DIR
+from core.metrics import METRICS
+from ocr.engine import BatchResult, OcrEngine, to_gray
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = CONFIG_DIR / "cache" / "ocr"
+_GRID = (64, 256)  # rows, cols of the normalized ink raster
+
+
+def ink_fingerprint(img: np.ndarray) -> bytes:
+    """Return a position- and scale-invariant byte signature of the ink in ``img``."""
+
+    gray = to_gray(img)
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    if not ink.any():
+        return b"blank"
+    ys, xs = np.nonzero(ink)
+    trimmed = ink[ys.min() : ys.max() + 1, xs.min() : xs.max() + 1]
+    height, width = trimmed.shape
+    # Quantized aspect ratio keeps "-" and "|" apart after resizing to the same grid.
+    aspect = int(round(np.log2(width / height) * 4))
+    resized = cv2.resize(trimmed, (_GRID[1], _GRID[0]), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(resized >= 128)
+    return aspect.to_bytes(2, "big", signed=True) + bits.tobytes()
+
+
+def cache_key(img: np.ndarray, engine_name: str, model_checksum: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(engine_name.encode("utf-8") + b"\0" + model_checksum.encode("utf-8") + b"\0")
+    digest.update(ink_fingerprint(img))
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """Thread-safe LRU of OCR results with an optional on-disk backing store."""
+
+    def __init__(self, max_entries: int = 512, directory: Optional[Path] = None) -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory).expanduser() if directory is not None else None
+        self._entries: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, value: Dict[str, object]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+        if self.directory is not None:
+            try:
+                with self._path(key).open("r", encoding="utf-8") as fh:
+                    value = json.load(fh)
+            except (OSError, ValueError):
+                value = None
+            if isinstance(value, dict):
+                with self._lock:
+                    self._remember(key, value)
+                    self.hits += 1
+                return dict(value)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Dict[str, object]) -> None:
+        value = {"latex": value.get("latex", ""), "confidence": value.get("confidence", 0.0)}
+        with self._lock:
+            self._remember(key, value)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(value, fh)
+            os.replace(tmp, path)
+        except OSError:
+            LOGGER.debug("Could not persist OCR cache entry %s", key, exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedEngine:
+    """Wrap an :class:`~ocr.engine.OcrEngine` with an :class:`OcrCache`."""
+
+    def __init__(
+        self, engine: OcrEngine, cache: OcrCache, model_checksum: Optional[str] = None
+    ) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.name = engine.name
+        self.model_checksum = model_checksum or str(getattr(engine, "model_checksum", ""))
+
+    def infer_batch(self, images: Sequence[np.ndarray]) -> BatchResult:
+        start = time.perf_counter()
+        keys = [cache_key(img, self.name, self.model_checksum) for img in images]
+        items: List[Optional[Dict[str, object]]] = [self.cache.get(key) for key in keys]
+        missing = [idx for idx, item in enumerate(items) if item is None]
+        METRICS.increment("ocr.cache_hits", len(items) - len(missing))
+        METRICS.increment("ocr.cache_misses", len(missing))
+        buckets = 0
+        bucket_ms: List[float] = []
+        if missing:
+            inner = self.engine.infer_batch([images[idx] for idx in missing])
+            buckets, bucket_ms = inner.buckets, inner.bucket_ms
+            for idx, item in zip(missing, inner.items):
+                items[idx] = item
+                if item.get("latex"):
+                    self.cache.put(keys[idx], item)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        return BatchResult(
+            items=[item or {} for item in items],
+            elapsed_ms=elapsed,
+            buckets=buckets,
+            bucket_ms=bucket_ms,
+        )
+
+    def infer(self, img_bgr: np.ndarray) -> Dict[str, object]:
+        return self.infer_batch([img_bgr]).items[0]
+
+
+__all__ = ["CachedEngine", "OcrCache", "cache_key", "ink_fingerprint", "DEFAULT_CACHE_DIR"]
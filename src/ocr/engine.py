@@ -0,0 +1,113 @@
+"""Shared OCR engine protocol and batching helpers."""
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Protocol, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from core.metrics import METRICS
+from ocr.normalize import normalize_batch
+
+LOGGER = logging.getLogger(__name__)
+
+BucketKey = Tuple[int, int]
+
+
+@dataclass
+class BatchResult:
+    items: List[Dict[str, object]]
+    elapsed_ms: float
+    buckets: int
+    bucket_ms: List[float] = field(default_factory=list)
+
+    @property
+    def per_item_ms(self) -> float:
+        return self.elapsed_ms / len(self.items) if self.items else 0.0
+
+
+class OcrEngine(Protocol):
+    name: str
+
+    def infer(self, img_bgr: np.ndarray) -> Dict[str, object]: ...
+
+    def infer_batch(self, images: Sequence[np.ndarray]) -> BatchResult: ...
+
+
+def to_gray(img: np.ndarray) -> np.ndarray:
+    if img.ndim == 3 and img.shape[2] == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    if img.ndim == 3 and img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+    return np.asarray(img, dtype=np.uint8)
+
+
+class BatchedEngine(ABC):
+    """Base class that turns a per-batch ``_forward`` into ``infer``/``infer_batch``.
+
+    Crops are converted to grayscale and grouped into buckets whose sides are rounded up
+    to ``bucket_step`` pixels; each bucket is padded with white to a common shape and sent
+    through the model in one ``_forward`` call of at most ``max_batch`` images, which must
+    return exactly one result per image.
+    """
+
+    name = "base"
+    bucket_step = 32
+    max_batch = 16
+
+    @abstractmethod
+    def _forward(
+        self, batch: np.ndarray, sizes: Sequence[Tuple[int, int]]
+    ) -> List[Tuple[str, float]]:
+        """Run the model on a ``(N, H, W)`` uint8 batch; ``sizes`` are the unpadded shapes."""
+
+    def _bucket_key(self, shape: Tuple[int, int]) -> BucketKey:
+        step = self.bucket_step
+        height, width = shape
+        return (-(-height // step) * step, -(-width // step) * step)
+
+    def infer_batch(self, images: Sequence[np.ndarray]) -> BatchResult:
+        start = time.perf_counter()
+        with METRICS.span("crop"):
+            crops = [to_gray(img) for img in images]
+            buckets: Dict[BucketKey, List[int]] = {}
+            for idx, crop in enumerate(crops):
+                buckets.setdefault(self._bucket_key(crop.shape[:2]), []).append(idx)
+
+        items: List[Dict[str, object]] = [{} for _ in crops]
+        bucket_ms: List[float] = []
+        for (height, width), members in buckets.items():
+            for chunk_start in range(0, len(members), self.max_batch):
+                chunk = members[chunk_start : chunk_start + self.max_batch]
+                bucket_start = time.perf_counter()
+                batch = np.full((len(chunk), height, width), 255, dtype=np.uint8)
+                sizes: List[Tuple[int, int]] = []
+                for slot, idx in enumerate(chunk):
+                    crop = crops[idx]
+                    batch[slot, : crop.shape[0], : crop.shape[1]] = crop
+                    sizes.append(crop.shape[:2])
+                with METRICS.span("ocr"):
+                    outputs = self._forward(batch, sizes)
+                if len(outputs) != len(chunk):
+                    raise RuntimeError(
+                        f"{self.name} returned {len(outputs)} results for {len(chunk)} images"
+                    )
+                with METRICS.span("normalize"):
+                    normalized = normalize_batch([latex for latex, _ in outputs])
+                for idx, latex, (_, confidence) in zip(chunk, normalized, outputs):
+                    items[idx] = {"latex": latex, "confidence": float(confidence)}
+                bucket_ms.append((time.perf_counter() - bucket_start) * 1000.0)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        return BatchResult(
+            items=items, elapsed_ms=elapsed, buckets=len(bucket_ms), bucket_ms=bucket_ms
+        )
+
+    def infer(self, img_bgr: np.ndarray) -> Dict[str, object]:
+        return self.infer_batch([img_bgr]).items[0]
+
+
+__all__ = ["BatchResult", "BatchedEngine", "OcrEngine", "to_gray"]
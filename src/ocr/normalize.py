@@ -1,7 +1,15 @@
-"""Normalization utilities for OCR outputs."""
+"""Normalization utilities for OCR outputs.
+
+All single-character fixes (``COMMON_REPLACEMENTS`` and ``O`` → ``0``) are one precompiled
+``str.translate`` table. The context-sensitive rewrites use precompiled patterns with plain
+string replacements so every pass stays in C, and the rare ones are skipped outright when
+their trigger text is absent. :func:`normalize_batch` runs each pass once over all beam
+candidates of a crop joined together.
+"""
 from __future__ import annotations
 
 import re
+from typing import Dict, List, Sequence
 
 COMMON_REPLACEMENTS = {
     "−": "-",
@@ -13,25 +21,45 @@ COMMON_REPLACEMENTS = {
     "°": "^\\circ",
 }
 
+# "O" → "0" commutes with the regex passes (neither side is matched by any of them), so it
+# is folded into the same table.
+_TRANSLATION = str.maketrans({**COMMON_REPLACEMENTS, "O": "0"})
+_ANGLE_SPACE = re.compile(r"(?<=\\angle)\s+")
+_ISOLATED_L = re.compile(r"\b[lL]\b")
+_MATHRM_DX = re.compile(r"\\?mathrm\{dx\}")
+
+# Joins batch candidates: not whitespace, not a word character and not in any pattern.
+_SEPARATOR = "\x00"
 
-def _fix_misread_digits(text: str) -> str:
-    def replace(match: re.Match[str]) -> str:
-        token = match.group(0)
-        return "1" if token.lower() == "l" else token
 
-    return re.sub(r"\b[lL]\b", replace, text)
+def _rewrite(text: str) -> str:
+    text = text.translate(_TRANSLATION)
+    if "\\angle" in text:
+        text = _ANGLE_SPACE.sub("", text)
+    if "l" in text or "L" in text:
+        text = _ISOLATED_L.sub("1", text)
+    if "mathrm{dx}" in text:
+        text = _MATHRM_DX.sub(" dx", text)
+    return text
 
 
 def normalize_text(text: str) -> str:
-    result = text
-    for src, dst in COMMON_REPLACEMENTS.items():
-        result = result.replace(src, dst)
-    result = re.sub(r"(?<=\\angle)\s+", "", result)
-    result = _fix_misread_digits(result)
-    result = result.replace("O", "0")
-    result = re.sub(r"\\?mathrm\{dx\}", " dx", result)
-    result = re.sub(r"\s+", " ", result)
-    return result.strip()
-
-
-__all__ = ["normalize_text"]
+    # str.split() and re's \s share the same definition of whitespace.
+    return " ".join(_rewrite(text).split())
+
+
+def normalize_batch(candidates: Sequence[str]) -> List[str]:
+    """Normalize many candidates (e.g. OCR beams) at once; duplicates are normalized once."""
+
+    unique: Dict[str, str] = dict.fromkeys(candidates, "")
+    if any(_SEPARATOR in text for text in unique):
+        for text in unique:
+            unique[text] = normalize_text(text)
+    else:
+        parts = _rewrite(_SEPARATOR.join(unique)).split(_SEPARATOR)
+        for text, part in zip(unique, parts):
+            unique[text] = " ".join(part.split())
+    return [unique[text] for text in candidates]
+
+
+__all__ = ["normalize_text", "normalize_batch"]
@@ -3,29 +3,35 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from core.bootstrap import ensure_model
 from core.config import ModelConfig
-from ocr.normalize import normalize_text
+from ocr.engine import BatchedEngine
 
 LOGGER = logging.getLogger(__name__)
 
+MODEL_URL = "https://example.com/trocr-weights.pt"
+MODEL_CHECKSUM = "placeholder-checksum"
+
+
+class TrOCREngine(BatchedEngine):
+    name = "trocr"
 
-class TrOCREngine:
     def __init__(self, cfg: ModelConfig) -> None:
         self.cfg = cfg
         self.model_path = Path(cfg.trocr_path) / "weights.pt"
-        ensure_model(
-            self.model_path,
-            "https://example.com/trocr-weights.pt",
-            "placeholder-checksum",
-        )
+        self.model_checksum = MODEL_CHECKSUM
+        ensure_model(self.model_path, MODEL_URL, MODEL_CHECKSUM)
         LOGGER.info("TrOCR engine initialized using %s", self.model_path)
 
-    def infer(self, img_bgr) -> Dict[str, object]:  # pragma: no cover - heavy inference stub
+    def _forward(
+        self, batch: np.ndarray, sizes: Sequence[Tuple[int, int]]
+    ) -> List[Tuple[str, float]]:  # pragma: no cover - heavy inference stub
         LOGGER.warning("TrOCR inference is stubbed in this lightweight build.")
-        return {"latex": normalize_text(""), "confidence": 0.0}
+        return [("", 0.0) for _ in sizes]
 
 
 __all__ = ["TrOCREngine"]
@@ -0,0 +1,477 @@
+"""Headless batch recognition of image files.
+
+Inputs (a directory of images or a manifest) are streamed in chunks through a pool of
+worker processes. Each worker builds its OCR engine once, in the pool initializer, and runs
+a chunk as one ``infer_batch`` call followed by parse → solve → optional render per image.
+Solving goes through a per-worker :class:`~solve.executor.SolveExecutor`, so one
+pathological worksheet costs a timeout instead of a stuck worker. Records are appended to a
+JSONL file as chunks finish; on restart, ids already present in the file are skipped, which
+makes an interrupted run resumable. With ``retry_errors`` the failed ids are processed again
+and their old error records are removed once the run completes, so a finished output holds
+one record per id; should a retry run be interrupted first, the last record for an id wins.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Sized,
+    Tuple,
+)
+
+from .recognize import Recognition, recognize_ocr
+
+if TYPE_CHECKING:
+    from core.config import AppConfig
+    from ocr.engine import OcrEngine
+    from solve.executor import SolveExecutor
+
+LOGGER = logging.getLogger(__name__)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"})
+
+EngineFactory = Callable[["AppConfig"], "OcrEngine"]
+Record = Dict[str, Any]
+
+
+class BatchError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class BatchInput:
+    id: str
+    path: Path
+
+
+@dataclass
+class BatchOptions:
+    workers: int = 1  # 0 runs everything in the calling process
+    chunk_size: int = 8
+    solve_timeout_ms: Optional[float] = 800.0  # None solves in the worker without a hard limit
+    render_dir: Optional[Path] = None
+    retry_errors: bool = False
+    progress_interval_s: float = 10.0
+
+
+@dataclass
+class BatchSummary:
+    total: int
+    skipped: int
+    processed: int
+    errors: int
+    elapsed_s: float
+    p50_ms: float
+    p95_ms: float
+
+    @property
+    def images_per_s(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+# -- inputs ----------------------------------------------------------------------
+
+
+def iter_inputs(source: Path) -> Iterator[BatchInput]:
+    """Yield the images under a directory, or those listed in a manifest file.
+
+    A manifest is either plain text with one path per line (``#`` starts a comment) or
+    JSONL with ``{"path": ..., "id": ...}`` objects; relative paths are resolved against the
+    manifest's directory. Directory entries use their relative path as id.
+    """
+
+    source = Path(source)
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.suffix.lower() in IMAGE_SUFFIXES and path.is_file():
+                yield BatchInput(path.relative_to(source).as_posix(), path)
+        return
+    if not source.is_file():
+        raise BatchError(f"No such directory or manifest: {source}")
+    with source.open("r", encoding="utf-8") as fh:
+        for number, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    entry = json.loads(line)
+                    raw = str(entry["path"])
+                except (ValueError, KeyError) as exc:
+                    raise BatchError(f"{source}:{number}: invalid manifest entry") from exc
+                item_id = str(entry.get("id", raw))
+            else:
+                raw = item_id = line
+            path = Path(raw).expanduser()
+            yield BatchInput(item_id, path if path.is_absolute() else source.parent / path)
+
+
+def load_completed(output: Path, retry_errors: bool = False) -> Set[str]:
+    """Return the ids already recorded in ``output`` (only successful ones with ``retry_errors``).
+
+    A partial last line left by an interrupted run is cut off so appending stays valid.
+    """
+
+    succeeded, failed = _scan_output(output)
+    return succeeded if retry_errors else succeeded | failed
+
+
+def _scan_output(output: Path) -> Tuple[Set[str], Set[str]]:
+    """Ids with a successful record, and ids whose records are all errors."""
+
+    output = Path(output)
+    if not output.exists():
+        return set(), set()
+    succeeded: Set[str] = set()
+    failed: Set[str] = set()
+    valid_bytes = 0
+    with output.open("rb") as fh:
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            valid_bytes += len(raw)
+            (failed if record.get("error") else succeeded).add(str(record["id"]))
+    if valid_bytes != output.stat().st_size:
+        LOGGER.warning("Truncating incomplete record at the end of %s", output)
+        with output.open("r+b") as fh:
+            fh.truncate(valid_bytes)
+    return succeeded, failed - succeeded
+
+
+def _drop_superseded(output: Path, retried: Set[str], boundary: int) -> None:
+    """Rewrite ``output`` without the records before ``boundary`` for ``retried`` ids."""
+
+    tmp = output.with_name(output.name + ".tmp")
+    with output.open("rb") as src, tmp.open("wb") as dst:
+        while src.tell() < boundary:
+            raw = src.readline()
+            if str(json.loads(raw)["id"]) not in retried:
+                dst.write(raw)
+        for raw in src:
+            dst.write(raw)
+    os.replace(tmp, output)
+
+
+def _chunks(items: Iterable[BatchInput], size: int) -> Iterator[List[BatchInput]]:
+    chunk: List[BatchInput] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -- worker side -----------------------------------------------------------------
+
+
+@dataclass
+class _WorkerState:
+    engine: OcrEngine
+    config: AppConfig
+    options: BatchOptions
+    solver: Optional[SolveExecutor]
+
+
+_STATE: Optional[_WorkerState] = None
+
+
+def _init_worker(factory: EngineFactory, config: AppConfig, options: BatchOptions) -> None:
+    global _STATE
+    solver = None
+    if options.solve_timeout_ms is not None:
+        from solve.executor import SolveExecutor
+
+        solver = SolveExecutor(workers=1, timeout_ms=options.solve_timeout_ms)
+    _STATE = _WorkerState(factory(config), config, options, solver)
+
+
+def _close_worker() -> None:
+    global _STATE
+    if _STATE is not None and _STATE.solver is not None:
+        _STATE.solver.close()
+    _STATE = None
+
+
+def _read_image(path: Path) -> Any:
+    import cv2
+
+    image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if image is None:
+        raise BatchError(f"Could not read image {path}")
+    return image
+
+
+def _render_name(item_id: str) -> str:
+    """A unique, filesystem-safe file name: the id's readable stem plus a digest of the id."""
+
+    stem = _UNSAFE.sub("_", Path(item_id).stem)[:60] or "answer"
+    digest = hashlib.sha256(item_id.encode("utf-8")).hexdigest()[:12]
+    return f"{stem}-{digest}.png"
+
+
+def _render(state: _WorkerState, item: BatchInput, result: Recognition) -> str:
+    from render.latex import render_latex
+
+    assert state.options.render_dir is not None
+    render = state.config.render
+    png = render_latex(
+        result.answer or "", dpi=render.dpi, font_size=render.font_size, theme=render.theme
+    ).image_bytes
+    target = Path(state.options.render_dir) / _render_name(item.id)
+    target.write_bytes(png)
+    return str(target)
+
+
+def _record(item: BatchInput, result: Recognition, rendered: Optional[str]) -> Record:
+    return {
+        "id": item.id,
+        "path": str(item.path),
+        "latex": result.latex,
+        "confidence": result.confidence,
+        "kind": result.kind,
+        "answer": result.answer,
+        "steps": result.steps,
+        "numeric": result.numeric,
+        "error": result.error,
+        "elapsed_ms": round(result.elapsed_ms, 3),
+        "render": rendered,
+        "worker": os.getpid(),
+    }
+
+
+def process_chunk(items: List[BatchInput]) -> List[Record]:
+    """Recognize one chunk in the current worker; every item yields exactly one record."""
+
+    state = _STATE
+    if state is None:
+        raise BatchError("Worker is not initialized")
+    start = time.perf_counter()
+    results = [Recognition() for _ in items]
+    images: List[Tuple[int, Any]] = []
+    for idx, item in enumerate(items):
+        try:
+            images.append((idx, _read_image(item.path)))
+        except Exception as exc:  # noqa: BLE001 - reported in the record
+            results[idx].error = str(exc) or type(exc).__name__
+    ocr_ms = 0.0
+    if images:
+        try:
+            batch = state.engine.infer_batch([image for _, image in images])
+            ocr_ms = batch.per_item_ms
+            outputs = batch.items
+        except Exception as exc:  # noqa: BLE001 - a failed batch fails only its items
+            LOGGER.debug("OCR batch failed", exc_info=True)
+            outputs = [{"error": str(exc) or type(exc).__name__}] * len(images)
+        ocr_cfg = state.config.ocr
+        for (idx, _), ocr in zip(images, outputs):
+            result = results[idx]
+            if "error" in ocr:
+                result.error = str(ocr["error"])
+                continue
+            item_start = time.perf_counter()
+            recognize_ocr(
+                ocr,
+                ocr_cfg.min_confidence,
+                state.config.solve.numeric_fallback,
+                # Leave headroom so quadrature reports its own estimate before the hard kill.
+                None if state.solver is None else state.options.solve_timeout_ms * 0.5,
+                state.solver,
+                result,
+            )
+            result.elapsed_ms = ocr_ms + (time.perf_counter() - item_start) * 1000.0
+    records = []
+    for item, result in zip(items, results):
+        rendered = None
+        if result.ok and state.options.render_dir is not None:
+            try:
+                rendered = _render(state, item, result)
+            except Exception as exc:  # noqa: BLE001 - keep the answer, note the failure
+                result.error = f"Render failed: {exc}"
+        if not result.elapsed_ms:
+            result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        records.append(_record(item, result, rendered))
+    return records
+
+
+# -- driver ----------------------------------------------------------------------
+
+
+class _Progress:
+    def __init__(
+        self, total: Optional[int], interval_s: float, report: Callable[[str], None]
+    ) -> None:
+        self.total = total
+        self.interval_s = interval_s
+        self.report = report
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.done = 0
+
+    def update(self, count: int) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self.last < self.interval_s:
+            return
+        self.last = now
+        rate = self.done / (now - self.start)
+        if self.total is None:
+            self.report(f"{self.done} images, {rate:.1f} images/s")
+            return
+        remaining = (self.total - self.done) / rate if rate > 0 else float("inf")
+        self.report(
+            f"{self.done}/{self.total} images, {rate:.1f} images/s, ETA {remaining / 60:.1f} min"
+        )
+
+
+def run_batch(
+    inputs: Iterable[BatchInput],
+    output: Path,
+    factory: EngineFactory,
+    config: AppConfig,
+    options: Optional[BatchOptions] = None,
+    report: Callable[[str], None] = LOGGER.info,
+) -> BatchSummary:
+    """Recognize ``inputs`` and append one JSON record per image to ``output``.
+
+    ``factory`` builds the OCR engine from ``config`` inside each worker, so it must be a
+    picklable (module-level) callable when ``options.workers`` is non-zero. ``inputs`` is
+    consumed lazily; progress shows an ETA only when it has a length.
+    """
+
+    options = options or BatchOptions()
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if options.render_dir is not None:
+        Path(options.render_dir).mkdir(parents=True, exist_ok=True)
+    succeeded, failed = _scan_output(output)
+    done = succeeded if options.retry_errors else succeeded | failed
+    if done:
+        report(f"Resuming: {len(done)} images already recorded in {output}")
+    boundary = output.stat().st_size if output.exists() else 0
+    skipped = 0
+
+    def pending() -> Iterator[BatchInput]:
+        nonlocal skipped
+        for item in inputs:
+            if item.id in done:
+                skipped += 1
+            else:
+                yield item
+
+    start = time.perf_counter()
+    total = sum(item.id not in done for item in inputs) if isinstance(inputs, Sized) else None
+    progress = _Progress(total, options.progress_interval_s, report)
+    latencies: List[float] = []
+    retried: Set[str] = set()
+    errors = 0
+    with output.open("a", encoding="utf-8") as sink:
+
+        def write(records: List[Record]) -> None:
+            nonlocal errors
+            for record in records:
+                sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+                latencies.append(record["elapsed_ms"])
+                errors += record["error"] is not None
+                if record["id"] in failed:
+                    retried.add(record["id"])
+            sink.flush()
+            progress.update(len(records))
+
+        chunks = _chunks(pending(), max(1, options.chunk_size))
+        if options.workers <= 0:
+            _init_worker(factory, config, options)
+            try:
+                for chunk in chunks:
+                    write(process_chunk(chunk))
+            finally:
+                _close_worker()
+        else:
+            _run_pool(chunks, factory, config, options, write)
+    if retried:
+        _drop_superseded(output, retried, boundary)
+
+    elapsed = time.perf_counter() - start
+    p50 = p95 = latencies[0] if latencies else 0.0
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=20)
+        p50, p95 = cuts[9], cuts[18]
+    summary = BatchSummary(
+        total=skipped + len(latencies),
+        skipped=skipped,
+        processed=len(latencies),
+        errors=errors,
+        elapsed_s=elapsed,
+        p50_ms=p50,
+        p95_ms=p95,
+    )
+    report(
+        f"Processed {summary.processed} images in {elapsed:.1f} s "
+        f"({summary.images_per_s:.2f} images/s, p50 {summary.p50_ms:.0f} ms, "
+        f"p95 {summary.p95_ms:.0f} ms); {summary.errors} errors, {skipped} skipped"
+    )
+    return summary
+
+
+def _run_pool(
+    chunks: Iterator[List[BatchInput]],
+    factory: EngineFactory,
+    config: AppConfig,
+    options: BatchOptions,
+    write: Callable[[List[Record]], None],
+) -> None:
+    import multiprocessing
+
+    # Only a few chunks per worker are in flight, so huge manifests are never materialized
+    # as futures and an interruption loses little finished work.
+    window = options.workers * 2
+    with ProcessPoolExecutor(
+        max_workers=options.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(factory, config, options),
+    ) as pool:
+        in_flight: Set[Future[List[Record]]] = set()
+        for chunk in chunks:
+            in_flight.add(pool.submit(process_chunk, chunk))
+            if len(in_flight) >= window:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+        for future in wait(in_flight).done:
+            write(future.result())
+
+
+__all__ = [
+    "BatchError",
+    "BatchInput",
+    "BatchOptions",
+    "BatchSummary",
+    "iter_inputs",
+    "load_completed",
+    "process_chunk",
+    "run_batch",
+]
@@ -0,0 +1,164 @@
+"""OCR → parse → solve pipeline for a single cropped image."""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from core.metrics import METRICS
+from nl.expressions import Equation, IntegralExpr
+from nl.latex_to_sympy import latex_to_sympy
+from solve.algebra import solve_equation
+from solve.calculus import solve_integral
+
+if TYPE_CHECKING:
+    from ocr.engine import OcrEngine
+    from solve.executor import SolveExecutor
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Recognition:
+    latex: str = ""
+    confidence: float = 0.0
+    kind: Optional[str] = None
+    answer: Optional[str] = None
+    steps: List[str] = field(default_factory=list)
+    numeric: Optional[float] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.answer is not None
+
+
+def _format_number(value: Any) -> str:
+    if isinstance(value, complex):
+        return f"{value.real:.6g} {'+' if value.imag >= 0 else '-'} {abs(value.imag):.6g}i"
+    return f"{float(value):.6g}"
+
+
+def _format_polynomial(poly: Dict[int, float], variable: str) -> str:
+    terms = []
+    for power in sorted(poly, reverse=True):
+        coeff = poly[power]
+        if coeff == 0:
+            continue
+        if power == 0:
+            terms.append(_format_number(coeff))
+        elif power == 1:
+            terms.append(f"{_format_number(coeff)}{variable}")
+        else:
+            terms.append(f"{_format_number(coeff)}{variable}^{{{power}}}")
+    return " + ".join(terms).replace("+ -", "- ") or "0"
+
+
+def solve_parsed(
+    parsed: Any,
+    kind: str,
+    result: Recognition,
+    numeric_fallback: bool = True,
+    numeric_budget_ms: Optional[float] = None,
+    solver: Optional[SolveExecutor] = None,
+) -> None:
+    """Solve a parsed object and record the answer on ``result``.
+
+    With a ``solver`` the work runs in its worker processes under a hard timeout.
+    ``numeric_budget_ms=None`` keeps the numeric integrator's default budget.
+    """
+
+    if kind == "equation" and isinstance(parsed, Equation):
+        if solver is not None:
+            solutions, steps = solver.solve("equation", parsed).unwrap()
+        else:
+            solutions, steps = solve_equation(parsed)
+        variable = sorted(parsed.variables)[0]
+        result.answer = f"{variable} = " + ", ".join(_format_number(s) for s in solutions)
+        result.steps = steps
+    elif kind == "integral" and isinstance(parsed, IntegralExpr):
+        options: Dict[str, Any] = {"numeric_fallback": numeric_fallback}
+        if numeric_budget_ms is not None:
+            options["time_budget_ms"] = numeric_budget_ms
+        if solver is not None:
+            integrated, steps, numeric = solver.solve("integral", parsed, **options).unwrap()
+        else:
+            integrated, steps, numeric = solve_integral(parsed, **options)
+        if numeric is None and integrated is not None:
+            result.answer = f"{_format_polynomial(integrated, parsed.variable)} + C"
+        else:
+            result.answer = f"{_format_number(numeric)}"
+        result.steps = steps
+        result.numeric = numeric
+    else:
+        result.answer = parsed.text
+        result.steps = ["Parsed expression"]
+
+
+def recognize_ocr(
+    ocr: Dict[str, object],
+    min_confidence: float = 0.0,
+    numeric_fallback: bool = True,
+    numeric_budget_ms: Optional[float] = None,
+    solver: Optional[SolveExecutor] = None,
+    result: Optional[Recognition] = None,
+) -> Recognition:
+    """Parse and solve an OCR result (``{"latex": ..., "confidence": ...}``).
+
+    Like :func:`recognize`, failures are reported on the returned :class:`Recognition`.
+    """
+
+    result = result if result is not None else Recognition()
+    try:
+        result.latex = str(ocr.get("latex", ""))
+        result.confidence = float(ocr.get("confidence", 0.0))  # type: ignore[arg-type]
+        if not result.latex:
+            result.error = "Nothing recognized"
+        elif result.confidence < min_confidence:
+            result.error = f"Low OCR confidence ({result.confidence:.2f})"
+        else:
+            with METRICS.span("parse"):
+                parsed, kind = latex_to_sympy(result.latex)
+            result.kind = kind
+            with METRICS.span("solve"):
+                solve_parsed(parsed, kind, result, numeric_fallback, numeric_budget_ms, solver)
+    except Exception as exc:  # noqa: BLE001 - surfaced to the caller as data
+        LOGGER.debug("Recognition failed", exc_info=True)
+        result.error = str(exc) or type(exc).__name__
+    return result
+
+
+def recognize(
+    image: Any,
+    engine: OcrEngine,
+    min_confidence: float = 0.0,
+    numeric_fallback: bool = True,
+    numeric_budget_ms: Optional[float] = None,
+    solver: Optional[SolveExecutor] = None,
+) -> Recognition:
+    """Run OCR on ``image`` and solve whatever was recognized.
+
+    Failures are reported on the returned :class:`Recognition` rather than raised, so callers
+    running this off the UI thread never lose an exception.
+    """
+
+    start = time.perf_counter()
+    result = Recognition()
+    try:
+        ocr = engine.infer(image)
+    except Exception as exc:  # noqa: BLE001 - surfaced to the caller as data
+        LOGGER.debug("OCR failed", exc_info=True)
+        result.error = str(exc) or type(exc).__name__
+    else:
+        recognize_ocr(ocr, min_confidence, numeric_fallback, numeric_budget_ms, solver, result)
+    result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+    METRICS.observe("pipeline", result.elapsed_ms)
+    METRICS.increment("recognitions")
+    if result.error is not None:
+        METRICS.increment("recognition_errors")
+    return result
+
+
+__all__ = ["Recognition", "recognize", "recognize_ocr", "solve_parsed"]
@@ -0,0 +1,149 @@
+"""Background recognition scheduling.
+
+The UI thread hands snapshots of the ink to :class:`RecognitionScheduler.submit` and keeps
+rendering; a single worker thread waits for ``debounce_ms`` of quiet, runs the pipeline on
+the newest snapshot only, and queues the result. Requests superseded while they wait are
+coalesced, and a result whose request was superseded while it was running is dropped, so
+the board never shows answers for stale ink. ``poll`` drains finished results on the UI
+thread, where it is safe to touch the :class:`~render.board.AnswerBoard`.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from core.metrics import METRICS
+from render.board import AnswerBoard
+
+from .recognize import Recognition
+
+LOGGER = logging.getLogger(__name__)
+
+Pipeline = Callable[[Any], Recognition]
+
+
+@dataclass
+class ScheduledResult:
+    request_id: int
+    recognition: Recognition
+
+
+@dataclass
+class _Request:
+    request_id: int
+    image: Any
+    due: float
+
+
+class RecognitionScheduler:
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        debounce_ms: int = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.pipeline = pipeline
+        self.debounce = max(0, debounce_ms) / 1000.0
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._pending: Optional[_Request] = None
+        self._latest_id = 0
+        self._cancelled_through = 0
+        self._stopped = False
+        self._results: "queue.SimpleQueue[ScheduledResult]" = queue.SimpleQueue()
+        self.coalesced = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="inkmath-recognizer", daemon=True)
+        self._thread.start()
+
+    def submit(self, image: Any, immediate: bool = False) -> int:
+        """Schedule recognition of ``image``; the caller must not mutate it afterwards.
+
+        Each submission restarts the debounce window unless ``immediate`` is set.
+        """
+
+        with self._cond:
+            self._latest_id += 1
+            if self._pending is not None:
+                self.coalesced += 1
+                METRICS.increment("scheduler.coalesced")
+            delay = 0.0 if immediate else self.debounce
+            self._pending = _Request(self._latest_id, image, self._clock() + delay)
+            self._cond.notify()
+            return self._latest_id
+
+    def cancel(self) -> None:
+        """Forget the pending request and discard any result still in flight."""
+
+        with self._cond:
+            self._pending = None
+            self._cancelled_through = self._latest_id
+
+    def _is_current(self, request_id: int) -> bool:
+        return request_id == self._latest_id and request_id > self._cancelled_through
+
+    def _next_request(self) -> Optional[_Request]:
+        with self._cond:
+            while not self._stopped:
+                pending = self._pending
+                if pending is None:
+                    self._cond.wait()
+                    continue
+                remaining = pending.due - self._clock()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._pending = None
+                return pending
+            return None
+
+    def _run(self) -> None:
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            try:
+                recognition = self.pipeline(request.image)
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive
+                LOGGER.exception("Recognition pipeline crashed")
+                recognition = Recognition(error=str(exc) or type(exc).__name__)
+            with self._cond:
+                if not self._is_current(request.request_id):
+                    self.dropped += 1
+                    METRICS.increment("scheduler.dropped")
+                    continue
+            self._results.put(ScheduledResult(request.request_id, recognition))
+
+    def poll(self, board: Optional[AnswerBoard] = None) -> List[ScheduledResult]:
+        """Return finished results without blocking, posting successes to ``board``."""
+
+        finished: List[ScheduledResult] = []
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._cond:
+                if item.request_id <= self._cancelled_through:
+                    continue
+            finished.append(item)
+            rec = item.recognition
+            if board is not None and rec.ok:
+                board.add_entry(rec.latex, rec.answer or "", rec.steps, numeric=rec.numeric)
+            elif rec.error:
+                LOGGER.info("Recognition skipped: %s", rec.error)
+        return finished
+
+    def close(self, timeout: Optional[float] = 1.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+__all__ = ["RecognitionScheduler", "ScheduledResult"]
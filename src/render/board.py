@@ -1,11 +1,32 @@
-"""Answer board management."""
+"""Answer board management.
+
+Adding an answer is cheap: the LaTeX render is queued on a background thread (or deferred
+until :meth:`AnswerBoard.render` first needs it), so the UI never waits for matplotlib.
+Only the newest ``memory_entries`` answers are kept in memory; older ones are spilled to a
+:class:`~render.history.HistoryStore` on disk and reloaded transparently when indexed, so a
+long session's footprint stays flat however many answers it produces.
+"""
 from __future__ import annotations
 
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Iterator, List, Optional
+
+from core.metrics import METRICS
+
+if TYPE_CHECKING:
+    from .history import HistoryStore
+    from .latex import LatexRenderResult
+
+LOGGER = logging.getLogger(__name__)
 
-from .latex import LatexRenderResult, render_latex
+MEMORY_ENTRIES = 200
+RELOAD_CACHE = 32
 
 
 @dataclass
@@ -16,12 +37,46 @@ class AnswerEntry:
     steps: List[str]
     numeric: Optional[float] = None
     rendered: Optional[LatexRenderResult] = None
+    _job: Optional["Future[LatexRenderResult]"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def poll(self) -> Optional[LatexRenderResult]:
+        """The rendered image if it is available, without waiting for or starting a render."""
+
+        job = self._job
+        if self.rendered is None and job is not None and job.done():
+            if not job.cancelled() and job.exception() is None:
+                self.rendered = job.result()
+            self._job = None
+        return self.rendered
+
+
+def _render_entry(latex: str) -> LatexRenderResult:
+    # Imported here so that loading the board does not pull in matplotlib.
+    from .latex import render_latex
+
+    with METRICS.span("render"):
+        return render_latex(latex)
 
 
 @dataclass
 class AnswerBoard:
-    entries: List[AnswerEntry] = field(default_factory=list)
+    """Answers in arrival order; index it like a list (``board[-1]``, ``board[i]``)."""
 
+    memory_entries: int = MEMORY_ENTRIES
+    background_render: bool = True
+    history_dir: Optional[Path] = None  # default: a temporary directory, removed on close
+    _recent: Deque[AnswerEntry] = field(default_factory=deque, init=False, repr=False)
+    _spilled: int = field(default=0, init=False, repr=False)
+    _history: Optional[HistoryStore] = field(default=None, init=False, repr=False)
+    _reloaded: "OrderedDict[int, AnswerEntry]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _executor: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    # -- adding --------------------------------------------------------------
     def add_entry(
         self,
         prompt: str,
@@ -29,20 +84,112 @@ class AnswerBoard:
         steps: List[str],
         numeric: Optional[float] = None,
     ) -> AnswerEntry:
-        rendered = render_latex(latex)
         entry = AnswerEntry(
             timestamp=datetime.utcnow(),
             prompt=prompt,
             latex=latex,
             steps=steps,
             numeric=numeric,
-            rendered=rendered,
         )
-        self.entries.append(entry)
+        if self.background_render:
+            entry._job = self._renderer().submit(_render_entry, latex)
+        self.append(entry)
         return entry
 
+    def append(self, entry: AnswerEntry) -> None:
+        """Add an already built entry (e.g. one restored from a saved session)."""
+
+        self._recent.append(entry)
+        while len(self._recent) > max(1, self.memory_entries):
+            self._spill(self._recent.popleft())
+
+    def _renderer(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inkmath-render")
+        return self._executor
+
+    def _spill(self, entry: AnswerEntry) -> None:
+        if entry.poll() is None and entry._job is not None:
+            entry._job.cancel()  # not rendered yet: the reloaded entry renders on demand
+            entry._job = None
+        if self._history is None:
+            from .history import HistoryStore
+
+            self._history = HistoryStore(self.history_dir)
+        self._history.append(entry)
+        self._spilled += 1
+
+    # -- reading -------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def __getitem__(self, index: int) -> AnswerEntry:
+        size = len(self)
+        position = index + size if index < 0 else index
+        if not 0 <= position < size:
+            raise IndexError("answer index out of range")
+        if position >= self._spilled:
+            return self._recent[position - self._spilled]
+        with self._lock:
+            entry = self._reloaded.get(position)
+            if entry is not None:
+                self._reloaded.move_to_end(position)
+                return entry
+        assert self._history is not None
+        entry = self._history.load(position)
+        with self._lock:
+            self._reloaded[position] = entry
+            while len(self._reloaded) > RELOAD_CACHE:
+                self._reloaded.popitem(last=False)
+        return entry
+
+    def __iter__(self) -> Iterator[AnswerEntry]:
+        for position in range(len(self)):
+            yield self[position]
+
+    @property
+    def entries(self) -> List[AnswerEntry]:
+        """All entries as a list; spilled ones are reloaded, so prefer indexing or ``window``."""
+
+        return list(self)
+
+    def window(self, start: int, stop: int) -> List[AnswerEntry]:
+        """Entries ``start:stop`` (as for a list slice), e.g. the rows a view scrolled to."""
+
+        return [self[position] for position in range(*slice(start, stop).indices(len(self)))]
+
     def latest(self) -> Optional[AnswerEntry]:
-        return self.entries[-1] if self.entries else None
+        return self._recent[-1] if self._recent else None
+
+    @property
+    def in_memory(self) -> int:
+        return len(self._recent) + len(self._reloaded)
+
+    # -- rendering -----------------------------------------------------------
+    def render(self, entry: AnswerEntry) -> LatexRenderResult:
+        """Return the entry's image, waiting for or performing its render on first display."""
+
+        if entry.rendered is None:
+            job = entry._job
+            try:
+                entry.rendered = job.result() if job is not None else None
+            except Exception:  # noqa: BLE001 - fall back to rendering on this thread
+                LOGGER.debug("Background render failed", exc_info=True)
+            if entry.rendered is None:
+                entry.rendered = _render_entry(entry.latex)
+            entry._job = None
+        return entry.rendered
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+        self._recent.clear()
+        self._reloaded.clear()
+        self._spilled = 0
 
 
 __all__ = ["AnswerBoard", "AnswerEntry"]
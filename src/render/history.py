@@ -0,0 +1,103 @@
+"""On-disk history for answers spilled out of the in-memory :class:`~render.board.AnswerBoard`.
+
+Entries are appended to ``entries.jsonl`` in the :class:`~storage.session.SessionEntry` JSON
+form; only their byte offsets stay in memory (8 bytes per entry), so reloading one is a
+single seek. Rendered images go to ``images/<sha256>.png`` and are written once however
+many entries share them. Entries spilled before their render finished come back without an
+image and are rendered again when first displayed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from storage.session import SessionEntry
+
+from .board import AnswerEntry
+
+LOGGER = logging.getLogger(__name__)
+
+ENTRIES_FILE = "entries.jsonl"
+IMAGES_DIR = "images"
+
+
+class HistoryStore:
+    """Append-only answer history; ``directory=None`` uses a temporary directory."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self._temporary = directory is None
+        if directory is None:
+            directory = Path(tempfile.mkdtemp(prefix="inkmath-history-"))
+        self.directory = Path(directory)
+        (self.directory / IMAGES_DIR).mkdir(parents=True, exist_ok=True)
+        self._file = open(self.directory / ENTRIES_FILE, "w+b")
+        self._offsets = array("q")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, entry: AnswerEntry) -> int:
+        """Store ``entry`` and return its position in the history."""
+
+        digest = dpi = size = None
+        if entry.rendered is not None:
+            png = entry.rendered.to_png()
+            if png:
+                digest = hashlib.sha256(png).hexdigest()
+                image = self.directory / IMAGES_DIR / f"{digest}.png"
+                if not image.exists():
+                    image.write_bytes(png)
+                dpi, size = entry.rendered.dpi, entry.rendered.size_inches
+        stored = SessionEntry(
+            entry.timestamp, entry.prompt, entry.latex, list(entry.steps), entry.numeric,
+            digest, dpi, size,
+        )
+        line = json.dumps(stored.to_json(), ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            self._file.seek(0, 2)
+            self._offsets.append(self._file.tell())
+            self._file.write(line)
+            return len(self._offsets) - 1
+
+    def load(self, position: int) -> AnswerEntry:
+        with self._lock:
+            self._file.seek(self._offsets[position])
+            stored = SessionEntry.from_json(json.loads(self._file.readline()))
+        rendered = None
+        if stored.image is not None:
+            image = self.directory / IMAGES_DIR / f"{stored.image}.png"
+            if image.exists():
+                from .latex import LatexRenderResult
+
+                rendered = LatexRenderResult(
+                    image_bytes=image.read_bytes(),
+                    dpi=stored.dpi or 0,
+                    size_inches=stored.size_inches or (0.0, 0.0),
+                )
+            else:
+                LOGGER.warning("History image %s is missing; it will be re-rendered", stored.image)
+        return AnswerEntry(
+            timestamp=stored.timestamp,
+            prompt=stored.prompt,
+            latex=stored.latex,
+            steps=list(stored.steps),
+            numeric=stored.numeric,
+            rendered=rendered,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        if self._temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+__all__ = ["HistoryStore"]
@@ -1,11 +1,29 @@
-"""Utilities to render LaTeX snippets to raster images."""
+"""Utilities to render LaTeX snippets to raster images.
+
+Rendering reuses a single Agg figure instead of building and tearing down a pyplot figure
+per call, and results are memoized per ``(latex, dpi, font_size, theme)``. Callers that
+display through OpenCV can ask for the raw RGBA buffer and skip PNG encoding entirely.
+"""
 from __future__ import annotations
 
-import io
+import math
+import threading
 from dataclasses import dataclass
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import IdentityTransform
 
-import matplotlib.pyplot as plt
+THEMES: Dict[str, Tuple[str, str]] = {
+    "light": ("black", "white"),
+    "dark": ("white", "#1e1e1e"),
+}
+_PAD_PX = 4
+_CACHE_SIZE = 256
 
 
 @dataclass
@@ -13,19 +31,107 @@ class LatexRenderResult:
     image_bytes: bytes
     dpi: int
     size_inches: Tuple[float, float]
+    rgba: Optional[np.ndarray] = None
+
+    def to_png(self) -> bytes:
+        if self.image_bytes or self.rgba is None:
+            return self.image_bytes
+        return _encode_png(self.rgba)
+
+    def to_rgba(self) -> np.ndarray:
+        if self.rgba is not None:
+            return self.rgba
+        raw = np.frombuffer(self.image_bytes, dtype=np.uint8)
+        decoded = cv2.imdecode(raw, cv2.IMREAD_UNCHANGED)
+        return cv2.cvtColor(decoded, cv2.COLOR_BGRA2RGBA)
+
+
+class _AggRenderer:
+    """One reusable figure/text pair; Agg is not thread-safe so calls are serialized."""
+
+    def __init__(self) -> None:
+        self.figure = Figure(figsize=(4, 1), dpi=100)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.text = self.figure.text(
+            0, 0, "", transform=IdentityTransform(), ha="left", va="baseline"
+        )
+        self.lock = threading.Lock()
+
+    def render(self, latex: str, dpi: int, font_size: int, theme: str) -> np.ndarray:
+        foreground, background = THEMES.get(theme, THEMES["light"])
+        with self.lock:
+            figure, text = self.figure, self.text
+            figure.set_dpi(dpi)
+            figure.patch.set_facecolor(background)
+            text.set_text(f"${latex}$")
+            text.set_fontsize(font_size)
+            text.set_color(foreground)
+            text.set_position((0, 0))
+            extent = text.get_window_extent(self.canvas.get_renderer())
+            width = int(math.ceil(extent.width)) + 2 * _PAD_PX
+            height = int(math.ceil(extent.height)) + 2 * _PAD_PX
+            figure.set_size_inches(width / dpi, height / dpi)
+            text.set_position((_PAD_PX - extent.x0, _PAD_PX - extent.y0))
+            self.canvas.draw()
+            buffer = np.asarray(self.canvas.buffer_rgba())
+            return buffer[:height, :width].copy()
+
+
+_renderer: Optional[_AggRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def _get_renderer() -> _AggRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = _AggRenderer()
+        return _renderer
+
+
+def _encode_png(rgba: np.ndarray) -> bytes:
+    ok, encoded = cv2.imencode(".png", cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGRA))
+    if not ok:
+        raise RuntimeError("PNG encoding failed")
+    return encoded.tobytes()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _render_rgba(latex: str, dpi: int, font_size: int, theme: str) -> np.ndarray:
+    rgba = _get_renderer().render(latex, dpi, font_size, theme)
+    rgba.flags.writeable = False
+    return rgba
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _render_png(latex: str, dpi: int, font_size: int, theme: str) -> bytes:
+    return _encode_png(_render_rgba(latex, dpi, font_size, theme))
+
+
+def render_latex(
+    latex: str,
+    dpi: int = 160,
+    font_size: int = 14,
+    theme: str = "light",
+    as_array: bool = False,
+) -> LatexRenderResult:
+    """Render ``latex`` as math text.
+
+    With ``as_array`` the result carries a read-only ``(H, W, 4)`` RGBA buffer in ``rgba``
+    and no PNG bytes; otherwise ``image_bytes`` holds the encoded PNG.
+    """
+
+    rgba = _render_rgba(latex, dpi, font_size, theme)
+    size_inches = (rgba.shape[1] / dpi, rgba.shape[0] / dpi)
+    if as_array:
+        return LatexRenderResult(image_bytes=b"", dpi=dpi, size_inches=size_inches, rgba=rgba)
+    png = _render_png(latex, dpi, font_size, theme)
+    return LatexRenderResult(image_bytes=png, dpi=dpi, size_inches=size_inches)
 
 
-def render_latex(latex: str, dpi: int = 160, font_size: int = 14) -> LatexRenderResult:
-    plt.rc("text", usetex=False)
-    fig = plt.figure(figsize=(4, 1), dpi=dpi)
-    fig.patch.set_facecolor("white")
-    ax = fig.add_subplot(111)
-    ax.axis("off")
-    ax.text(0.5, 0.5, f"$${latex}$$", fontsize=font_size, ha="center", va="center")
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight", transparent=False)
-    plt.close(fig)
-    return LatexRenderResult(image_bytes=buffer.getvalue(), dpi=dpi, size_inches=fig.get_size_inches())
+def clear_render_cache() -> None:
+    _render_rgba.cache_clear()
+    _render_png.cache_clear()
 
 
-__all__ = ["render_latex", "LatexRenderResult"]
+__all__ = ["render_latex", "LatexRenderResult", "clear_render_cache", "THEMES"]
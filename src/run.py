@@ -1,38 +1,45 @@
-"""InkMath entry point."""
+"""InkMath entry point.
+
+Only the standard library is imported at module level. Configuration and logging load in
+``main``; OpenCV and NumPy load when the canvas is created; the OCR engine, model checks
+and the LaTeX renderer warm up on a background thread while the window is already open.
+"""
 from __future__ import annotations
 
 import logging
-import time
+import sys
+import threading
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
 
-import cv2
-import numpy as np
+from core.lazy import lazy_module
+from core.profiling import StartupProfiler
 
-from core.bootstrap import verify_models
-from core.config import CONFIG_DIR, AppConfig, load_config, parse_cli
-from core.logging_setup import setup_logging
-from render.board import AnswerBoard
+if TYPE_CHECKING:
+    from core.config import AppConfig
+    from ocr.engine import OcrEngine
+    from pipeline.scheduler import RecognitionScheduler
 
-LOGGER = logging.getLogger(__name__)
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
 
+LOGGER = logging.getLogger(__name__)
 
-PIX2TEX_INFO = (
-    Path(CONFIG_DIR / "models" / "pix2tex" / "weights.pt"),
-    "https://example.com/pix2tex-weights.pt",
-    "placeholder-checksum",
-)
-TROCR_INFO = (
-    Path(CONFIG_DIR / "models" / "trocr" / "weights.pt"),
-    "https://example.com/trocr-weights.pt",
-    "placeholder-checksum",
-)
+PIX2TEX_URL = "https://example.com/pix2tex-weights.pt"
+TROCR_URL = "https://example.com/trocr-weights.pt"
+PLACEHOLDER_CHECKSUM = "placeholder-checksum"
 
 
 class SimpleCanvas:
     """A very small OpenCV-based canvas suitable for early development."""
 
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, scheduler: Optional[RecognitionScheduler] = None) -> None:
+        from render.board import AnswerBoard
+
         self.config = config
+        self.scheduler = scheduler
         self.size = (config.canvas.height, config.canvas.width, 3)
         self.canvas = np.ones(self.size, dtype=np.uint8) * 255
         self.window_name = "InkMath Canvas"
@@ -40,7 +47,8 @@ class SimpleCanvas:
         self.last_point: tuple[int, int] | None = None
         self.brush_color = (0, 0, 0)
         self.brush_size = 4
-        self.answer_board = AnswerBoard()
+        self.answer_board = AnswerBoard(memory_entries=config.render.history_in_memory)
+        self._deferred_request: Optional[bool] = None
 
     def _draw_line(self, start: tuple[int, int], end: tuple[int, int]) -> None:
         cv2.line(self.canvas, start, end, self.brush_color, self.brush_size, lineType=cv2.LINE_AA)
@@ -58,41 +66,181 @@ class SimpleCanvas:
         if event == cv2.EVENT_LBUTTONUP:
             self.drawing = False
             self.last_point = None
+            self.request_recognition()
+
+    def attach_scheduler(self, scheduler: RecognitionScheduler) -> None:
+        """Hand over the recognizer once the background warm-up has built it."""
+
+        self.scheduler = scheduler
+
+    def request_recognition(self, immediate: bool = False) -> None:
+        if self.scheduler is not None:
+            from core.metrics import METRICS
+
+            with METRICS.span("capture"):
+                snapshot = self.canvas.copy()
+            self.scheduler.submit(snapshot, immediate=immediate)
+        else:
+            # OCR is still warming up; remember the request and replay it when ready.
+            self._deferred_request = bool(self._deferred_request) or immediate
 
     def reset(self) -> None:
         self.canvas[:] = 255
+        self._deferred_request = None
+        if self.scheduler is not None:
+            self.scheduler.cancel()
 
-    def run(self) -> None:  # pragma: no cover - UI loop
+    def run(self, on_first_frame: Optional[Callable[[], bool]] = None) -> None:  # pragma: no cover
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.resizeWindow(self.window_name, self.config.canvas.width, self.config.canvas.height)
         cv2.setMouseCallback(self.window_name, self.on_mouse)
-        LOGGER.info("InkMath canvas ready. Press 'c' to clear, 'q' to quit.")
+        LOGGER.info("InkMath canvas ready. Press 'r' to recognize, 'c' to clear, 'q' to quit.")
+        first = True
         while True:
             cv2.imshow(self.window_name, self.canvas)
             key = cv2.waitKey(16) & 0xFF
+            if first:
+                first = False
+                if on_first_frame is not None and on_first_frame():
+                    break
             if key == ord("q"):
                 break
             if key == ord("c"):
                 self.reset()
+            if key == ord("r"):
+                self.request_recognition(immediate=True)
+            if self.scheduler is not None:
+                if self._deferred_request is not None:
+                    self.request_recognition(immediate=self._deferred_request)
+                    self._deferred_request = None
+                for result in self.scheduler.poll(self.answer_board):
+                    if result.recognition.ok:
+                        LOGGER.info("Answer: %s", result.recognition.answer)
         cv2.destroyAllWindows()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self.answer_board.close()
 
 
 def bootstrap_models(config: AppConfig) -> None:
-    models = [PIX2TEX_INFO]
+    from core.bootstrap import verify_models
+
+    models = [
+        (Path(config.models.pix2tex_path) / "weights.pt", PIX2TEX_URL, PLACEHOLDER_CHECKSUM),
+    ]
     if config.ocr.engine == "trocr":
-        models.append(TROCR_INFO)
+        trocr_weights = Path(config.models.trocr_path) / "weights.pt"
+        models.append((trocr_weights, TROCR_URL, PLACEHOLDER_CHECKSUM))
     verify_models(models)
 
 
+def build_engine(config: AppConfig) -> OcrEngine:
+    from ocr.cache import DEFAULT_CACHE_DIR, CachedEngine, OcrCache
+
+    engine: OcrEngine
+    if config.ocr.engine == "trocr":
+        from ocr.trocr_engine import TrOCREngine
+
+        engine = TrOCREngine(config.models)
+    else:
+        from ocr.pix2tex_engine import Pix2TexEngine
+
+        engine = Pix2TexEngine(config.models)
+    if config.ocr.cache_entries <= 0:
+        return engine
+    cache_dir = DEFAULT_CACHE_DIR if config.ocr.cache_to_disk else None
+    return CachedEngine(engine, OcrCache(config.ocr.cache_entries, cache_dir))
+
+
+def build_scheduler(config: AppConfig) -> RecognitionScheduler:
+    from pipeline.recognize import recognize
+    from pipeline.scheduler import RecognitionScheduler
+    from solve.executor import SolveExecutor
+
+    engine = build_engine(config)
+    timeout_ms = config.solve.timeout_ms_symbolic
+    pipeline = partial(
+        recognize,
+        engine=engine,
+        min_confidence=config.ocr.min_confidence,
+        numeric_fallback=config.solve.numeric_fallback,
+        # Leave headroom so quadrature reports its own estimate before the hard kill.
+        numeric_budget_ms=timeout_ms * 0.5,
+        solver=SolveExecutor(workers=1, timeout_ms=timeout_ms),
+    )
+    return RecognitionScheduler(pipeline, debounce_ms=config.ocr.debounce_ms)
+
+
+def _stage(profiler: Optional[StartupProfiler], name: str) -> AbstractContextManager[None]:
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def warm_up(
+    config: AppConfig, canvas: SimpleCanvas, profiler: Optional[StartupProfiler] = None
+) -> None:
+    """Load the OCR stack and renderer off the UI thread, then attach the recognizer."""
+
+    try:
+        with _stage(profiler, "verify models"):
+            bootstrap_models(config)
+        with _stage(profiler, "build recognizer"):
+            scheduler = build_scheduler(config)
+        with _stage(profiler, "warm LaTeX renderer"):
+            from render.latex import render_latex
+
+            render_latex("x", dpi=config.render.dpi, font_size=config.render.font_size)
+        canvas.attach_scheduler(scheduler)
+    except Exception:  # noqa: BLE001 - the canvas stays usable without OCR
+        LOGGER.exception("Background warm-up failed; recognition is unavailable")
+
+
 def main() -> None:
-    args = parse_cli()
-    config = load_config(args)
-    setup_logging(config.logging)
+    profiler: Optional[StartupProfiler] = None
+    if any(arg.startswith("--profile-startup") for arg in sys.argv[1:]):
+        # Installed before importing anything else so every import is accounted for.
+        profiler = StartupProfiler().install()
+
+    with _stage(profiler, "load config"):
+        from core.config import load_config, parse_cli
+
+        args = parse_cli()
+        config = load_config(args)
+    with _stage(profiler, "setup logging"):
+        from core.logging_setup import setup_logging
+
+        setup_logging(config.logging)
+    with _stage(profiler, "setup metrics"):
+        from core.metrics import configure_metrics
+
+        exporter = configure_metrics(config.metrics)
     LOGGER.info("Starting InkMath with engine=%s on %s", config.ocr.engine, config.models.device)
-    bootstrap_models(config)
-    canvas = SimpleCanvas(config)
+    with _stage(profiler, "create canvas"):
+        canvas = SimpleCanvas(config)
+    warmup = threading.Thread(
+        target=warm_up, args=(config, canvas, profiler), name="inkmath-warmup", daemon=True
+    )
+    warmup.start()
+
+    on_first_frame: Optional[Callable[[], bool]] = None
+    if profiler is not None:
+        active = profiler
+
+        def on_first_frame() -> bool:
+            active.mark("first frame")
+            warmup.join()
+            active.mark("startup complete")
+            active.uninstall()
+            active.print_report()
+            if args.profile_startup:
+                active.write_json(Path(args.profile_startup))
+            return True
+
     LOGGER.info("Launching UI loop")
-    canvas.run()
+    try:
+        canvas.run(on_first_frame=on_first_frame)
+    finally:
+        if exporter is not None:
+            exporter.close()
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry
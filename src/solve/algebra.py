@@ -3,27 +3,26 @@ from __future__ import annotations
 
 import ast
 import math
-from typing import Dict, List, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from nl.expressions import Equation
-from .polynomials import from_ast
+from .polynomials import Polynomial, poly_from_ast
+from .roots import RootFindingError, polynomial_roots
 
 
 class AlgebraError(RuntimeError):
     pass
 
 
-def _poly_difference(eq: Equation, variable: str) -> Dict[int, float]:
+def _poly_difference(eq: Equation, variable: str) -> Polynomial:
     diff = eq.as_difference()
-    return from_ast(diff.node, variable)
+    return poly_from_ast(diff.node, variable)
 
 
-def _poly_to_coeff_list(poly: Dict[int, float]) -> List[float]:
-    degree = max(poly)
-    coeffs = [0.0] * (degree + 1)
-    for power, coeff in poly.items():
-        coeffs[power] = coeff
-    return coeffs
+def _poly_to_coeff_list(poly: Polynomial) -> List[float]:
+    return poly.coeffs.tolist()
 
 
 def _solve_polynomial(coeffs: List[float]):
@@ -44,7 +43,12 @@ def _solve_polynomial(coeffs: List[float]):
             return [complex(real, imag), complex(real, -imag)]
         sqrt_disc = math.sqrt(discriminant)
         return [(-b + sqrt_disc) / (2 * a), (-b - sqrt_disc) / (2 * a)]
-    raise AlgebraError("Polynomial degree not supported")
+    if degree < 1:
+        raise AlgebraError("Equation has no variable terms")
+    try:
+        return polynomial_roots(coeffs).as_list()
+    except RootFindingError as exc:
+        raise AlgebraError(str(exc)) from exc
 
 
 def _solve_single_equation(eq: Equation):
@@ -54,67 +58,217 @@ def _solve_single_equation(eq: Equation):
     poly = _poly_difference(eq, variable)
     coeffs = _poly_to_coeff_list(poly)
     solutions = _solve_polynomial(coeffs)
-    steps = [f"Selected variable {variable}", "Converted to polynomial", "Solved using analytical formula"]
+    method = "analytical formula" if len(coeffs) <= 3 else "companion-matrix eigenvalues"
+    steps = [f"Selected variable {variable}", "Converted to polynomial", f"Solved using {method}"]
     return solutions, steps
 
 
-def _linear_terms(node: ast.AST) -> Dict[str, float]:
-    if isinstance(node, ast.Constant):
-        return {"__const__": float(node.value)}
-    if isinstance(node, ast.Name):
-        return {node.id: 1.0}
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-        terms = _linear_terms(node.operand)
-        return {k: -v for k, v in terms.items()}
-    if isinstance(node, ast.BinOp):
-        left = _linear_terms(node.left)
-        right = _linear_terms(node.right)
-        if isinstance(node.op, ast.Add):
-            return {k: left.get(k, 0.0) + right.get(k, 0.0) for k in set(left) | set(right)}
-        if isinstance(node.op, ast.Sub):
-            return {k: left.get(k, 0.0) - right.get(k, 0.0) for k in set(left) | set(right)}
-        if isinstance(node.op, ast.Mult):
-            if isinstance(node.left, ast.Constant):
-                scale = float(node.left.value)
-                terms = _linear_terms(node.right)
-                return {k: scale * v for k, v in terms.items()}
-            if isinstance(node.right, ast.Constant):
-                scale = float(node.right.value)
-                terms = _linear_terms(node.left)
-                return {k: scale * v for k, v in terms.items()}
-    raise AlgebraError("Equation is not linear")
+class LinearSystemError(AlgebraError):
+    """Raised for linear systems without a unique solution, or that cannot be built.
+
+    ``rank``, ``unknowns`` and ``consistent`` are ``None`` when the system was rejected
+    before solving (e.g. a coefficient that is not a finite number).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        rank: Optional[int] = None,
+        unknowns: Optional[int] = None,
+        consistent: Optional[bool] = None,
+    ) -> None:
+        super().__init__(message)
+        self.rank = rank
+        self.unknowns = unknowns
+        self.consistent = consistent
+
+
+_CONSISTENCY_RTOL = 1e-9
+
+
+def _finite(value: Union[int, float]) -> float:
+    try:
+        result = float(value)
+    except OverflowError as exc:
+        raise LinearSystemError("Constant is too large") from exc
+    if not math.isfinite(result):
+        raise LinearSystemError("Constant is not finite")
+    return result
+
+
+def _fold(op: ast.AST, left: float, right: float) -> Optional[float]:
+    try:
+        if isinstance(op, ast.Add):
+            value = left + right
+        elif isinstance(op, ast.Sub):
+            value = left - right
+        elif isinstance(op, ast.Mult):
+            value = left * right
+        elif isinstance(op, ast.Div):
+            if right == 0:
+                raise LinearSystemError("Division by zero")
+            value = left / right
+        elif isinstance(op, ast.Pow):
+            value = left**right
+            if isinstance(value, complex):
+                raise LinearSystemError("Complex-valued constant")
+        else:
+            return None
+    except ZeroDivisionError as exc:
+        raise LinearSystemError("Division by zero") from exc
+    except OverflowError as exc:
+        raise LinearSystemError("Constant is too large") from exc
+    return _finite(value)
+
+
+def _constant_values(root: ast.AST) -> Dict[int, Optional[float]]:
+    """Value of every variable-free subtree of ``root`` (``None`` otherwise), keyed by ``id``.
+
+    Computed bottom-up in a single iterative pass, so long sums cost linear time and do not
+    hit the recursion limit.
+    """
+
+    values: Dict[int, Optional[float]] = {}
+    stack: List[Tuple[ast.AST, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, ast.UnaryOp):
+            children: Tuple[ast.AST, ...] = (node.operand,)
+        elif isinstance(node, ast.BinOp):
+            children = (node.left, node.right)
+        else:
+            children = ()
+        if children and not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        value: Optional[float] = None
+        if isinstance(node, ast.Constant):
+            value = _finite(node.value)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = values[id(node.operand)]
+            if operand is not None:
+                value = -operand if isinstance(node.op, ast.USub) else operand
+        elif isinstance(node, ast.BinOp):
+            left, right = values[id(node.left)], values[id(node.right)]
+            if left is not None and right is not None:
+                value = _fold(node.op, left, right)
+        values[id(node)] = value
+    return values
+
+
+def _accumulate_linear(
+    node: ast.AST, factor: float, row: np.ndarray, index: Dict[str, int]
+) -> float:
+    """Add ``factor * node`` into ``row`` in one pass and return its constant part."""
+
+    constants = _constant_values(node)
+    constant = 0.0
+    stack: List[Tuple[ast.AST, float]] = [(node, factor)]
+    while stack:
+        current, scale = stack.pop()
+        if isinstance(current, ast.Name):
+            row[index[current.id]] += scale
+            continue
+        value = constants.get(id(current))
+        if value is not None:
+            constant += scale * value
+            continue
+        if isinstance(current, ast.UnaryOp) and isinstance(current.op, (ast.USub, ast.UAdd)):
+            stack.append((current.operand, -scale if isinstance(current.op, ast.USub) else scale))
+            continue
+        if isinstance(current, ast.BinOp):
+            if isinstance(current.op, ast.Add):
+                stack.append((current.left, scale))
+                stack.append((current.right, scale))
+                continue
+            if isinstance(current.op, ast.Sub):
+                stack.append((current.left, scale))
+                stack.append((current.right, -scale))
+                continue
+            if isinstance(current.op, ast.Mult):
+                left = constants.get(id(current.left))
+                if left is not None:
+                    stack.append((current.right, scale * left))
+                    continue
+                right = constants.get(id(current.right))
+                if right is not None:
+                    stack.append((current.left, scale * right))
+                    continue
+            if isinstance(current.op, ast.Div):
+                divisor = constants.get(id(current.right))
+                if divisor:
+                    stack.append((current.left, scale / divisor))
+                    continue
+        raise AlgebraError("Equation is not linear")
+    return constant
+
+
+def build_linear_system(
+    equations: Sequence[Equation], variables: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(A, b)`` with ``A @ x = b`` for the given equations and variable order."""
+
+    index = {name: col for col, name in enumerate(variables)}
+    matrix = np.zeros((len(equations), len(variables)))
+    rhs = np.zeros(len(equations))
+    for row, eq in enumerate(equations):
+        constant = _accumulate_linear(eq.left.node, 1.0, matrix[row], index)
+        constant += _accumulate_linear(eq.right.node, -1.0, matrix[row], index)
+        rhs[row] = -constant
+    if not (np.all(np.isfinite(matrix)) and np.all(np.isfinite(rhs))):
+        raise LinearSystemError("Coefficients are not finite", unknowns=len(variables))
+    return matrix, rhs
+
+
+def solve_linear_system(matrix: np.ndarray, rhs: np.ndarray) -> Tuple[np.ndarray, str]:
+    """Solve ``matrix @ x = rhs``; returns the solution and the method used."""
+
+    rows, unknowns = matrix.shape
+    if rows == unknowns:
+        try:
+            solution = np.linalg.solve(matrix, rhs)
+        except np.linalg.LinAlgError:
+            pass
+        else:
+            if np.all(np.isfinite(solution)):
+                return solution, "LU decomposition"
+    solution, _, rank, _ = np.linalg.lstsq(matrix, rhs, rcond=None)
+    residual = float(np.linalg.norm(matrix @ solution - rhs))
+    scale = float(np.linalg.norm(rhs)) + float(np.linalg.norm(matrix)) + 1.0
+    consistent = residual <= _CONSISTENCY_RTOL * scale
+    if not consistent:
+        raise LinearSystemError(
+            f"System is inconsistent (rank {rank}, residual {residual:.3g})",
+            rank=int(rank),
+            unknowns=unknowns,
+            consistent=False,
+        )
+    if rank < unknowns:
+        raise LinearSystemError(
+            f"System is rank deficient (rank {rank} < {unknowns} unknowns); "
+            "infinitely many solutions",
+            rank=int(rank),
+            unknowns=unknowns,
+            consistent=True,
+        )
+    return solution, "least squares"
 
 
 def _solve_system(equations: Sequence[Equation]):
     vars_sorted = sorted({var for eq in equations for var in eq.variables})
     if not vars_sorted:
         raise AlgebraError("System has no variables")
-    if len(vars_sorted) != len(equations):
-        raise AlgebraError("System must have same number of equations and variables")
-    if len(vars_sorted) == 1:
+    if len(vars_sorted) == 1 and len(equations) == 1:
         return _solve_single_equation(equations[0])
-    if len(vars_sorted) == 2 and len(equations) == 2:
-        rows = []
-        consts = []
-        for eq in equations:
-            diff = eq.as_difference()
-            terms = _linear_terms(diff.node)
-            row = [terms.get(var, 0.0) for var in vars_sorted]
-            const = -terms.get("__const__", 0.0)
-            rows.append(row)
-            consts.append(const)
-        a11, a12 = rows[0]
-        a21, a22 = rows[1]
-        b1, b2 = consts
-        det = a11 * a22 - a12 * a21
-        if det == 0:
-            raise AlgebraError("System determinant is zero")
-        x = (b1 * a22 - a12 * b2) / det
-        y = (a11 * b2 - b1 * a21) / det
-        solution = {vars_sorted[0]: x, vars_sorted[1]: y}
-        steps = ["Constructed linear system", "Solved using Cramer's rule"]
-        return solution, steps
-    raise AlgebraError("Only 2x2 linear systems are supported")
+    matrix, rhs = build_linear_system(equations, vars_sorted)
+    values, method = solve_linear_system(matrix, rhs)
+    solution = {name: float(value) for name, value in zip(vars_sorted, values)}
+    steps = [
+        f"Constructed {len(equations)}x{len(vars_sorted)} linear system",
+        f"Solved using {method}",
+    ]
+    return solution, steps
 
 
 def solve_equation(eq):
@@ -126,4 +280,10 @@ def solve_equation(eq):
     return _solve_single_equation(eq)
 
 
-__all__ = ["solve_equation", "AlgebraError"]
+__all__ = [
+    "solve_equation",
+    "build_linear_system",
+    "solve_linear_system",
+    "AlgebraError",
+    "LinearSystemError",
+]
@@ -1,65 +1,89 @@
 """Integral solving helpers for lightweight symbolic expressions."""
 from __future__ import annotations
 
-import ast
-from typing import List, Optional
+import math
+from typing import Dict, List, Optional, Tuple
 
-from nl.expressions import IntegralExpr
-from .polynomials import from_ast
+from nl.compiler import ExpressionCompileError, compile_expression
+from nl.expressions import Expression, IntegralExpr
+from .algebra import AlgebraError
+from .polynomials import poly_from_ast
+from .quadrature import QuadratureError, integrate
+
+DEFAULT_NUMERIC_BUDGET_MS = 800.0
 
 
 class CalculusError(RuntimeError):
     pass
 
 
-def _poly_integral(poly: dict[int, float]) -> dict[int, float]:
-    result: dict[int, float] = {}
-    for power, coeff in poly.items():
-        result[power + 1] = coeff / (power + 1)
-    return result
+def _eval_bound(bound: Expression) -> float:
+    try:
+        compiled = compile_expression(bound)
+    except ExpressionCompileError as exc:
+        raise CalculusError(str(exc)) from exc
+    if compiled.variables:
+        raise CalculusError("Integral bounds must be numeric constants")
+    value = compiled.scalar()
+    if not math.isfinite(value):
+        raise CalculusError(f"Integral bound {bound.text} is not a finite number")
+    return value
 
 
-def _evaluate_polynomial(poly: dict[int, float], value: float) -> float:
-    total = 0.0
-    for power, coeff in poly.items():
-        total += coeff * (value ** power)
-    return total
+def _integrate_numerically(
+    obj: IntegralExpr, lower: float, upper: float, time_budget_ms: Optional[float]
+) -> Tuple[float, List[str]]:
+    try:
+        compiled = compile_expression(obj.integrand)
+    except ExpressionCompileError as exc:
+        raise CalculusError(str(exc)) from exc
+    extra = set(compiled.variables) - {obj.variable}
+    if extra:
+        raise CalculusError(f"Integrand depends on unbound variables: {', '.join(sorted(extra))}")
+    integrand = compiled if compiled.variables else lambda x: compiled() + 0.0 * x
+    try:
+        result = integrate(integrand, lower, upper, time_budget_ms=time_budget_ms)
+    except QuadratureError as exc:
+        raise CalculusError(str(exc)) from exc
+    value, error = float(result.values), float(result.errors)
+    if not result.all_converged:
+        raise CalculusError(f"Numeric integration did not converge (estimate {value:.6g})")
+    steps = [f"Integrated numerically (Gauss–Legendre, error ≈ {error:.1e})"]
+    return value, steps
 
 
-def _eval_constant(node: ast.AST) -> float:
-    if isinstance(node, ast.Constant):
-        return float(node.value)
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-        return -_eval_constant(node.operand)
-    if isinstance(node, ast.BinOp):
-        left = _eval_constant(node.left)
-        right = _eval_constant(node.right)
-        if isinstance(node.op, ast.Add):
-            return left + right
-        if isinstance(node.op, ast.Sub):
-            return left - right
-        if isinstance(node.op, ast.Mult):
-            return left * right
-        if isinstance(node.op, ast.Div):
-            return left / right
-        if isinstance(node.op, ast.Pow):
-            return left ** right
-    raise CalculusError("Integral bounds must be numeric constants")
+def solve_integral(
+    obj: IntegralExpr,
+    numeric_fallback: bool = True,
+    time_budget_ms: Optional[float] = DEFAULT_NUMERIC_BUDGET_MS,
+) -> Tuple[Optional[Dict[int, float]], List[str], Optional[float]]:
+    """Integrate ``obj`` analytically when the integrand is a polynomial.
 
+    Definite integrals of anything else fall back to adaptive quadrature when
+    ``numeric_fallback`` is set; the antiderivative is then ``None``.
+    """
 
-def solve_integral(obj: IntegralExpr):
     if not isinstance(obj, IntegralExpr):
         raise CalculusError("Expected IntegralExpr")
-    poly = from_ast(obj.integrand.node, obj.variable)
-    integrated = _poly_integral(poly)
+    definite = obj.lower is not None and obj.upper is not None
+    try:
+        poly = poly_from_ast(obj.integrand.node, obj.variable)
+    except AlgebraError:
+        if not (numeric_fallback and definite):
+            raise
+        lower_val = _eval_bound(obj.lower)  # type: ignore[arg-type]
+        upper_val = _eval_bound(obj.upper)  # type: ignore[arg-type]
+        numeric, numeric_steps = _integrate_numerically(obj, lower_val, upper_val, time_budget_ms)
+        return None, ["Parsed integral", *numeric_steps], numeric
+    integrated = poly.integrate()
     steps: List[str] = ["Parsed integral", "Integrated polynomial analytically"]
     numeric: Optional[float] = None
-    if obj.lower is not None and obj.upper is not None:
-        lower_val = _eval_constant(obj.lower.node)
-        upper_val = _eval_constant(obj.upper.node)
-        numeric = _evaluate_polynomial(integrated, upper_val) - _evaluate_polynomial(integrated, lower_val)
+    if definite:
+        lower_val = _eval_bound(obj.lower)  # type: ignore[arg-type]
+        upper_val = _eval_bound(obj.upper)  # type: ignore[arg-type]
+        numeric = float(integrated(upper_val) - integrated(lower_val))
         steps.append("Evaluated definite integral")
-    return integrated, steps, numeric
+    return integrated.to_dict(), steps, numeric
 
 
 __all__ = ["solve_integral", "CalculusError"]
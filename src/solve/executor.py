@@ -0,0 +1,293 @@
+"""Run solvers in warm worker processes with hard per-job timeouts.
+
+A pathological input (a huge exponent, a deep AST from bad OCR) can keep a solver busy for
+a long time, and a thread cannot be interrupted. :class:`SolveExecutor` keeps a small pool
+of long-lived worker processes with the solver modules already imported; each worker is
+driven by a dispatcher thread that sends one job down a pipe and waits for the answer. When
+the deadline passes, or the job is cancelled while running, the worker is terminated and a
+fresh one is started in its place. Workers are also recycled after ``max_jobs_per_worker``
+jobs to bound any slow leaks. Failures come back as :class:`SolveOutcome` values, never as
+exceptions from the pool.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.metrics import METRICS
+
+LOGGER = logging.getLogger(__name__)
+
+KINDS = ("equation", "integral", "triangle")
+# How often a dispatcher wakes up while waiting, to notice cancellation of a running job.
+_POLL_INTERVAL = 0.05
+
+
+class SolveExecutorError(RuntimeError):
+    pass
+
+
+@dataclass
+class SolveOutcome:
+    kind: str
+    status: str  # "ok", "error", "timeout" or "cancelled"
+    value: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def unwrap(self) -> Any:
+        """Return the solver's value or raise :class:`SolveExecutorError` with the reason."""
+
+        if not self.ok:
+            raise SolveExecutorError(self.error or self.status)
+        return self.value
+
+
+def _run_job(kind: str, payload: Any, options: Dict[str, Any]) -> Any:
+    if kind == "equation":
+        from .algebra import solve_equation
+
+        return solve_equation(payload)
+    if kind == "integral":
+        from .calculus import solve_integral
+
+        return solve_integral(payload, **options)
+    if kind == "triangle":
+        from .triangle import solve_triangle
+
+        return solve_triangle(payload)
+    raise SolveExecutorError(f"Unknown solve kind: {kind}")
+
+
+def _worker_main(conn: Connection) -> None:  # pragma: no cover - runs in the child process
+    # Import the solver stack up front so the first job does not pay for it.
+    from . import algebra, calculus, triangle  # noqa: F401
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        kind, payload, options = message
+        try:
+            reply: Tuple[str, Any] = ("ok", _run_job(kind, payload, options))
+        except Exception as exc:  # noqa: BLE001 - reported back to the parent as data
+            reply = ("error", f"{type(exc).__name__}: {exc}")
+        try:
+            conn.send(reply)
+        except Exception as exc:  # noqa: BLE001 - e.g. an unpicklable result
+            conn.send(("error", f"Could not return result: {exc}"))
+
+
+class SolveJob:
+    """Handle for a submitted job."""
+
+    def __init__(self, kind: str, payload: Any, options: Dict[str, Any], timeout: float) -> None:
+        self.kind = kind
+        self.payload = payload
+        self.options = options
+        self.timeout = timeout
+        self.future: "Future[SolveOutcome]" = Future()
+        self._cancel = threading.Event()
+
+    def cancel(self) -> bool:
+        """Cancel the job; a running job has its worker terminated."""
+
+        self._cancel.set()
+        if self.future.cancel():
+            return True
+        return not self.future.done()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> SolveOutcome:
+        try:
+            return self.future.result(timeout)
+        except CancelledError:
+            return SolveOutcome(self.kind, "cancelled", error="Cancelled")
+
+
+class _Worker:
+    def __init__(self, context: Any, name: str) -> None:
+        self._context = context
+        self.name = name
+        self.jobs = 0
+        self.process: Any = None
+        self.conn: Optional[Connection] = None
+        self.start()
+
+    def start(self) -> None:
+        parent, child = self._context.Pipe()
+        self.process = self._context.Process(
+            target=_worker_main, args=(child,), name=self.name, daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.jobs = 0
+
+    def stop(self, graceful: bool = True) -> None:
+        if self.conn is not None:
+            if graceful and self.process.is_alive():
+                try:
+                    self.conn.send(None)
+                except (OSError, BrokenPipeError):
+                    pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(0.5 if graceful else 0.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(1.0)
+            if self.process.is_alive():  # pragma: no cover - SIGTERM ignored
+                self.process.kill()
+                self.process.join()
+            self.process = None
+
+    def restart(self) -> None:
+        self.stop(graceful=False)
+        self.start()
+
+
+class SolveExecutor:
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout_ms: float = 800,
+        max_jobs_per_worker: int = 500,
+        start_method: str = "spawn",
+    ) -> None:
+        if workers < 1:
+            raise SolveExecutorError("At least one worker is required")
+        self.timeout = timeout_ms / 1000.0
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.timeouts = 0
+        self.recycled = 0
+        self._context = multiprocessing.get_context(start_method)
+        self._jobs: "queue.SimpleQueue[Optional[SolveJob]]" = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._workers = [_Worker(self._context, f"inkmath-solver-{i}") for i in range(workers)]
+        self._threads = [
+            threading.Thread(
+                target=self._dispatch, args=(worker,), name=f"{worker.name}-dispatch", daemon=True
+            )
+            for worker in self._workers
+        ]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "SolveExecutor":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # -- submission --------------------------------------------------------
+    def submit(
+        self, kind: str, payload: Any, timeout_ms: Optional[float] = None, **options: Any
+    ) -> SolveJob:
+        if kind not in KINDS:
+            raise SolveExecutorError(f"Unknown solve kind: {kind}")
+        timeout = self.timeout if timeout_ms is None else timeout_ms / 1000.0
+        job = SolveJob(kind, payload, options, timeout)
+        with self._lock:
+            if self._closed:
+                raise SolveExecutorError("Executor is closed")
+            self._jobs.put(job)
+        return job
+
+    def solve(
+        self, kind: str, payload: Any, timeout_ms: Optional[float] = None, **options: Any
+    ) -> SolveOutcome:
+        return self.submit(kind, payload, timeout_ms, **options).result()
+
+    def map(self, kind: str, payloads: List[Any], **options: Any) -> List[SolveOutcome]:
+        jobs = [self.submit(kind, payload, **options) for payload in payloads]
+        return [job.result() for job in jobs]
+
+    # -- dispatch ----------------------------------------------------------
+    def _dispatch(self, worker: _Worker) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled or not job.future.set_running_or_notify_cancel():
+                continue
+            job.future.set_result(self._execute(worker, job))
+            if worker.jobs >= self.max_jobs_per_worker:
+                self.recycled += 1
+                worker.restart()
+
+    def _execute(self, worker: _Worker, job: SolveJob) -> SolveOutcome:
+        start = time.perf_counter()
+        deadline = start + job.timeout
+
+        def outcome(status: str, value: Any = None, error: Optional[str] = None) -> SolveOutcome:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            return SolveOutcome(job.kind, status, value, error, elapsed)
+
+        assert worker.conn is not None
+        try:
+            worker.conn.send((job.kind, job.payload, job.options))
+        except Exception as exc:  # noqa: BLE001 - unpicklable payload or dead worker
+            worker.restart()
+            return outcome("error", error=f"Could not dispatch job: {exc}")
+        worker.jobs += 1
+        while True:
+            remaining = deadline - time.perf_counter()
+            if job.cancelled:
+                worker.restart()
+                return outcome("cancelled", error="Cancelled")
+            if remaining <= 0:
+                self.timeouts += 1
+                METRICS.increment("solve.timeouts")
+                LOGGER.warning(
+                    "Solver job %s timed out after %.0f ms", job.kind, job.timeout * 1000
+                )
+                worker.restart()
+                return outcome("timeout", error=f"Timed out after {job.timeout * 1000:.0f} ms")
+            try:
+                if worker.conn.poll(min(remaining, _POLL_INTERVAL)):
+                    status, value = worker.conn.recv()
+                    if status == "ok":
+                        return outcome("ok", value)
+                    return outcome("error", error=value)
+            except (EOFError, OSError):
+                worker.restart()
+                return outcome("error", error="Solver process exited unexpectedly")
+
+    # -- lifecycle ---------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        for worker in self._workers:
+            worker.stop()
+        atexit.unregister(self.close)
+
+
+__all__ = ["SolveExecutor", "SolveJob", "SolveOutcome", "SolveExecutorError"]
@@ -1,14 +1,155 @@
-"""Shared helpers for polynomial manipulation."""
+"""Shared helpers for polynomial manipulation.
+
+:class:`Polynomial` stores coefficients densely in a float64 NumPy array (index = power),
+so products are a single ``np.convolve``, powers use exponentiation by squaring and
+integration/evaluation are vectorized. The ``Dict[int, float]`` helpers are kept for
+callers that still exchange the sparse representation.
+"""
 from __future__ import annotations
 
 import ast
-from typing import Dict
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+# Refuse exponents that would build absurdly large dense arrays (e.g. misread OCR input).
+MAX_DEGREE = 100_000
+
+Number = Union[int, float]
 
 
 class PolynomialError(RuntimeError):
     pass
 
 
+class Polynomial:
+    """Immutable dense univariate polynomial with finite float64 coefficients.
+
+    Arithmetic that overflows (e.g. a huge constant raised to a power) raises
+    :class:`PolynomialError` instead of producing ``inf``/``nan`` coefficients.
+    """
+
+    __slots__ = ("coeffs",)
+
+    def __init__(self, coeffs: Union[Iterable[Number], np.ndarray]) -> None:
+        try:
+            array = np.array(coeffs, dtype=np.float64).reshape(-1)
+        except OverflowError as exc:
+            raise PolynomialError("Coefficient is too large") from exc
+        if not np.all(np.isfinite(array)):
+            raise PolynomialError("Coefficients are not finite")
+        nonzero = np.flatnonzero(array)
+        array = array[: nonzero[-1] + 1] if len(nonzero) else array[:1]
+        if not len(array):
+            array = np.zeros(1)
+        array.flags.writeable = False
+        self.coeffs = array
+
+    @classmethod
+    def constant(cls, value: Number) -> "Polynomial":
+        return cls([value])
+
+    @classmethod
+    def monomial(cls, power: int, coeff: Number = 1.0) -> "Polynomial":
+        coeffs = np.zeros(power + 1)
+        coeffs[power] = coeff
+        return cls(coeffs)
+
+    @classmethod
+    def from_dict(cls, poly: Dict[int, float]) -> "Polynomial":
+        if not poly:
+            return cls([0.0])
+        coeffs = np.zeros(max(poly) + 1)
+        for power, coeff in poly.items():
+            coeffs[power] += coeff
+        return cls(coeffs)
+
+    def to_dict(self) -> Dict[int, float]:
+        return {int(power): float(self.coeffs[power]) for power in np.flatnonzero(self.coeffs)}
+
+    @property
+    def degree(self) -> int:
+        return len(self.coeffs) - 1
+
+    def is_zero(self) -> bool:
+        return self.degree == 0 and self.coeffs[0] == 0.0
+
+    def is_constant(self) -> bool:
+        return self.degree == 0
+
+    def __repr__(self) -> str:
+        return f"Polynomial({self.coeffs.tolist()})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        return np.array_equal(self.coeffs, other.coeffs)
+
+    def __hash__(self) -> int:
+        return hash(self.coeffs.tobytes())
+
+    # -- arithmetic --------------------------------------------------------
+    def __neg__(self) -> "Polynomial":
+        return Polynomial(-self.coeffs)
+
+    def __add__(self, other: "Polynomial") -> "Polynomial":
+        size = max(len(self.coeffs), len(other.coeffs))
+        total = np.zeros(size)
+        total[: len(self.coeffs)] += self.coeffs
+        total[: len(other.coeffs)] += other.coeffs
+        return Polynomial(total)
+
+    def __sub__(self, other: "Polynomial") -> "Polynomial":
+        return self + (-other)
+
+    def __mul__(self, other: "Polynomial") -> "Polynomial":
+        if self.degree + other.degree > MAX_DEGREE:
+            raise PolynomialError(f"Resulting degree exceeds {MAX_DEGREE}")
+        return Polynomial(np.convolve(self.coeffs, other.coeffs))
+
+    def scale(self, factor: float) -> "Polynomial":
+        return Polynomial(self.coeffs * factor)
+
+    def __pow__(self, exponent: int) -> "Polynomial":
+        if exponent < 0:
+            raise PolynomialError("Negative exponents are not polynomial")
+        if self.degree * exponent > MAX_DEGREE:
+            raise PolynomialError(f"Resulting degree exceeds {MAX_DEGREE}")
+        if self.degree == 1 and self.coeffs[0] == 0.0:
+            # c*x raised to n is a single monomial; skip the convolutions entirely.
+            return Polynomial.monomial(exponent, self.coeffs[1] ** exponent)
+        result = Polynomial([1.0])
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return result
+
+    # -- calculus ----------------------------------------------------------
+    def integrate(self) -> "Polynomial":
+        """Antiderivative with zero constant of integration."""
+
+        powers = np.arange(1, len(self.coeffs) + 1, dtype=np.float64)
+        return Polynomial(np.concatenate(([0.0], self.coeffs / powers)))
+
+    def derivative(self) -> "Polynomial":
+        if self.degree == 0:
+            return Polynomial([0.0])
+        return Polynomial(self.coeffs[1:] * np.arange(1, len(self.coeffs)))
+
+    def __call__(self, x: Union[Number, np.ndarray]) -> Union[float, np.ndarray]:
+        """Horner evaluation, vectorized over array-valued ``x``."""
+
+        values = np.asarray(x, dtype=np.float64)
+        result = np.full(values.shape, self.coeffs[-1])
+        for coeff in self.coeffs[-2::-1]:
+            result = result * values + coeff
+        return float(result) if result.ndim == 0 else result
+
+
 def combine(a: Dict[int, float], b: Dict[int, float]) -> Dict[int, float]:
     result = a.copy()
     for power, coeff in b.items():
@@ -25,38 +166,49 @@ def multiply(a: Dict[int, float], b: Dict[int, float]) -> Dict[int, float]:
     return result
 
 
-def from_ast(node: ast.AST, variable: str) -> Dict[int, float]:
+def poly_from_ast(node: ast.AST, variable: str) -> Polynomial:
+    from .algebra import AlgebraError  # Avoid circular import at module level
+
+    try:
+        return _poly_from_ast(node, variable)
+    except PolynomialError as exc:
+        raise AlgebraError(str(exc)) from exc
+
+
+def _poly_from_ast(node: ast.AST, variable: str) -> Polynomial:
     from .algebra import AlgebraError  # Avoid circular import at module level
 
     if isinstance(node, ast.Constant):
-        return {0: float(node.value)}
+        return Polynomial.constant(node.value)
     if isinstance(node, ast.Name):
         if node.id != variable:
             raise AlgebraError(f"Unexpected variable {node.id}")
-        return {1: 1.0}
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-        poly = from_ast(node.operand, variable)
-        return {power: -coeff for power, coeff in poly.items()}
+        return Polynomial([0.0, 1.0])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        poly = _poly_from_ast(node.operand, variable)
+        return -poly if isinstance(node.op, ast.USub) else poly
     if isinstance(node, ast.BinOp):
         if isinstance(node.op, (ast.Add, ast.Sub)):
-            left = from_ast(node.left, variable)
-            right = from_ast(node.right, variable)
-            if isinstance(node.op, ast.Sub):
-                right = {power: -coeff for power, coeff in right.items()}
-            return combine(left, right)
+            left = _poly_from_ast(node.left, variable)
+            right = _poly_from_ast(node.right, variable)
+            return left + right if isinstance(node.op, ast.Add) else left - right
         if isinstance(node.op, ast.Mult):
-            left = from_ast(node.left, variable)
-            right = from_ast(node.right, variable)
-            return multiply(left, right)
+            return _poly_from_ast(node.left, variable) * _poly_from_ast(node.right, variable)
+        if isinstance(node.op, ast.Div):
+            divisor = _poly_from_ast(node.right, variable)
+            if not divisor.is_constant() or divisor.is_zero():
+                raise AlgebraError("Division only supported by non-zero constants")
+            return _poly_from_ast(node.left, variable).scale(1.0 / divisor.coeffs[0])
         if isinstance(node.op, ast.Pow):
-            base = from_ast(node.left, variable)
-            if len(base) != 1 or 1 not in base:
-                raise AlgebraError("Power only supported on pure variable")
+            base = _poly_from_ast(node.left, variable)
             if not isinstance(node.right, ast.Constant):
                 raise AlgebraError("Exponent must be constant")
-            exponent = int(node.right.value)
-            result = {0: 1.0}
-            for _ in range(exponent):
-                result = multiply(result, base)
-            return result
+            exponent = node.right.value
+            if not isinstance(exponent, (int, float)) or exponent != int(exponent) or exponent < 0:
+                raise AlgebraError("Exponent must be a non-negative integer")
+            return base ** int(exponent)
     raise AlgebraError(f"Unsupported expression: {ast.dump(node)}")
+
+
+def from_ast(node: ast.AST, variable: str) -> Dict[int, float]:
+    return poly_from_ast(node, variable).to_dict()
@@ -0,0 +1,186 @@
+"""Polynomial root finding via companion-matrix eigenvalues.
+
+Roots of a degree-``n`` polynomial are the eigenvalues of its ``n×n`` companion matrix.
+Rows of a batch are grouped by degree and each group is solved with one stacked
+``np.linalg.eigvals`` call, then polished with a few vectorized Newton steps and
+classified as real or complex. The eigenvalue solve is cubic in the degree (and the matrix
+quadratic in memory), so degrees above ``MAX_ROOT_DEGREE`` are refused up front. In a batch
+an invalid row only fails itself: its :class:`PolynomialRoots` carries an ``error``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+NEWTON_STEPS = 3
+REAL_TOLERANCE = 1e-9
+# A 400×400 companion matrix takes about 0.1 s; degree 1000 already takes seconds.
+MAX_ROOT_DEGREE = 400
+
+
+class RootFindingError(RuntimeError):
+    pass
+
+
+@dataclass
+class PolynomialRoots:
+    values: np.ndarray  # complex128, one entry per root (with multiplicity)
+    is_real: np.ndarray  # bool mask aligned with ``values``
+    error: Optional[str] = None  # set (with no values) when this row could not be solved
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def real(self) -> np.ndarray:
+        return self.values[self.is_real].real
+
+    @property
+    def complex(self) -> np.ndarray:
+        return self.values[~self.is_real]
+
+    def as_list(self) -> List[Union[float, complex]]:
+        if self.error is not None:
+            raise RootFindingError(self.error)
+        return [float(v.real) if real else complex(v) for v, real in zip(self.values, self.is_real)]
+
+
+def _trim(coeffs: Sequence[float]) -> np.ndarray:
+    array = np.asarray(coeffs, dtype=np.float64).reshape(-1)
+    if not np.all(np.isfinite(array)):
+        raise RootFindingError("Polynomial coefficients are not finite")
+    nonzero = np.flatnonzero(array)
+    if not len(nonzero):
+        raise RootFindingError("Zero polynomial has infinitely many roots")
+    array = array[: nonzero[-1] + 1]
+    if len(array) - 1 > MAX_ROOT_DEGREE:
+        raise RootFindingError(
+            f"Degree {len(array) - 1} exceeds the root-finding limit of {MAX_ROOT_DEGREE}"
+        )
+    with np.errstate(over="ignore", invalid="ignore"):
+        monic = array[:-1] / array[-1]
+    if not np.all(np.isfinite(monic)):
+        raise RootFindingError("Polynomial is too badly scaled to find its roots")
+    return array
+
+
+def _failed(message: str) -> PolynomialRoots:
+    return PolynomialRoots(np.zeros(0, dtype=np.complex128), np.zeros(0, dtype=bool), message)
+
+
+def _horner(coeffs: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Evaluate ``(B, n+1)`` ascending coefficient rows at ``(B, k)`` points."""
+
+    result = np.broadcast_to(coeffs[:, -1:], x.shape).astype(np.complex128)
+    for power in range(coeffs.shape[1] - 2, -1, -1):
+        result = result * x + coeffs[:, power : power + 1]
+    return result
+
+
+def _companion_batch(coeffs: np.ndarray) -> np.ndarray:
+    """Stacked companion matrices for ``(B, n+1)`` ascending coefficient rows."""
+
+    batch, size = coeffs.shape[0], coeffs.shape[1] - 1
+    monic = coeffs[:, :-1] / coeffs[:, -1:]
+    companion = np.zeros((batch, size, size))
+    if size > 1:
+        companion[:, np.arange(1, size), np.arange(size - 1)] = 1.0
+    companion[:, :, -1] = -monic
+    return companion
+
+
+def _polish(coeffs: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    derivative = coeffs[:, 1:] * np.arange(1, coeffs.shape[1])
+    for _ in range(NEWTON_STEPS):
+        value = _horner(coeffs, roots)
+        slope = _horner(derivative, roots)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = roots - value / slope
+        # Keep a step only when it is finite and does not increase the residual, which
+        # protects clustered/multiple roots where Newton converges poorly.
+        better = np.isfinite(candidate) & (np.abs(_horner(coeffs, candidate)) <= np.abs(value))
+        roots = np.where(better, candidate, roots)
+    return roots
+
+
+def _classify(roots: np.ndarray) -> np.ndarray:
+    return np.abs(roots.imag) <= REAL_TOLERANCE * (1.0 + np.abs(roots.real))
+
+
+def _eigvals(coeffs: np.ndarray) -> np.ndarray:
+    return np.linalg.eigvals(_companion_batch(coeffs)).astype(np.complex128)
+
+
+def _store(
+    results: List[PolynomialRoots], members: List[int], coeffs: np.ndarray, roots: np.ndarray
+) -> None:
+    roots = _polish(coeffs, roots)
+    real = _classify(roots)
+    roots = np.where(real, roots.real + 0j, roots)
+    order = np.lexsort((roots.imag, roots.real, ~real), axis=-1)
+    roots = np.take_along_axis(roots, order, axis=-1)
+    real = np.take_along_axis(real, order, axis=-1)
+    for row, idx in enumerate(members):
+        results[idx] = PolynomialRoots(roots[row], real[row])
+
+
+def polynomial_roots_batch(rows: Sequence[Sequence[float]]) -> List[PolynomialRoots]:
+    """Find the roots of many polynomials given as ascending coefficient vectors.
+
+    Rows may have different lengths and trailing (leading-power) zeros; a non-zero constant
+    has no roots. A row that cannot be solved (all zeros, non-finite or badly scaled
+    coefficients, degree above ``MAX_ROOT_DEGREE``) gets a result with ``error`` set and
+    does not affect the other rows.
+    """
+
+    results: List[PolynomialRoots] = [None] * len(rows)  # type: ignore[list-item]
+    trimmed: Dict[int, np.ndarray] = {}
+    for idx, row in enumerate(rows):
+        try:
+            trimmed[idx] = _trim(row)
+        except RootFindingError as exc:
+            results[idx] = _failed(str(exc))
+    by_degree: Dict[int, List[int]] = {}
+    for idx, coeffs in trimmed.items():
+        by_degree.setdefault(len(coeffs) - 1, []).append(idx)
+
+    for degree, members in by_degree.items():
+        if degree == 0:
+            empty = PolynomialRoots(np.zeros(0, dtype=np.complex128), np.zeros(0, dtype=bool))
+            for idx in members:
+                results[idx] = empty
+            continue
+        try:
+            groups = [(members, _eigvals(np.stack([trimmed[idx] for idx in members])))]
+        except np.linalg.LinAlgError:
+            # Isolate the row(s) that did not converge instead of failing the whole degree.
+            groups = []
+            for idx in members:
+                try:
+                    groups.append(([idx], _eigvals(trimmed[idx][None, :])))
+                except np.linalg.LinAlgError as exc:
+                    results[idx] = _failed(f"Eigenvalue solve did not converge: {exc}")
+        for group, roots in groups:
+            _store(results, group, np.stack([trimmed[idx] for idx in group]), roots)
+    return results
+
+
+def polynomial_roots(coeffs: Sequence[float]) -> PolynomialRoots:
+    """Roots of one polynomial; raises :class:`RootFindingError` where a batch row would fail."""
+
+    result = polynomial_roots_batch([coeffs])[0]
+    if result.error is not None:
+        raise RootFindingError(result.error)
+    return result
+
+
+__all__ = [
+    "MAX_ROOT_DEGREE",
+    "PolynomialRoots",
+    "RootFindingError",
+    "polynomial_roots",
+    "polynomial_roots_batch",
+]
@@ -1,9 +1,17 @@
-"""Triangle solver implementation."""
+"""Triangle solver implementation.
+
+:func:`solve_triangle` solves one triangle and explains each step. :func:`solve_triangles`
+solves many at once from struct-of-arrays measurements (NaN marks an unknown) by applying
+the same rules - angle sum, law of cosines (SAS/SSS), law of sines (ASA/AAS/SSA) - as masked
+NumPy operations over every row, and reports a status code per row instead of raising.
+"""
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
 
 
 class TriangleError(RuntimeError):
@@ -161,4 +169,196 @@ def solve_triangle(meas: Dict[str, Optional[float]]):
     return solution, steps
 
 
-__all__ = ["solve_triangle", "TriangleError"]
+# Row status codes returned by :func:`solve_triangles`.
+STATUS_OK = 0
+STATUS_AMBIGUOUS = 1  # SSA with two valid triangles; the acute-angle solution is returned
+STATUS_INSUFFICIENT = 2
+STATUS_INCONSISTENT = 3
+STATUS_INVALID = 4
+STATUS_NAMES = {
+    STATUS_OK: "ok",
+    STATUS_AMBIGUOUS: "ambiguous",
+    STATUS_INSUFFICIENT: "insufficient",
+    STATUS_INCONSISTENT: "inconsistent",
+    STATUS_INVALID: "invalid",
+}
+
+SIDES = ("a", "b", "c")
+ANGLES = ("A", "B", "C")
+# Relative tolerance for checks on over-determined measurements.
+CONSISTENCY_RTOL = 1e-6
+# Enough rounds for any chain of rules (e.g. SSA -> angle sum -> law of sines).
+_ROUNDS = 3
+
+ArrayInput = Union[Sequence[float], np.ndarray]
+
+
+@dataclass
+class TriangleBatch:
+    sides: np.ndarray  # (N, 3) a, b, c; NaN where unsolved
+    angles: np.ndarray  # (N, 3) A, B, C in degrees; NaN where unsolved
+    area: np.ndarray
+    perimeter: np.ndarray
+    status: np.ndarray  # (N,) int8 STATUS_* codes
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @property
+    def solved(self) -> np.ndarray:
+        return self.status <= STATUS_AMBIGUOUS
+
+    def row(self, index: int) -> Dict[str, float]:
+        values = dict(zip(SIDES, self.sides[index].tolist()))
+        values.update(zip(ANGLES, self.angles[index].tolist()))
+        values["area"] = float(self.area[index])
+        values["perimeter"] = float(self.perimeter[index])
+        return values
+
+
+def _column(measurements: Mapping[str, ArrayInput], key: str, size: int) -> np.ndarray:
+    if measurements.get(key) is None:
+        return np.full(size, np.nan)
+    return np.asarray(measurements[key], dtype=np.float64).reshape(-1)
+
+
+def _solve_rounds(sides: np.ndarray, angles: np.ndarray, ambiguous: np.ndarray) -> np.ndarray:
+    """Fill unknowns in place; returns a mask of rows found inconsistent along the way."""
+
+    inconsistent = np.zeros(len(sides), dtype=bool)
+    rad = np.radians
+    for _ in range(_ROUNDS):
+        # Angle sum: exactly two angles known.
+        known = ~np.isnan(angles)
+        rows = known.sum(axis=1) == 2
+        if rows.any():
+            missing = np.argmin(known[rows], axis=1)
+            angles[np.flatnonzero(rows), missing] = 180.0 - np.nansum(angles[rows], axis=1)
+
+        for i in range(3):
+            j, k = (i + 1) % 3, (i + 2) % 3
+            # SAS: angle i with both adjacent sides known gives the opposite side.
+            rows = np.isnan(sides[:, i]) & ~np.isnan(angles[:, i])
+            rows &= ~np.isnan(sides[:, j]) & ~np.isnan(sides[:, k])
+            if rows.any():
+                sj, sk = sides[rows, j], sides[rows, k]
+                squared = sj**2 + sk**2 - 2 * sj * sk * np.cos(rad(angles[rows, i]))
+                sides[rows, i] = np.sqrt(np.maximum(squared, 0.0))
+
+        # SSS: every missing angle from the law of cosines.
+        full = ~np.isnan(sides).any(axis=1)
+        for i in range(3):
+            j, k = (i + 1) % 3, (i + 2) % 3
+            rows = full & np.isnan(angles[:, i])
+            if rows.any():
+                si, sj, sk = sides[rows, i], sides[rows, j], sides[rows, k]
+                cosine = (sj**2 + sk**2 - si**2) / (2 * sj * sk)
+                angles[rows, i] = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+        for p in range(3):
+            # Rows with a known side/opposite-angle pair p fix the law-of-sines ratio.
+            pair = ~np.isnan(sides[:, p]) & ~np.isnan(angles[:, p])
+            if not pair.any():
+                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = sides[:, p] / np.sin(rad(angles[:, p]))
+            for q in range(3):
+                if q == p:
+                    continue
+                # ASA/AAS: known angle q gives side q.
+                rows = pair & np.isnan(sides[:, q]) & ~np.isnan(angles[:, q])
+                if rows.any():
+                    sides[rows, q] = ratio[rows] * np.sin(rad(angles[rows, q]))
+                # SSA: known side q gives angle q, possibly two ways.
+                rows = pair & ~np.isnan(sides[:, q]) & np.isnan(angles[:, q])
+                if rows.any():
+                    sine = sides[rows, q] / ratio[rows]
+                    bad = ~(sine <= 1.0 + 1e-7)
+                    inconsistent[np.flatnonzero(rows)[bad]] = True
+                    acute = np.degrees(np.arcsin(np.clip(sine, -1.0, 1.0)))
+                    obtuse = 180.0 - acute
+                    two = (~bad) & (sine < 1.0 - 1e-12) & (angles[rows, p] + obtuse < 180.0)
+                    ambiguous[np.flatnonzero(rows)[two]] = True
+                    angles[np.flatnonzero(rows)[~bad], q] = acute[~bad]
+    return inconsistent
+
+
+def _heron_batch(sides: np.ndarray) -> np.ndarray:
+    a, b, c = sides.T
+    s = (a + b + c) / 2
+    return np.sqrt(np.maximum(s * (s - a) * (s - b) * (s - c), 0.0))
+
+
+def solve_triangles(
+    measurements: Mapping[str, ArrayInput], right_at: Optional[Sequence[Optional[str]]] = None
+) -> TriangleBatch:
+    """Solve many triangles from columns ``a, b, c, A, B, C`` (degrees; NaN = unknown).
+
+    ``right_at`` optionally names the right angle (``"A"``, ``"B"``, ``"C"`` or empty) per
+    row. Rows are never raised on: check ``status`` (``STATUS_*``) instead.
+    """
+
+    sizes = {
+        len(np.atleast_1d(measurements[key]))
+        for key in (*SIDES, *ANGLES)
+        if measurements.get(key) is not None
+    }
+    if right_at is not None:
+        sizes.add(len(right_at))
+    if len(sizes) > 1:
+        raise TriangleError(f"Measurement columns differ in length: {sorted(sizes)}")
+    size = sizes.pop() if sizes else 0
+    sides = np.stack([_column(measurements, key, size) for key in SIDES], axis=1)
+    angles = np.stack([_column(measurements, key, size) for key in ANGLES], axis=1)
+    if right_at is not None:
+        marks = np.asarray([str(mark or "") for mark in right_at])
+        for i, name in enumerate(ANGLES):
+            rows = marks == name
+            invalid_mark = rows & ~np.isnan(angles[:, i]) & (np.abs(angles[:, i] - 90.0) > 1e-9)
+            angles[rows & ~invalid_mark, i] = 90.0
+            angles[invalid_mark, i] = np.inf  # flagged as invalid below
+
+    status = np.full(size, STATUS_OK, dtype=np.int8)
+    invalid = (sides <= 0).any(axis=1) | (angles <= 0).any(axis=1) | (angles >= 180).any(axis=1)
+    invalid |= np.isinf(sides).any(axis=1) | np.isinf(angles).any(axis=1)
+    invalid |= np.nansum(angles, axis=1) >= 180.0 + 1e-9 * 180.0
+    sides[invalid] = np.nan
+    angles[invalid] = np.nan
+
+    ambiguous = np.zeros(size, dtype=bool)
+    inconsistent = _solve_rounds(sides, angles, ambiguous)
+
+    complete = ~(np.isnan(sides).any(axis=1) | np.isnan(angles).any(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a, b, c = sides.T
+        inequality = (a + b <= c) | (a + c <= b) | (b + c <= a)
+        angle_sum = np.abs(angles.sum(axis=1) - 180.0) > CONSISTENCY_RTOL * 180.0
+        ratios = sides / np.sin(np.radians(angles))
+        spread = np.ptp(ratios, axis=1) > CONSISTENCY_RTOL * np.max(ratios, axis=1)
+        nonpositive = (sides <= 0).any(axis=1) | (angles <= 0).any(axis=1)
+    inconsistent |= complete & (inequality | angle_sum | spread | nonpositive)
+
+    status[~complete] = STATUS_INSUFFICIENT
+    status[complete & ambiguous] = STATUS_AMBIGUOUS
+    status[inconsistent] = STATUS_INCONSISTENT
+    status[invalid] = STATUS_INVALID
+    failed = status > STATUS_AMBIGUOUS
+    sides[failed] = np.nan
+    angles[failed] = np.nan
+    area = _heron_batch(sides)
+    perimeter = sides.sum(axis=1)
+    return TriangleBatch(sides, angles, area, perimeter, status)
+
+
+__all__ = [
+    "solve_triangle",
+    "solve_triangles",
+    "TriangleBatch",
+    "TriangleError",
+    "STATUS_OK",
+    "STATUS_AMBIGUOUS",
+    "STATUS_INSUFFICIENT",
+    "STATUS_INCONSISTENT",
+    "STATUS_INVALID",
+    "STATUS_NAMES",
+]
@@ -0,0 +1,486 @@
+"""Compact binary session files (``.inkm``) for boards and their answers.
+
+Layout (little-endian)::
+
+    header     magic "INKMSES\\0", version u16, flags u16, width u32, height u32,
+               section count u32
+    directory  per section: tag (4 bytes), offset u64, length u64
+    STRK       fixed-size stroke records: byte offset and size of the stroke's points in
+               PNTS, point count, bounds (x0, y0, x1, y1), colour and thickness
+    PNTS       per stroke, zigzag varints of the interleaved x/y deltas (the first delta
+               is taken from the origin, so it is the absolute start point)
+    ENTR       zlib-compressed JSON list of answer entries; rendered images are referenced
+               by the SHA-256 of their PNG bytes
+    IMGS       image index (digest, offset u64, length u64) followed by the PNG blobs,
+               each stored once however many entries reference it
+
+:func:`open_session` memory-maps the file and only reads the header, directory and stroke
+table (a zero-copy NumPy view), so opening is independent of the amount of ink. Points are
+decoded on demand - :meth:`SessionFile.strokes_in` picks the strokes whose bounds meet a
+viewport from the table alone, and :meth:`SessionFile.points_of` decodes just those - and
+images are sliced out only when asked for. Readers skip
+sections they do not know, so later versions can add sections without breaking old files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ink.canvas import InkCanvas
+from ink.strokes import StrokeStore
+
+if TYPE_CHECKING:
+    from render.board import AnswerBoard
+
+MAGIC = b"INKMSES\0"
+VERSION = 1
+SUFFIX = ".inkm"
+
+_HEADER = struct.Struct("<8sHHIII")
+_SECTION = struct.Struct("<4sQQ")
+_IMAGE_INDEX = struct.Struct("<32sQQ")
+
+STROKE_DTYPE = np.dtype(
+    [
+        ("offset", "<u8"),
+        ("nbytes", "<u4"),
+        ("npoints", "<u4"),
+        ("bounds", "<i4", (4,)),
+        ("color", "u1", (3,)),
+        ("reserved", "u1"),
+        ("thickness", "<u2"),
+        ("flags", "<u2"),
+    ]
+)
+
+Rect = Tuple[int, int, int, int]
+
+
+class SessionFormatError(RuntimeError):
+    pass
+
+
+# -- varint coding ---------------------------------------------------------------
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """Zigzag + LEB128-encode a 1-D integer array (int32 range) in one vectorized pass."""
+
+    return _varints(values)[0].tobytes()
+
+
+def _varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the encoded bytes and the encoded size of every value."""
+
+    signed = np.asarray(values, dtype=np.int64)
+    zigzag = ((signed << 1) ^ (signed >> 63)).astype(np.uint64)
+    sizes = np.ones(zigzag.size, dtype=np.int64)
+    for bits in (7, 14, 21, 28):
+        sizes += zigzag >= (1 << bits)
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+    out = np.empty(int(ends[-1]) if zigzag.size else 0, dtype=np.uint8)
+    for k in range(5):
+        active = sizes > k
+        if not active.any():
+            break
+        chunk = (zigzag[active] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[active] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[active] + k] = (chunk | more).astype(np.uint8)
+    return out, sizes
+
+
+def decode_varints(data: Union[bytes, memoryview, np.ndarray]) -> np.ndarray:
+    """Inverse of :func:`encode_varints`; returns ``int64`` values."""
+
+    raw = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data
+    if not raw.size:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    if not ends.size or ends[-1] != raw.size - 1:
+        raise SessionFormatError("Truncated varint data")
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    group = np.repeat(np.arange(ends.size), ends - starts + 1)
+    shifts = (np.arange(raw.size) - starts[group]) * 7
+    if shifts.max() > 28:
+        raise SessionFormatError("Varint longer than 5 bytes")
+    parts = (raw & 0x7F).astype(np.uint64) << shifts.astype(np.uint64)
+    zigzag = np.add.reduceat(parts, starts).astype(np.int64)
+    return (zigzag >> 1) ^ -(zigzag & 1)
+
+
+def _restart_deltas(points: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Deltas between consecutive points, restarting from the origin at each stroke."""
+
+    deltas = np.diff(points.astype(np.int64), axis=0, prepend=np.zeros((1, 2), np.int64))
+    starts = np.cumsum(lengths) - lengths
+    starts = starts[lengths > 0]
+    deltas[starts] = points[starts]
+    return deltas
+
+
+def _undo_deltas(deltas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`_restart_deltas`: one cumulative sum, rebased at stroke starts."""
+
+    totals = np.cumsum(deltas, axis=0)
+    starts = np.cumsum(lengths) - lengths
+    before = np.zeros((len(lengths), 2), dtype=np.int64)
+    nonzero = starts > 0
+    before[nonzero] = totals[starts[nonzero] - 1]
+    return (totals - np.repeat(before, lengths, axis=0)).astype(np.int32)
+
+
+def _decode_points(data: memoryview, lengths: np.ndarray) -> np.ndarray:
+    values = decode_varints(data)
+    if values.size != 2 * int(lengths.sum()):
+        raise SessionFormatError("Stroke point count does not match its data")
+    return _undo_deltas(values.reshape(-1, 2), lengths)
+
+
+# -- entries ---------------------------------------------------------------------
+
+
+@dataclass
+class SessionEntry:
+    """An answer entry as stored; ``image`` is the PNG digest or ``None``."""
+
+    timestamp: datetime
+    prompt: str
+    latex: str
+    steps: List[str] = field(default_factory=list)
+    numeric: Optional[float] = None
+    image: Optional[str] = None
+    dpi: Optional[int] = None
+    size_inches: Optional[Tuple[float, float]] = None
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "prompt": self.prompt,
+            "latex": self.latex,
+            "steps": self.steps,
+            "numeric": self.numeric,
+            "image": self.image,
+            "dpi": self.dpi,
+            "size_inches": list(self.size_inches) if self.size_inches else None,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, object]) -> "SessionEntry":
+        size = data.get("size_inches")
+        return cls(
+            timestamp=datetime.fromisoformat(str(data["timestamp"])),
+            prompt=str(data.get("prompt", "")),
+            latex=str(data.get("latex", "")),
+            steps=[str(step) for step in data.get("steps") or []],  # type: ignore[union-attr]
+            numeric=data.get("numeric"),  # type: ignore[arg-type]
+            image=data.get("image"),  # type: ignore[arg-type]
+            dpi=data.get("dpi"),  # type: ignore[arg-type]
+            size_inches=tuple(size) if size else None,  # type: ignore[arg-type]
+        )
+
+
+# -- writing ---------------------------------------------------------------------
+
+
+def _stroke_sections(store: StrokeStore) -> Tuple[bytes, bytes]:
+    count = len(store)
+    table = np.zeros(count, dtype=STROKE_DTYPE)
+    if not count:
+        return table.tobytes(), b""
+    lengths = np.asarray(store.lengths, dtype=np.int64)
+    points = np.concatenate([store.points_of(index) for index in range(count)])
+    encoded, sizes = _varints(_restart_deltas(points, lengths).ravel())
+    # Bytes per stroke: sum the sizes of its 2 * npoints values.
+    value_ends = np.cumsum(2 * lengths)
+    byte_ends = np.concatenate(([0], np.cumsum(sizes)))[value_ends]
+    table["offset"] = np.concatenate(([0], byte_ends[:-1]))
+    table["nbytes"] = np.diff(byte_ends, prepend=0)
+    table["npoints"] = lengths
+    table["bounds"] = store.bounds
+    table["color"] = np.clip(store.colors, 0, 255)
+    table["thickness"] = store.thicknesses
+    return table.tobytes(), encoded.tobytes()
+
+
+def _entry_sections(board: Optional[AnswerBoard]) -> Tuple[bytes, bytes]:
+    entries: List[Dict[str, object]] = []
+    images: Dict[str, bytes] = {}
+    for entry in board if board is not None else []:
+        digest = dpi = size = None
+        rendered = entry.poll()
+        if rendered is not None:
+            png = rendered.to_png()
+            if png:
+                digest = hashlib.sha256(png).hexdigest()
+                images.setdefault(digest, png)
+                dpi, size = rendered.dpi, rendered.size_inches
+        stored = SessionEntry(
+            entry.timestamp, entry.prompt, entry.latex, list(entry.steps), entry.numeric,
+            digest, dpi, size,
+        )
+        entries.append(stored.to_json())
+    payload = zlib.compress(json.dumps(entries, ensure_ascii=False).encode("utf-8"))
+    index = bytearray()
+    offset = len(images) * _IMAGE_INDEX.size
+    for digest, png in images.items():
+        index += _IMAGE_INDEX.pack(bytes.fromhex(digest), offset, len(png))
+        offset += len(png)
+    blob = struct.pack("<I", len(images)) + bytes(index) + b"".join(images.values())
+    return payload, blob
+
+
+def save_session(
+    path: Path, canvas: InkCanvas, board: Optional[AnswerBoard] = None
+) -> Path:
+    """Write ``canvas`` (and the answers on ``board``) to ``path`` atomically."""
+
+    path = Path(path)
+    strokes, points = _stroke_sections(canvas.store)
+    entries, images = _entry_sections(board)
+    sections = [(b"STRK", strokes), (b"PNTS", points), (b"ENTR", entries), (b"IMGS", images)]
+    header = _HEADER.pack(MAGIC, VERSION, 0, canvas.width, canvas.height, len(sections))
+    offset = len(header) + _SECTION.size * len(sections)
+    directory = bytearray()
+    for tag, data in sections:
+        offset += -offset % 8  # keep every section 8-byte aligned for zero-copy views
+        directory += _SECTION.pack(tag, offset, len(data))
+        offset += len(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(header)
+        fh.write(directory)
+        for (_, start, _), (_, data) in zip(_SECTION.iter_unpack(directory), sections):
+            fh.write(b"\0" * (start - fh.tell()))
+            fh.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+# -- reading ---------------------------------------------------------------------
+
+
+class SessionFile:
+    """A memory-mapped session; strokes and images are decoded only when requested."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            try:
+                self._map: Optional[mmap.mmap] = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise SessionFormatError(f"{self.path} is not a session file") from exc
+        self._view = memoryview(self._map)
+        if len(self._view) < _HEADER.size:
+            self.close()
+            raise SessionFormatError(f"{self.path} is not a session file")
+        magic, version, _flags, width, height, count = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise SessionFormatError(f"{self.path} is not a session file")
+        if version > VERSION:
+            self.close()
+            raise SessionFormatError(
+                f"Session format v{version} is newer than supported v{VERSION}"
+            )
+        self.version = version
+        self.width = width
+        self.height = height
+        self._sections: Dict[bytes, memoryview] = {}
+        for idx in range(count):
+            position = _HEADER.size + idx * _SECTION.size
+            tag, offset, length = _SECTION.unpack_from(self._view, position)
+            if offset + length > len(self._view):
+                self.close()
+                raise SessionFormatError(f"Section {tag!r} runs past the end of {self.path}")
+            self._sections[tag] = self._view[offset : offset + length]
+        self.strokes = np.frombuffer(self._section(b"STRK"), dtype=STROKE_DTYPE)
+        self._points = self._section(b"PNTS")
+        self._entries: Optional[List[SessionEntry]] = None
+        self._images: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def _section(self, tag: bytes) -> memoryview:
+        section = self._sections.get(tag)
+        return section if section is not None else memoryview(b"")
+
+    def __enter__(self) -> "SessionFile":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping. Arrays returned earlier are copies and stay valid."""
+
+        self.strokes = np.zeros(0, dtype=STROKE_DTYPE)
+        self._points = memoryview(b"")
+        self._sections = {}
+        if self._map is not None:
+            try:
+                self._view.release()
+                self._map.close()
+            except BufferError:  # a caller still holds a view; the map closes when it goes
+                pass
+            self._map = None
+
+    # -- strokes -----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.strokes)
+
+    @property
+    def total_points(self) -> int:
+        return int(self.strokes["npoints"].sum())
+
+    def points(self, index: int) -> np.ndarray:
+        """Decode stroke ``index`` into an ``(N, 2)`` ``int32`` array."""
+
+        record = self.strokes[index]
+        start = int(record["offset"])
+        data = self._points[start : start + int(record["nbytes"])]
+        return _decode_points(data, self.strokes["npoints"][index : index + 1].astype(np.int64))
+
+    def strokes_in(self, rect: Rect) -> np.ndarray:
+        """Indices of strokes whose bounds intersect ``rect`` (``x0, y0, x1, y1``)."""
+
+        bounds = self.strokes["bounds"]
+        x0, y0, x1, y1 = rect
+        hit = (
+            (self.strokes["npoints"] > 0)
+            & (bounds[:, 0] <= x1)
+            & (bounds[:, 2] >= x0)
+            & (bounds[:, 1] <= y1)
+            & (bounds[:, 3] >= y0)
+        )
+        return np.flatnonzero(hit)
+
+    def points_of(self, indices: Sequence[int]) -> List[np.ndarray]:
+        """Decode several strokes at once (one vectorized pass over their bytes)."""
+
+        records = self.strokes[np.asarray(indices, dtype=np.int64)]
+        if not len(records):
+            return []
+        nbytes = records["nbytes"].astype(np.int64)
+        # Gather the strokes' byte ranges into one buffer and decode it in one go.
+        shift = records["offset"].astype(np.int64) - (np.cumsum(nbytes) - nbytes)
+        gather = np.repeat(shift, nbytes) + np.arange(int(nbytes.sum()))
+        raw = np.frombuffer(self._points, dtype=np.uint8)[gather]
+        lengths = records["npoints"].astype(np.int64)
+        points = _decode_points(raw, lengths)
+        return np.split(points, np.cumsum(lengths)[:-1])
+
+    def iter_points(self, indices: Optional[Sequence[int]] = None) -> Iterator[np.ndarray]:
+        for index in range(len(self)) if indices is None else indices:
+            yield self.points(int(index))
+
+    def load_canvas(self, rect: Optional[Rect] = None) -> InkCanvas:
+        """Build an :class:`InkCanvas` from all strokes, or only those meeting ``rect``."""
+
+        if rect is None:
+            records = self.strokes
+            lengths = records["npoints"].astype(np.int64)
+            # Strokes are stored back to back, so everything decodes in one pass.
+            points = _decode_points(self._points, lengths)
+            blocks = np.split(points, np.cumsum(lengths)[:-1]) if len(records) else []
+        else:
+            indices = self.strokes_in(rect)
+            records = self.strokes[indices]
+            blocks = self.points_of(indices)
+        store = StrokeStore(
+            point_capacity=int(records["npoints"].sum()), stroke_capacity=len(records)
+        )
+        for record, block in zip(records, blocks):
+            color = (int(record["color"][0]), int(record["color"][1]), int(record["color"][2]))
+            store.new_stroke(color=color, thickness=int(record["thickness"])).extend(block)
+        return InkCanvas(self.width, self.height, store=store)
+
+    # -- answers -----------------------------------------------------------
+    @property
+    def entries(self) -> List[SessionEntry]:
+        if self._entries is None:
+            payload = self._section(b"ENTR")
+            data = json.loads(zlib.decompress(payload)) if len(payload) else []
+            self._entries = [SessionEntry.from_json(item) for item in data]
+        return self._entries
+
+    def _image_index(self) -> Dict[str, Tuple[int, int]]:
+        if self._images is None:
+            section = self._section(b"IMGS")
+            self._images = {}
+            if len(section):
+                (count,) = struct.unpack_from("<I", section)
+                base = 4 + count * _IMAGE_INDEX.size
+                for idx in range(count):
+                    digest, offset, length = _IMAGE_INDEX.unpack_from(
+                        section, 4 + idx * _IMAGE_INDEX.size
+                    )
+                    if offset < base - 4 or 4 + offset + length > len(section):
+                        raise SessionFormatError("Image data runs past its section")
+                    self._images[digest.hex()] = (4 + offset, length)
+        return self._images
+
+    def image(self, digest: str) -> bytes:
+        """Return the PNG bytes stored under ``digest``."""
+
+        try:
+            offset, length = self._image_index()[digest]
+        except KeyError:
+            raise SessionFormatError(f"No image {digest} in {self.path}") from None
+        return bytes(self._section(b"IMGS")[offset : offset + length])
+
+    def answer_board(self) -> AnswerBoard:
+        """Rebuild the :class:`~render.board.AnswerBoard`, with stored renders attached."""
+
+        from render.board import AnswerBoard, AnswerEntry
+
+        board = AnswerBoard()
+        for stored in self.entries:
+            rendered = None
+            if stored.image is not None:
+                from render.latex import LatexRenderResult
+
+                rendered = LatexRenderResult(
+                    image_bytes=self.image(stored.image),
+                    dpi=stored.dpi or 0,
+                    size_inches=stored.size_inches or (0.0, 0.0),
+                )
+            board.append(
+                AnswerEntry(
+                    timestamp=stored.timestamp,
+                    prompt=stored.prompt,
+                    latex=stored.latex,
+                    steps=list(stored.steps),
+                    numeric=stored.numeric,
+                    rendered=rendered,
+                )
+            )
+        return board
+
+
+def open_session(path: Path) -> SessionFile:
+    return SessionFile(path)
+
+
+__all__ = [
+    "SUFFIX",
+    "VERSION",
+    "SessionEntry",
+    "SessionFile",
+    "SessionFormatError",
+    "decode_varints",
+    "encode_varints",
+    "open_session",
+    "save_session",
+]
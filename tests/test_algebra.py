@@ -15,4 +15,4 @@ def test_linear_system():
     solution, steps = solve_equation([eq1, eq2])
     assert round(solution["x"], 5) == 2.0
     assert round(solution["y"], 5) == 3.0
-    assert any("cramer" in step.lower() for step in steps)
+    assert any("lu decomposition" in step.lower() for step in steps)
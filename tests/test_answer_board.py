@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+import render.board as board_module
+from render.board import AnswerBoard
+from render.latex import LatexRenderResult
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def fake_render(latex):
+        calls.append(latex)
+        return LatexRenderResult(image_bytes=f"png:{latex}".encode(), dpi=160, size_inches=(1, 1))
+
+    monkeypatch.setattr(board_module, "_render_entry", fake_render)
+    return calls
+
+
+def test_add_entry_does_not_wait_for_render(monkeypatch):
+    release = threading.Event()
+
+    def slow_render(latex):
+        release.wait(5)
+        return LatexRenderResult(image_bytes=b"png", dpi=160, size_inches=(1, 1))
+
+    monkeypatch.setattr(board_module, "_render_entry", slow_render)
+    board = AnswerBoard()
+    entry = board.add_entry("x+1=2", "x = 1", ["Solved"])
+    assert entry.poll() is None and board.latest() is entry
+    release.set()
+    assert board.render(entry).image_bytes == b"png"
+    assert entry.rendered is entry.poll()
+    board.close()
+
+
+def test_lazy_board_renders_on_first_display(renders):
+    board = AnswerBoard(background_render=False)
+    entry = board.add_entry("1+1", "2", [])
+    assert renders == [] and entry.poll() is None
+    assert board.render(entry).image_bytes == b"png:2"
+    board.render(entry)
+    assert renders == ["2"]
+
+
+def test_old_entries_spill_to_disk_and_reload(renders, tmp_path):
+    board = AnswerBoard(memory_entries=3, background_render=False, history_dir=tmp_path)
+    for idx in range(10):
+        entry = board.add_entry(f"x={idx}", str(idx), [f"step {idx}"], numeric=float(idx))
+        if idx % 2 == 0:
+            board.render(entry)
+    assert len(board) == 10 and board.in_memory == 3
+    assert (tmp_path / "entries.jsonl").exists()
+
+    first = board[0]
+    assert (first.latex, first.steps, first.numeric) == ("0", ["step 0"], 0.0)
+    assert first.rendered.image_bytes == b"png:0"
+    assert board[1].rendered is None  # spilled before it was displayed
+    assert board.render(board[1]).image_bytes == b"png:1"
+    assert board[0] is first  # reloaded entries are cached while scrolling
+    assert [e.latex for e in board.window(-4, None)] == ["6", "7", "8", "9"]
+    assert [e.latex for e in board.entries] == [str(idx) for idx in range(10)]
+    assert board.latest().latex == "9" and board[-1] is board.latest()
+    with pytest.raises(IndexError):
+        board[10]
+    board.close()
+    assert (tmp_path / "entries.jsonl").exists()  # caller-owned directories are kept
+
+
+def test_temporary_history_is_removed_on_close(renders):
+    board = AnswerBoard(memory_entries=1)
+    for idx in range(3):
+        board.add_entry("p", str(idx), [])
+    assert board[0].latex == "0"
+    directory = board._history.directory
+    assert directory.exists()
+    board.close()
+    assert not directory.exists() and len(board) == 0
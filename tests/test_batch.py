@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core.config import AppConfig
+from ocr.engine import BatchedEngine
+from pipeline.batch import (
+    BatchInput,
+    BatchOptions,
+    _render_name,
+    iter_inputs,
+    load_completed,
+    run_batch,
+)
+
+# The fake engine "reads" an expression from the image height.
+EXPRESSIONS = {20: "2x + 4 = 10", 30: "x^2 - 5x + 6 = 0", 40: "\\int_{0}^{1} x^2 dx", 50: "x +"}
+
+
+class HeightEngine(BatchedEngine):
+    name = "height"
+
+    def _forward(self, batch, sizes):
+        return [(EXPRESSIONS.get(height, ""), 0.9) for height, _ in sizes]
+
+
+def make_engine(config):
+    return HeightEngine()
+
+
+def _write_images(directory, heights):
+    directory.mkdir()
+    for idx, height in enumerate(heights):
+        cv2.imwrite(str(directory / f"sheet{idx:02d}.png"), np.full((height, 64, 3), 255, np.uint8))
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_iter_inputs_reads_directories_and_manifests(tmp_path):
+    _write_images(tmp_path / "scans", [20, 30])
+    (tmp_path / "scans" / "notes.txt").write_text("not an image")
+    assert [item.id for item in iter_inputs(tmp_path / "scans")] == ["sheet00.png", "sheet01.png"]
+
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text('# comment\n{"id": "a", "path": "scans/sheet00.png"}\nscans/sheet01.png\n')
+    items = list(iter_inputs(manifest))
+    assert items[0] == BatchInput("a", tmp_path / "scans" / "sheet00.png")
+    assert items[1].id == "scans/sheet01.png"
+
+
+def test_inline_batch_writes_records_and_renders(tmp_path):
+    _write_images(tmp_path / "scans", [20, 30, 40, 50, 60])
+    (tmp_path / "scans" / "broken.png").write_bytes(b"not a png")
+    output = tmp_path / "out.jsonl"
+    options = BatchOptions(
+        workers=0, chunk_size=4, solve_timeout_ms=None, render_dir=tmp_path / "r"
+    )
+    summary = run_batch(iter_inputs(tmp_path / "scans"), output, make_engine, AppConfig(), options)
+
+    records = {record["id"]: record for record in _records(output)}
+    assert summary.processed == len(records) == 6
+    assert records["sheet00.png"]["answer"] == "x = 3"
+    assert records["sheet01.png"]["kind"] == "equation"
+    assert records["sheet02.png"]["kind"] == "integral"
+    assert records["sheet03.png"]["error"]  # unparsable
+    assert records["sheet04.png"]["error"] == "Nothing recognized"
+    assert "Could not read image" in records["broken.png"]["error"]
+    render = Path(records["sheet00.png"]["render"])
+    assert render.parent == tmp_path / "r" and render.name.startswith("sheet00-")
+    assert render.read_bytes().startswith(b"\x89PNG")
+    assert summary.errors == 3
+
+
+def test_resume_skips_recorded_images_and_repairs_partial_line(tmp_path):
+    _write_images(tmp_path / "scans", [20, 30, 20])
+    output = tmp_path / "out.jsonl"
+    record = {"id": "sheet00.png", "error": None, "elapsed_ms": 1.0}
+    output.write_text(json.dumps(record) + "\n" + '{"id": "sheet01.png", "err')
+    assert load_completed(output) == {"sheet00.png"}
+    assert output.read_text().endswith("}\n")
+
+    options = BatchOptions(workers=0, solve_timeout_ms=None)
+    summary = run_batch(iter_inputs(tmp_path / "scans"), output, make_engine, AppConfig(), options)
+    assert (summary.skipped, summary.processed) == (1, 2)
+    assert [r["id"] for r in _records(output)] == ["sheet00.png", "sheet01.png", "sheet02.png"]
+
+
+def test_process_pool_loads_engine_once_per_worker(tmp_path):
+    _write_images(tmp_path / "scans", [20, 30] * 6)
+    output = tmp_path / "out.jsonl"
+    options = BatchOptions(workers=2, chunk_size=2, solve_timeout_ms=2000)
+    summary = run_batch(iter_inputs(tmp_path / "scans"), output, make_engine, AppConfig(), options)
+    records = _records(output)
+    assert summary.processed == 12 and summary.errors == 0
+    assert {r["answer"] for r in records} == {"x = 3", "x = 3, 2"}
+    assert len({r["worker"] for r in records}) <= 2
+
+
+def test_retry_errors_replaces_failed_records(tmp_path):
+    _write_images(tmp_path / "scans", [20, 60])
+    output = tmp_path / "out.jsonl"
+    options = BatchOptions(workers=0, solve_timeout_ms=None)
+    run_batch(iter_inputs(tmp_path / "scans"), output, make_engine, AppConfig(), options)
+    assert [r["error"] is None for r in _records(output)] == [True, False]
+
+    EXPRESSIONS[60] = "x = 1"
+    try:
+        retry = BatchOptions(workers=0, solve_timeout_ms=None, retry_errors=True)
+        only_first = [BatchInput("sheet00.png", tmp_path / "scans" / "sheet00.png")]
+        summary = run_batch(only_first, output, make_engine, AppConfig(), retry)
+        assert (summary.skipped, summary.processed) == (1, 0)  # only ids among the inputs
+        inputs = iter_inputs(tmp_path / "scans")
+        summary = run_batch(inputs, output, make_engine, AppConfig(), retry)
+    finally:
+        del EXPRESSIONS[60]
+    assert (summary.skipped, summary.processed, summary.errors) == (1, 1, 0)
+    records = _records(output)
+    assert [r["id"] for r in records] == ["sheet00.png", "sheet01.png"]
+    assert records[1]["answer"] == "x = 1"
+
+
+def test_render_names_never_collide():
+    ids = ["a.png", "a.jpg", "sub/a.png", "sub__a.png", "v1.2/scan", "v1.png"]
+    names = [_render_name(item_id) for item_id in ids]
+    assert len(set(names)) == len(ids)
+    assert all("/" not in name and name.endswith(".png") for name in names)
@@ -0,0 +1,50 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+SUITE = Path(__file__).resolve().parents[1] / "benchmarks" / "suite.py"
+
+
+def _load_suite():
+    spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve their module by name
+    spec.loader.exec_module(module)
+    return module
+
+
+def _results(**timings):
+    return {
+        "results": {
+            name: {"min_ms": ms, "median_ms": ms, "calibration_ms": cal}
+            for name, (ms, cal) in timings.items()
+        }
+    }
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    suite = _load_suite()
+    baseline = _results(fast=(10.0, 5.0), slow=(10.0, 5.0), tiny=(0.01, 5.0))
+    current = _results(fast=(11.0, 5.0), slow=(14.0, 5.0), tiny=(0.05, 5.0), new=(1.0, 5.0))
+    comparisons, regressions = suite.compare(baseline, current, threshold=0.25)
+    assert sorted(c.name for c in comparisons) == ["fast", "slow", "tiny"]
+    assert [r.name for r in regressions] == ["slow"]
+
+
+def test_compare_normalizes_by_calibration():
+    suite = _load_suite()
+    baseline = _results(case=(10.0, 5.0))
+    current = _results(case=(20.0, 10.0))  # the whole machine is twice as slow
+    _, regressions = suite.compare(baseline, current, threshold=0.25)
+    assert regressions == []
+    _, regressions = suite.compare(baseline, current, threshold=0.25, normalize=False)
+    assert [r.name for r in regressions] == ["case"]
+
+
+def test_quick_run_writes_results(tmp_path):
+    suite = _load_suite()
+    output = tmp_path / "results.json"
+    argv = ["--quick", "--filter", "solve.solve_triangles*", "--rounds", "1", "--min-time", "0"]
+    assert suite.main(argv + ["--output", str(output)]) == 0
+    assert suite.main(argv + ["--baseline", str(output), "--threshold", "100"]) == 0
+    assert "solve.solve_triangles[10000]" in output.read_text()
@@ -0,0 +1,44 @@
+import hashlib
+
+from core import bootstrap
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(bootstrap, "STAMP_PATH", tmp_path / "verified.json")
+    bootstrap.reset_session_checks()
+    calls = []
+    real = bootstrap._sha256
+    monkeypatch.setattr(bootstrap, "_sha256", lambda path: calls.append(path) or real(path))
+    return calls
+
+
+def test_unchanged_file_is_not_rehashed(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    weights = tmp_path / "weights.pt"
+    weights.write_bytes(b"model-bytes")
+    checksum = hashlib.sha256(b"model-bytes").hexdigest()
+
+    bootstrap.ensure_model(weights, "url", checksum)
+    bootstrap.ensure_model(weights, "url", checksum)
+    assert len(calls) == 1
+
+    bootstrap.reset_session_checks()
+    bootstrap.ensure_model(weights, "url", checksum)
+    assert len(calls) == 1
+
+    weights.write_bytes(b"new-model-bytes!")
+    bootstrap.reset_session_checks()
+    bootstrap.ensure_model(weights, "url", checksum)
+    assert len(calls) == 2
+
+
+def test_verify_models_checks_each_file_once(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    models = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name / "weights.pt"
+        path.parent.mkdir()
+        path.write_bytes(name.encode())
+        models.append((path, "url", hashlib.sha256(name.encode()).hexdigest()))
+    bootstrap.verify_models(models + models)
+    assert sorted(p.parent.name for p in calls) == ["a", "b", "c"]
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from nl.compiler import ExpressionCompileError, compile_expression
+from nl.expressions import Expression
+
+
+def test_compiled_expression_is_vectorized():
+    compiled = compile_expression(Expression.parse("3*x**2 - y/2 + 1"))
+    assert compiled.variables == ("x", "y")
+    x = np.linspace(-2.0, 2.0, 1001)
+    y = np.linspace(0.0, 1.0, 1001)
+    assert np.allclose(compiled(x, y), 3 * x**2 - y / 2 + 1)
+    assert np.allclose(compiled(x=x, y=2.0), 3 * x**2 - 1 + 1)
+
+
+def test_compile_is_cached_per_text():
+    assert compile_expression("x + 1") is compile_expression(Expression.parse("x + 1"))
+
+
+def test_constant_expression_broadcasts_and_follows_float_semantics():
+    assert compile_expression("2**3 - 1").scalar() == 7.0
+    assert compile_expression("1/0").scalar() == float("inf")
+    assert compile_expression("(0 - 2)**0.5 + x")(np.zeros(3)).shape == (3,)
+
+
+def test_missing_variable_and_bad_syntax():
+    with pytest.raises(ExpressionCompileError):
+        compile_expression("x + y")(1.0)
+    with pytest.raises(ExpressionCompileError):
+        compile_expression("f(x)")
+    with pytest.raises(ExpressionCompileError, match="too large"):
+        compile_expression("9" * 400 + " * x")
@@ -0,0 +1,134 @@
+import numpy as np
+
+from ink.canvas import InkCanvas
+from ink.spatial import StrokeIndex
+from ink.strokes import Stroke, StrokeStore
+
+
+def test_interleaved_strokes_keep_their_points():
+    store = StrokeStore(point_capacity=4, stroke_capacity=1)
+    first = store.new_stroke()
+    second = store.new_stroke(color=(255, 0, 0), thickness=5)
+    for i in range(10):
+        first.add_point((i, i))
+        second.add_point((100 + i, 50))
+    assert first.to_array().tolist() == [[i, i] for i in range(10)]
+    assert second.to_array()[:, 0].tolist() == list(range(100, 110))
+    assert second.color == (255, 0, 0)
+    assert second.thickness == 5
+    assert store.total_points == 20
+
+
+def test_to_array_is_read_only_view():
+    stroke = Stroke(points=[(1, 2), (3, 4)])
+    points = stroke.to_array()
+    assert points.dtype == np.int32
+    assert points.shape == (2, 2)
+    assert not points.flags.writeable
+
+
+def test_compact_preserves_strokes():
+    store = StrokeStore(point_capacity=2)
+    strokes = [store.new_stroke() for _ in range(3)]
+    for step in range(50):
+        for idx, stroke in enumerate(strokes):
+            stroke.add_point((idx, step))
+    store.compact()
+    for idx, stroke in enumerate(strokes):
+        assert stroke.to_array().tolist() == [[idx, step] for step in range(50)]
+
+
+def test_canvas_uses_store():
+    canvas = InkCanvas(width=64, height=32)
+    stroke = canvas.new_stroke()
+    stroke.extend([(2, 2), (60, 30)])
+    assert len(canvas.strokes) == 1
+    assert canvas.strokes[0] is stroke
+    img = canvas.to_image()
+    assert img.shape == (32, 64, 3)
+    assert img.min() < 255
+    canvas.clear()
+    assert len(canvas.strokes) == 0
+
+
+def test_incremental_render_matches_full_redraw():
+    canvas = InkCanvas(width=120, height=80)
+    stroke = canvas.new_stroke(thickness=2)
+    stroke.extend([(10, 10), (50, 10)])
+    canvas.render()
+    stroke.add_point((50, 60))
+    other = canvas.new_stroke()
+    other.extend([(80, 5), (110, 70)])
+    incremental = canvas.to_image()
+    fresh = InkCanvas(width=120, height=80, store=canvas.store).to_image()
+    assert np.abs(incremental.astype(int) - fresh.astype(int)).max() < 64
+
+
+def test_erase_repaints_dirty_region():
+    canvas = InkCanvas(width=100, height=100)
+    keep = canvas.new_stroke()
+    keep.extend([(10, 10), (10, 90)])
+    gone = canvas.new_stroke()
+    gone.extend([(50, 50), (90, 50)])
+    canvas.render()
+    canvas.erase(gone)
+    img = canvas.to_image()
+    assert len(canvas.strokes) == 1
+    assert img[40:60, 40:95].min() == 255
+    assert img[10:90, 10].max() < 255
+
+
+def test_spatial_queries_follow_new_points():
+    canvas = InkCanvas(width=500, height=500)
+    horizontal = canvas.new_stroke(thickness=2)
+    horizontal.extend([(10, 10), (400, 10)])
+    vertical = canvas.new_stroke(thickness=2)
+    vertical.add_point((200, 100))
+    vertical.add_point((200, 300))
+    assert canvas.select((190, 0, 210, 20)) == [horizontal]
+    assert canvas.select((0, 0, 499, 499), contained=True) == [horizontal, vertical]
+    assert canvas.strokes_near(203, 200, 3) == [vertical]
+    assert canvas.index.hit_test(300, 12) is horizontal
+    assert canvas.index.hit_test(300, 200) is None
+
+    vertical.add_point((450, 300))
+    assert canvas.strokes_near(440, 302, 3) == [vertical]
+
+
+def test_erase_at_removes_strokes_from_index():
+    canvas = InkCanvas(width=200, height=200)
+    stroke = canvas.new_stroke()
+    stroke.extend([(20, 20), (180, 180)])
+    keep = canvas.new_stroke()
+    keep.extend([(20, 180), (40, 180)])
+    assert canvas.erase_at(100, 100, 5) == [stroke]
+    assert list(canvas.strokes) == [keep]
+    assert canvas.select((0, 0, 199, 199)) == [keep]
+    canvas.clear()
+    assert canvas.select((0, 0, 199, 199)) == []
+
+
+def test_index_handles_huge_and_far_off_segments():
+    store = StrokeStore()
+    index = StrokeIndex(store)
+    far = store.new_stroke(thickness=2)
+    far.extend([(5, 5), (2**30, -(2**30)), (2**30, 2**30)])
+    local = store.new_stroke(thickness=2)
+    local.extend([(100, 100), (120, 100)])
+    assert len(index._grid) < 16
+    assert index.query_rect((0, 0, 200, 200)) == [far, local]
+    assert index.query_rect((-(2**31), -(2**31), 2**31, 2**31), contained=True) == [far, local]
+    assert index.query_radius(2**30, 0, 3) == [far]
+    assert index.hit_test(110, 101) is local
+    store.remove(far.index)
+    assert index.query_rect((0, 0, 200, 200)) == [local]
+
+
+def test_closed_canvas_stops_listening_to_a_shared_store():
+    store = StrokeStore()
+    views = [InkCanvas(32, 32, store=store) for _ in range(3)]
+    for view in views:
+        view.close()
+    assert store._listeners == []
+    store.new_stroke().extend([(1, 1), (30, 30)])
+    assert views[0].strokes_near(15, 15, 2) == []
@@ -1,5 +1,11 @@
+import math
+
+import pytest
+
+import pipeline.recognize as recognize_module
 from nl.expressions import Expression, IntegralExpr
-from solve.calculus import solve_integral
+from pipeline.recognize import Recognition, solve_parsed
+from solve.calculus import DEFAULT_NUMERIC_BUDGET_MS, CalculusError, solve_integral
 
 
 def test_polynomial_integral():
@@ -15,3 +21,45 @@ def test_indefinite_integral():
     result, steps, numeric = solve_integral(integral)
     assert result == {3: 1 / 3}
     assert numeric is None
+
+
+def test_numeric_fallback_for_non_polynomial_integrand():
+    bounds = Expression.parse("0"), Expression.parse("1")
+    integral = IntegralExpr(Expression.parse("1/(1 + x**2)"), "x", *bounds)
+    result, steps, numeric = solve_integral(integral)
+    assert result is None
+    assert abs(numeric - math.pi / 4) < 1e-10
+    assert any("numerically" in step.lower() for step in steps)
+
+
+def test_numeric_fallback_can_be_disabled():
+    bounds = Expression.parse("0"), Expression.parse("1")
+    integral = IntegralExpr(Expression.parse("x**0.5"), "x", *bounds)
+    with pytest.raises(RuntimeError):
+        solve_integral(integral, numeric_fallback=False)
+
+
+@pytest.mark.parametrize(
+    "upper, message",
+    [("1/0", "not a finite"), ("0/0", "not a finite"), ("10**400", "not a finite"),
+     ("9" * 400, "too large")],
+)
+def test_non_finite_bounds_are_rejected(upper, message):
+    bounds = Expression.parse("0"), Expression.parse(upper)
+    with pytest.raises(CalculusError, match=message):
+        solve_integral(IntegralExpr(Expression.parse("x"), "x", *bounds))
+
+
+def test_unset_pipeline_budget_keeps_the_default(monkeypatch):
+    budgets = []
+
+    def spy(obj, numeric_fallback=True, time_budget_ms=DEFAULT_NUMERIC_BUDGET_MS):
+        budgets.append(time_budget_ms)
+        return solve_integral(obj, numeric_fallback, time_budget_ms)
+
+    monkeypatch.setattr(recognize_module, "solve_integral", spy)
+    bounds = Expression.parse("0"), Expression.parse("1")
+    integral = IntegralExpr(Expression.parse("x**0.5"), "x", *bounds)
+    solve_parsed(integral, "integral", Recognition(), numeric_budget_ms=None)
+    solve_parsed(integral, "integral", Recognition(), numeric_budget_ms=50.0)
+    assert budgets == [DEFAULT_NUMERIC_BUDGET_MS, 50.0]
@@ -1,5 +1,9 @@
-from nl.latex_to_sympy import latex_to_sympy
-from nl.expressions import Equation, IntegralExpr
+import ast
+
+import pytest
+
+from nl.latex_to_sympy import LatexToSympyError, latex_to_sympy
+from nl.expressions import Equation, Expression, IntegralExpr
 
 
 def test_parse_equation():
@@ -23,3 +27,61 @@ def test_parse_integral_with_braces():
     assert expr.variable == "x"
     assert expr.lower.text == "0"
     assert expr.upper.text == "1"
+
+
+def test_parse_is_cached_on_normalized_latex():
+    first, _ = latex_to_sympy("x + 1 = 3")
+    second, _ = latex_to_sympy("  x  +\n1 = 3 ")
+    assert first is second
+
+
+def test_expression_metadata_is_computed_once():
+    eq, _ = latex_to_sympy("2 x + y = 7")
+    assert eq.variables == {"x", "y"}
+    assert eq.variables is eq.variables
+    assert eq.as_difference() is eq.as_difference()
+    assert eq.as_difference().variables == {"x", "y"}
+    assert eq.left.node_count == 5
+
+
+@pytest.mark.parametrize(
+    "latex, text",
+    [
+        (r"2x(x+1) - 3y", "2*x*(x+1)-3*y"),
+        (r"\frac{x+1}{2 y}", "(x+1)/(2*y)"),
+        (r"\sqrt{x^2 + 1} + \sqrt[3]{8}", "(x**2+1)**0.5+8**(1/3)"),
+        (r"\left( a - (b - c) \right) \cdot x_{1}^{-2}", "(a-(b-c))*x_1**-2"),
+        ("-x^2 + (-x)^{2}", "-x**2+(-x)**2"),
+        (r"\frac12 + \frac1{x} + \frac{3}4", "1/2+1/x+3/4"),
+        (r"\sqrt2 + \sqrt23 + \frac x y", "2**0.5+2**0.5*3+x/y"),
+    ],
+)
+def test_parser_builds_round_trippable_trees(latex, text):
+    expr, kind = latex_to_sympy(latex)
+    assert kind == "expr"
+    assert expr.text == text
+    assert ast.dump(Expression.parse(text).node) == ast.dump(expr.node)
+
+
+def test_multiline_integral_and_errors():
+    integral, kind = latex_to_sympy("\\int_{0}^{2} 3 t^{2} \\\\ \n + 1 \\, dt")
+    assert kind == "integral"
+    assert (integral.integrand.text, integral.variable) == ("3*t**2+1", "t")
+    split, _ = latex_to_sympy(r"\int_0^\sqrt23 x dx")
+    assert (split.upper.text, split.integrand.text) == ("2**0.5", "3*x")
+    empty, _ = latex_to_sympy(r"\int_0^1 dx")
+    assert (empty.integrand.text, empty.upper.text) == ("1", "1")
+    with pytest.raises(LatexToSympyError, match="differential"):
+        latex_to_sympy(r"\int_0^1 x^2")
+    with pytest.raises(LatexToSympyError, match="Unsupported"):
+        latex_to_sympy(r"\sin x")
+
+
+def test_keywords_and_oversized_numbers():
+    expr, _ = latex_to_sympy(r"\lambda x + \Lambda")
+    assert expr.text == "lamda*x+Lambda"
+    assert ast.dump(Expression.parse(expr.text).node) == ast.dump(expr.node)
+    with pytest.raises(LatexToSympyError, match="too long"):
+        latex_to_sympy("9" * 5001 + " x")
+    with pytest.raises(LatexToSympyError, match="too large"):
+        latex_to_sympy("9" * 400 + ".5 x")
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from nl.expressions import Equation, Expression
+from solve.algebra import LinearSystemError, build_linear_system, solve_equation
+
+
+def _eq(left: str, right: str) -> Equation:
+    return Equation(Expression.parse(left), Expression.parse(right))
+
+
+def test_three_by_three_system():
+    equations = [_eq("x + y + z", "6"), _eq("2*y + 5*z", "-4"), _eq("2*x + 5*y - z", "27")]
+    solution, steps = solve_equation(equations)
+    assert solution == pytest.approx({"x": 5.0, "y": 3.0, "z": -2.0})
+    assert any("3x3" in step for step in steps)
+
+
+def test_large_random_system_matches_numpy():
+    rng = np.random.default_rng(0)
+    size = 40
+    matrix = rng.normal(size=(size, size))
+    expected = rng.normal(size=size)
+    rhs = matrix @ expected
+    names = [f"v{i:02d}" for i in range(size)]
+    equations = [
+        _eq(" + ".join(f"({coeff!r})*{name}" for coeff, name in zip(row, names)), repr(value))
+        for row, value in zip(matrix, rhs)
+    ]
+    solution, _ = solve_equation(equations)
+    assert np.allclose([solution[name] for name in names], expected)
+
+
+def test_terms_on_both_sides_and_scaling():
+    matrix, rhs = build_linear_system([_eq("3*(x - 1)/2", "y + 4")], ["x", "y"])
+    assert matrix.tolist() == [[1.5, -1.0]]
+    assert rhs.tolist() == [5.5]
+
+
+def test_overdetermined_consistent_system_uses_least_squares():
+    equations = [_eq("x + y", "3"), _eq("x - y", "1"), _eq("2*x", "4")]
+    solution, steps = solve_equation(equations)
+    assert solution == pytest.approx({"x": 2.0, "y": 1.0})
+    assert any("least squares" in step for step in steps)
+
+
+def test_inconsistent_system_reports_rank():
+    with pytest.raises(LinearSystemError) as info:
+        solve_equation([_eq("x + y", "1"), _eq("x + y", "2")])
+    assert not info.value.consistent
+    assert info.value.rank == 1
+
+
+def test_rank_deficient_system():
+    with pytest.raises(LinearSystemError) as info:
+        solve_equation([_eq("x + y", "1"), _eq("2*x + 2*y", "2")])
+    assert info.value.consistent
+    assert (info.value.rank, info.value.unknowns) == (1, 2)
+
+
+def test_nonlinear_system_is_rejected():
+    with pytest.raises(Exception, match="not linear"):
+        solve_equation([_eq("x*y", "1"), _eq("x", "2")])
+
+
+@pytest.mark.parametrize(
+    "left, message",
+    [
+        ("2**99999*x + y", "too large"),
+        ("0**(-1)*x + y", "Division by zero"),
+        ("(-8)**0.5*x + y", "Complex"),
+        (f"{'9' * 400}*x + y", "too large"),
+        ("1e400*x + y", "not finite"),
+        ("1e200*x*1e200 + y", "not finite"),
+    ],
+)
+def test_invalid_constants_raise_linear_system_error(left, message):
+    with pytest.raises(LinearSystemError, match=message):
+        solve_equation([_eq(left, "1"), _eq("x - y", "0")])
+
+
+def test_long_sums_are_accumulated_without_recursion():
+    terms = 250
+    left = " + ".join(f"{idx % 7 + 1}*x + {idx % 5}*y + 1" for idx in range(terms))
+    matrix, rhs = build_linear_system([_eq(left, "0")], ["x", "y"])
+    expected = [sum(idx % 7 + 1 for idx in range(terms)), sum(idx % 5 for idx in range(terms))]
+    assert matrix[0].tolist() == expected
+    assert rhs[0] == -terms
@@ -0,0 +1,98 @@
+import csv
+import urllib.request
+
+import numpy as np
+import pytest
+
+from core.config import MetricsConfig
+from core.metrics import (
+    METRICS,
+    CsvMetricsWriter,
+    LatencyHistogram,
+    MetricsRegistry,
+    configure_metrics,
+    render_prometheus,
+    serve_prometheus,
+)
+
+
+def test_histogram_percentiles_are_close_to_exact():
+    samples = np.random.default_rng(0).lognormal(mean=2.0, sigma=1.0, size=20000)
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.observe(float(value))
+    summary = histogram.summary()
+    assert summary.count == samples.size
+    assert summary.sum_ms == pytest.approx(samples.sum())
+    for q, estimate in ((50, summary.p50_ms), (95, summary.p95_ms), (99, summary.p99_ms)):
+        assert estimate == pytest.approx(np.percentile(samples, q), rel=0.1)
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    with registry.span("ocr"):
+        pass
+    registry.increment("recognitions")
+    assert registry.span("ocr") is registry.span("parse")
+    snapshot = registry.snapshot()
+    assert snapshot.latencies == {} and snapshot.counters == {}
+    assert not METRICS.enabled
+
+
+def test_span_records_latency_and_errors():
+    ticks = iter([1.0, 1.25, 2.0, 2.5])
+    registry = MetricsRegistry(enabled=True, clock=lambda: next(ticks))
+    with registry.span("solve"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.span("solve"):
+            raise ValueError("boom")
+    snapshot = registry.snapshot()
+    assert snapshot.latencies["solve"].count == 2
+    assert snapshot.latencies["solve"].sum_ms == pytest.approx(750.0)
+    assert snapshot.counters == {"solve.errors": 1}
+
+
+def test_prometheus_text_and_endpoint():
+    registry = MetricsRegistry(enabled=True)
+    registry.observe("ocr", 12.0)
+    registry.increment("ocr.cache_hits", 3)
+    text = render_prometheus(registry.snapshot())
+    assert 'inkmath_stage_latency_milliseconds{stage="ocr",quantile="0.95"} 12' in text
+    assert 'inkmath_stage_latency_milliseconds_count{stage="ocr"} 1' in text
+    assert "inkmath_ocr_cache_hits_total 3" in text
+
+    server = serve_prometheus(registry, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.read().decode() == text
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_csv_writer_rotates_by_size(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    registry.observe("parse", 1.5)
+    writer = CsvMetricsWriter(tmp_path / "metrics.csv", max_bytes=1, backups=2)
+    for _ in range(4):
+        writer.write(registry.snapshot())
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["metrics.csv", "metrics.csv.1", "metrics.csv.2"]
+    with (tmp_path / "metrics.csv").open() as fh:
+        rows = list(csv.DictReader(fh))
+    assert rows[0]["name"] == "parse" and rows[0]["count"] == "1"
+
+
+def test_configure_metrics_exports_on_close(tmp_path):
+    registry = MetricsRegistry()
+    config = MetricsConfig(enabled=True, directory=str(tmp_path), interval_s=60)
+    exporter = configure_metrics(config, registry)
+    assert registry.enabled and exporter is not None
+    registry.observe("render", 3.0)
+    exporter.close()
+    assert "stage=\"render\"" in (tmp_path / "metrics.prom").read_text()
+    assert "render" in (tmp_path / "metrics.csv").read_text()
+    assert configure_metrics(MetricsConfig(), registry) is None
+    assert not registry.enabled
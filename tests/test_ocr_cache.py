@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+from ocr.cache import CachedEngine, OcrCache, cache_key
+from ocr.engine import BatchedEngine
+
+
+class CountingEngine(BatchedEngine):
+    name = "counting"
+    model_checksum = "abc"
+
+    def __init__(self):
+        self.seen = 0
+
+    def _forward(self, batch, sizes):
+        self.seen += len(sizes)
+        return [("x+1", 0.9) for _ in sizes]
+
+
+def _ink(offset=(0, 0), size=(120, 300)):
+    img = np.full(size + (3,), 255, dtype=np.uint8)
+    x, y = offset
+    cv2.putText(img, "x+1", (20 + x, 70 + y), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3)
+    return img
+
+
+def test_key_ignores_position_and_padding():
+    a = cache_key(_ink(), "e", "m")
+    b = cache_key(_ink(offset=(40, 10), size=(200, 400)), "e", "m")
+    assert a == b
+    assert cache_key(_ink(), "e", "other-model") != a
+
+
+def test_cached_engine_skips_repeat_inference():
+    engine = CountingEngine()
+    cached = CachedEngine(engine, OcrCache(max_entries=4))
+    first = cached.infer(_ink())
+    second = cached.infer(_ink(offset=(15, 5)))
+    assert first == second == {"latex": "x+1", "confidence": 0.9}
+    assert engine.seen == 1
+    assert cached.cache.hits == 1
+
+
+def test_lru_eviction_and_disk_persistence(tmp_path):
+    cache = OcrCache(max_entries=2, directory=tmp_path)
+    for key in ("a1", "b2", "c3"):
+        cache.put(key, {"latex": key, "confidence": 1.0})
+    assert "a1" not in cache._entries
+    assert cache.get("a1") == {"latex": "a1", "confidence": 1.0}
+
+    reopened = OcrCache(max_entries=2, directory=tmp_path)
+    assert reopened.get("c3")["latex"] == "c3"
+    assert OcrCache(max_entries=2).get("c3") is None
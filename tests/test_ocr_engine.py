@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from ocr.engine import BatchedEngine
+
+
+class EchoEngine(BatchedEngine):
+    name = "echo"
+
+    def __init__(self):
+        self.calls = []
+
+    def _forward(self, batch, sizes):
+        self.calls.append(batch.shape)
+        return [(f"{h}x{w} − 1", 0.5) for h, w in sizes]
+
+
+def test_batch_buckets_and_pads_crops():
+    engine = EchoEngine()
+    images = [
+        np.full((30, 60, 3), 255, dtype=np.uint8),
+        np.full((20, 50, 3), 255, dtype=np.uint8),
+        np.full((100, 40), 255, dtype=np.uint8),
+    ]
+    result = engine.infer_batch(images)
+    assert [item["latex"] for item in result.items] == ["30x60 - 1", "20x50 - 1", "100x40 - 1"]
+    assert sorted(engine.calls) == [(1, 128, 64), (2, 32, 64)]
+    assert result.buckets == 2
+    assert result.elapsed_ms >= 0
+
+
+def test_infer_is_batch_of_one():
+    engine = EchoEngine()
+    item = engine.infer(np.zeros((10, 10, 3), dtype=np.uint8))
+    assert item == {"latex": "10x10 - 1", "confidence": 0.5}
+    assert engine.calls == [(1, 32, 32)]
+
+
+def test_max_batch_splits_large_buckets():
+    engine = EchoEngine()
+    engine.max_batch = 2
+    engine.infer_batch([np.zeros((8, 8), dtype=np.uint8)] * 5)
+    assert [shape[0] for shape in engine.calls] == [2, 2, 1]
+
+
+def test_engine_without_forward_fails_at_construction():
+    class Incomplete(BatchedEngine):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="_forward"):
+        Incomplete()
+
+
+def test_short_forward_output_is_an_error():
+    class Lossy(EchoEngine):
+        def _forward(self, batch, sizes):
+            return super()._forward(batch, sizes)[:-1]
+
+    with pytest.raises(RuntimeError, match="returned 1 results for 2 images"):
+        Lossy().infer_batch([np.zeros((8, 8), dtype=np.uint8)] * 2)
@@ -1,4 +1,4 @@
-from ocr.normalize import normalize_text
+from ocr.normalize import normalize_batch, normalize_text
 
 
 def test_minus_variants():
@@ -11,3 +11,14 @@ def test_angle_and_degree():
 
 def test_l_vs_one():
     assert normalize_text("l + O") == "1 + 0"
+
+
+def test_context_sensitive_rewrites():
+    assert normalize_text("∠ l +  l\n\\mathrm{dx}") == "\\anglel + 1 dx"
+    assert normalize_text("  x \\angle  \tmathrm{dx} ") == "x \\angle dx"
+
+
+def test_batch_matches_single_and_dedupes():
+    candidates = ["l + O", "x − 2", "l + O", "∠A = 3°", "", "a\x00 l"]
+    assert normalize_batch(candidates) == [normalize_text(text) for text in candidates]
+    assert normalize_batch(candidates[:4]) == [normalize_text(text) for text in candidates[:4]]
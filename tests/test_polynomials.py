@@ -0,0 +1,46 @@
+import ast
+
+import numpy as np
+import pytest
+
+from solve.algebra import AlgebraError
+from solve.polynomials import Polynomial, from_ast, poly_from_ast
+
+
+def _parse(text):
+    return ast.parse(text, mode="eval").body
+
+
+def test_power_by_squaring_matches_binomial_coefficients():
+    poly = Polynomial([1.0, 1.0]) ** 5
+    assert poly.coeffs.tolist() == [1, 5, 10, 10, 5, 1]
+
+
+def test_from_ast_handles_large_exponent_and_division():
+    poly = poly_from_ast(_parse("x**5000/2 - 3*x + 1"), "x")
+    assert poly.degree == 5000
+    assert poly.coeffs[5000] == 0.5
+    assert from_ast(_parse("(x + 1)**2"), "x") == {0: 1.0, 1: 2.0, 2: 1.0}
+
+
+def test_integrate_and_vectorized_horner():
+    poly = Polynomial([1.0, 0.0, 3.0])
+    integral = poly.integrate()
+    assert integral.to_dict() == {1: 1.0, 3: 1.0}
+    xs = np.array([0.0, 1.0, 2.0])
+    assert np.allclose(integral(xs), xs + xs**3)
+    assert poly(2.0) == 13.0
+
+
+def test_unreasonable_degree_is_rejected():
+    with pytest.raises(AlgebraError):
+        poly_from_ast(_parse("x**1000000000"), "x")
+    # Products of in-range factors are capped too, before the convolution runs.
+    with pytest.raises(AlgebraError, match="exceeds"):
+        poly_from_ast(_parse("x**60000 * x**60000"), "x")
+
+
+@pytest.mark.parametrize("text", ["2**99999 * x - 1", "10**400 * x", "(1e200 * x) ** 2 - 1"])
+def test_overflowing_coefficients_are_rejected(text):
+    with pytest.raises(AlgebraError, match="too large|not finite"):
+        poly_from_ast(_parse(text), "x")
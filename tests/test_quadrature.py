@@ -0,0 +1,22 @@
+import numpy as np
+
+from solve.quadrature import integrate, integrate_batch
+
+
+def test_batched_bounds_match_closed_form():
+    upper = np.linspace(0.5, 4.0, 200)
+    result = integrate_batch(lambda x: np.exp(-x) * x, 0.0, upper)
+    expected = 1.0 - np.exp(-upper) * (upper + 1.0)
+    assert result.all_converged
+    assert np.allclose(result.values, expected, atol=1e-9)
+    assert np.all(result.errors < 1e-8)
+
+
+def test_reversed_bounds_flip_sign():
+    result = integrate(lambda x: x**2, 1.0, 0.0)
+    assert abs(float(result.values) + 1 / 3) < 1e-12
+
+
+def test_singular_integrand_is_flagged_when_budget_runs_out():
+    result = integrate(lambda x: 1.0 / x, 0.0, 1.0, time_budget_ms=5.0, max_intervals=256)
+    assert not result.all_converged
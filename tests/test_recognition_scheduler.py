@@ -0,0 +1,82 @@
+import threading
+import time
+
+from pipeline.recognize import Recognition, recognize
+from pipeline.scheduler import RecognitionScheduler
+from render.board import AnswerBoard
+
+
+class FakeEngine:
+    def __init__(self, latex, confidence=0.9):
+        self.latex = latex
+        self.confidence = confidence
+
+    def infer(self, img_bgr):
+        return {"latex": self.latex, "confidence": self.confidence}
+
+
+def _wait_for(scheduler, board=None, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        results = scheduler.poll(board)
+        if results:
+            return results
+        time.sleep(0.005)
+    return []
+
+
+def test_recognize_solves_equation():
+    result = recognize(None, FakeEngine("x^2 - 5 x + 6 = 0"))
+    assert result.ok
+    assert result.kind == "equation"
+    assert "3" in result.answer and "2" in result.answer
+
+
+def test_recognize_reports_low_confidence():
+    result = recognize(None, FakeEngine("x = 1", confidence=0.1), min_confidence=0.4)
+    assert not result.ok
+    assert "confidence" in result.error
+
+
+def test_burst_is_coalesced_into_one_run():
+    seen = []
+
+    def pipeline(image):
+        seen.append(image)
+        return Recognition(latex=str(image), answer=str(image))
+
+    scheduler = RecognitionScheduler(pipeline, debounce_ms=50)
+    try:
+        for i in range(5):
+            scheduler.submit(i)
+        board = AnswerBoard()
+        results = _wait_for(scheduler, board)
+        assert [r.recognition.answer for r in results] == ["4"]
+        assert seen == [4]
+        assert scheduler.coalesced == 4
+        assert board.latest().latex == "4"
+    finally:
+        scheduler.close()
+
+
+def test_result_for_superseded_request_is_dropped():
+    started = threading.Event()
+    release = threading.Event()
+
+    def pipeline(image):
+        if image == "slow":
+            started.set()
+            release.wait(2.0)
+        return Recognition(latex=image, answer=image)
+
+    scheduler = RecognitionScheduler(pipeline, debounce_ms=0)
+    try:
+        scheduler.submit("slow")
+        assert started.wait(2.0)
+        scheduler.submit("fresh")
+        release.set()
+        results = _wait_for(scheduler)
+        assert [r.recognition.answer for r in results] == ["fresh"]
+        assert scheduler.dropped == 1
+    finally:
+        scheduler.close()
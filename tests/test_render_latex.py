@@ -0,0 +1,25 @@
+import numpy as np
+
+from render.latex import clear_render_cache, render_latex
+
+
+def test_png_and_array_outputs_agree():
+    clear_render_cache()
+    png = render_latex("x^2 + 1")
+    arr = render_latex("x^2 + 1", as_array=True)
+    assert png.image_bytes.startswith(b"\x89PNG")
+    assert arr.image_bytes == b""
+    assert arr.rgba.shape[2] == 4
+    assert np.array_equal(png.to_rgba(), arr.rgba)
+    assert arr.size_inches == (arr.rgba.shape[1] / 160, arr.rgba.shape[0] / 160)
+
+
+def test_results_are_memoized_per_theme():
+    clear_render_cache()
+    first = render_latex("y = 3", as_array=True, theme="dark")
+    again = render_latex("y = 3", as_array=True, theme="dark")
+    light = render_latex("y = 3", as_array=True, theme="light")
+    assert first.rgba is again.rgba
+    assert not first.rgba.flags.writeable
+    assert first.rgba[0, 0, 0] < 64
+    assert light.rgba[0, 0, 0] == 255
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from nl.expressions import Equation, Expression
+from solve.algebra import AlgebraError, solve_equation
+from solve.roots import (
+    MAX_ROOT_DEGREE,
+    RootFindingError,
+    polynomial_roots,
+    polynomial_roots_batch,
+)
+
+
+def test_cubic_equation_is_solved():
+    eq = Equation(Expression.parse("x**3 - 6*x**2 + 11*x - 6"), Expression.parse("0"))
+    solutions, steps = solve_equation(eq)
+    assert sorted(round(s, 9) for s in solutions) == [1.0, 2.0, 3.0]
+    assert all(isinstance(s, float) for s in solutions)
+    assert any("companion" in step for step in steps)
+
+
+def test_quartic_with_complex_roots():
+    roots = polynomial_roots([-1.0, 0.0, 0.0, 0.0, 1.0])  # x**4 - 1
+    assert np.allclose(sorted(roots.real), [-1.0, 1.0])
+    assert np.allclose(sorted(roots.complex.imag), [-1.0, 1.0])
+    assert roots.is_real.sum() == 2
+
+
+def test_batch_mixes_degrees_and_preserves_order():
+    rows = [
+        [-2.0, 1.0],  # x - 2
+        [6.0, -5.0, 1.0],  # (x - 2)(x - 3)
+        [-6.0, 11.0, -6.0, 1.0, 0.0],  # padded cubic
+        [5.0],  # constant: no roots
+    ]
+    results = polynomial_roots_batch(rows)
+    assert np.allclose(results[0].real, [2.0])
+    assert np.allclose(results[1].real, [2.0, 3.0])
+    assert np.allclose(results[2].real, [1.0, 2.0, 3.0])
+    assert len(results[3].values) == 0
+
+
+def test_zero_polynomial_is_rejected():
+    with pytest.raises(RootFindingError):
+        polynomial_roots([0.0, 0.0])
+    with pytest.raises(AlgebraError):
+        solve_equation(Equation(Expression.parse("x - x"), Expression.parse("0")))
+
+
+def test_badly_scaled_polynomial_is_rejected():
+    with pytest.raises(RootFindingError, match="badly scaled"):
+        polynomial_roots([1e300, 0.0, 0.0, 1e-300])
+    with pytest.raises(AlgebraError):
+        solve_equation(Equation(Expression.parse("(0.6*x + 0.4)**2000"), Expression.parse("0")))
+
+
+def test_bad_rows_fail_alone_in_a_batch():
+    rows = [[-2.0, 1.0], [0.0, 0.0], [1e300, 0.0, 0.0, 1e-300], [6.0, -5.0, 1.0]]
+    results = polynomial_roots_batch(rows)
+    assert [r.ok for r in results] == [True, False, False, True]
+    assert "infinitely many" in results[1].error and "badly scaled" in results[2].error
+    assert np.allclose(results[3].real, [2.0, 3.0])
+    with pytest.raises(RootFindingError):
+        results[1].as_list()
+
+
+def test_degree_above_limit_is_refused_before_solving():
+    coeffs = [-1.0] + [0.0] * MAX_ROOT_DEGREE + [1.0]
+    with pytest.raises(RootFindingError, match="root-finding limit"):
+        polynomial_roots(coeffs)
+    assert len(polynomial_roots(coeffs[:1] + coeffs[2:]).values) == MAX_ROOT_DEGREE
+    with pytest.raises(AlgebraError, match="root-finding limit"):
+        solve_equation(Equation(Expression.parse("x**1000"), Expression.parse("1")))
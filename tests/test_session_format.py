@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ink.canvas import InkCanvas
+from render.board import AnswerBoard, AnswerEntry
+from render.latex import LatexRenderResult
+from storage.session import (
+    SessionFormatError,
+    decode_varints,
+    encode_varints,
+    open_session,
+    save_session,
+)
+
+
+def _canvas(strokes=50, seed=0):
+    rng = np.random.default_rng(seed)
+    canvas = InkCanvas(1280, 720)
+    for idx in range(strokes):
+        start = rng.integers((0, 0), (1280, 720))
+        points = start + np.cumsum(rng.integers(-5, 6, size=(rng.integers(1, 80), 2)), axis=0)
+        canvas.new_stroke(color=(idx % 256, 0, 255), thickness=1 + idx % 5).extend(points)
+    canvas.new_stroke()  # empty strokes survive too
+    return canvas
+
+
+def test_varints_round_trip_int32_range():
+    values = np.array([0, 1, -1, 63, -64, 64, 300, -300, 2**31 - 1, -(2**31)])
+    data = encode_varints(values)
+    assert len(encode_varints(np.array([5, -5]))) == 2
+    np.testing.assert_array_equal(decode_varints(data), values)
+    with pytest.raises(SessionFormatError):
+        decode_varints(data[:-1])
+
+
+def test_strokes_round_trip_and_are_compact(tmp_path):
+    canvas = _canvas()
+    path = save_session(tmp_path / "board.inkm", canvas)
+    raw_bytes = canvas.store.total_points * 8
+    with open_session(path) as session:
+        assert (session.width, session.height, len(session)) == (1280, 720, 51)
+        assert session.total_points == canvas.store.total_points
+        assert len(session._points) < raw_bytes / 3
+        loaded = session.load_canvas()
+    for original, restored in zip(canvas.strokes, loaded.strokes):
+        np.testing.assert_array_equal(original.points, restored.points)
+        assert (original.color, original.thickness) == (restored.color, restored.thickness)
+        assert original.bounds == restored.bounds
+    np.testing.assert_array_equal(canvas.to_image(), loaded.to_image())
+
+
+def test_viewport_loading_decodes_only_visible_strokes(tmp_path):
+    canvas = _canvas(strokes=200, seed=1)
+    path = save_session(tmp_path / "board.inkm", canvas)
+    rect = (0, 0, 300, 200)
+    expected = [s.index for s in canvas.select(rect)]
+    with open_session(path) as session:
+        visible = session.strokes_in(rect)
+        assert set(expected) <= set(visible.tolist()) and len(visible) < len(session)
+        decoded = session.points_of(visible)
+        for index, points in zip(visible.tolist(), decoded):
+            np.testing.assert_array_equal(points, canvas.strokes[index].points)
+        np.testing.assert_array_equal(session.points(int(visible[0])), decoded[0])
+        partial = session.load_canvas(rect)
+    assert len(partial.strokes) == len(visible)
+
+
+def test_answers_reference_deduplicated_images(tmp_path):
+    png = b"\x89PNG fake image bytes"
+    rendered = LatexRenderResult(image_bytes=png, dpi=160, size_inches=(1.0, 0.5))
+    board = AnswerBoard()
+    for idx in range(3):
+        stamp = datetime(2024, 5, 1, 12, idx)
+        board.append(AnswerEntry(stamp, "x^2=4", "x = 2, -2", ["Solved"], 2.0, rendered))
+    board.append(AnswerEntry(datetime(2024, 5, 1), "1+1", "2", [], None, None))
+    path = save_session(tmp_path / "board.inkm", InkCanvas(10, 10), board)
+    assert path.read_bytes().count(png) == 1
+    with open_session(path) as session:
+        assert [e.latex for e in session.entries] == ["x = 2, -2"] * 3 + ["2"]
+        digest = session.entries[0].image
+        assert session.image(digest) == png
+        restored = session.answer_board()
+    assert restored.entries[0].rendered.image_bytes == png
+    assert restored.entries[0].rendered.size_inches == (1.0, 0.5)
+    assert restored.entries[3].rendered is None
+    assert restored.latest().timestamp == datetime(2024, 5, 1)
+
+
+def test_rejects_foreign_and_newer_files(tmp_path):
+    bogus = tmp_path / "bogus.inkm"
+    bogus.write_bytes(b"not a session file at all")
+    with pytest.raises(SessionFormatError):
+        open_session(bogus)
+    path = save_session(tmp_path / "board.inkm", InkCanvas(10, 10))
+    data = bytearray(path.read_bytes())
+    data[8] = 99  # version
+    path.write_bytes(bytes(data))
+    with pytest.raises(SessionFormatError, match="newer"):
+        open_session(path)
@@ -0,0 +1,40 @@
+from ink.shapes import TriangleDetector
+from ink.strokes import StrokeStore
+
+
+def _triangle(store, x, y, size=200):
+    return store.new_stroke(points=[(x, y), (x + size, y), (x + size // 2, y + size), (x, y)])
+
+
+def test_detects_triangle_outside_legacy_mask():
+    store = StrokeStore()
+    _triangle(store, 1500, 900)
+    triangles = TriangleDetector().detect(list(store))
+    assert len(triangles) == 1
+    xs = [x for x, _ in triangles[0].vertices]
+    assert min(xs) >= 1490 and max(xs) <= 1710
+
+
+def test_downsampled_detection_maps_back_to_canvas():
+    store = StrokeStore()
+    _triangle(store, 100, 100, size=300)
+    triangles = TriangleDetector(scale=0.5).detect(list(store))
+    assert len(triangles) == 1
+    for x, y in triangles[0].vertices:
+        assert 90 <= x <= 410 and 90 <= y <= 410
+
+
+def test_unchanged_groups_are_cached(monkeypatch):
+    store = StrokeStore()
+    _triangle(store, 0, 0)
+    _triangle(store, 600, 0)
+    detector = TriangleDetector()
+    assert len(detector.detect(list(store))) == 2
+
+    calls = []
+    original = detector._detect_group
+    monkeypatch.setattr(detector, "_detect_group", lambda group: calls.append(group) or original(group))
+    store.new_stroke(points=[(650, 20), (700, 20)])
+    assert len(detector.detect(list(store))) == 2
+    assert len(calls) == 1
+    assert len(calls[0]) == 2
@@ -0,0 +1,49 @@
+import pytest
+
+from nl.expressions import Equation, Expression, IntegralExpr
+from solve.executor import SolveExecutor, SolveExecutorError
+
+# Finite but slow: four degree-99999 expansions take seconds before the solver gives up.
+SLOW = " + ".join(f"(0.{k}*x + 0.{10 - k})**99999" for k in (6, 7, 8, 9))
+
+
+def _eq(left: str, right: str) -> Equation:
+    return Equation(Expression.parse(left), Expression.parse(right))
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with SolveExecutor(workers=1, timeout_ms=5000, max_jobs_per_worker=3) as pool:
+        yield pool
+
+
+def test_dispatches_each_solver_kind(executor):
+    solutions, _ = executor.solve("equation", _eq("x**2 - 5*x + 6", "0")).unwrap()
+    assert sorted(round(s, 6) for s in solutions) == [2.0, 3.0]
+    bounds = Expression.parse("0"), Expression.parse("2")
+    integral = IntegralExpr(Expression.parse("x"), "x", *bounds)
+    assert executor.solve("integral", integral).unwrap()[2] == pytest.approx(2.0)
+    solution, _ = executor.solve("triangle", {"a": 3.0, "b": 4.0, "right_at": "C"}).unwrap()
+    assert solution["c"] == pytest.approx(5.0)
+    assert executor.recycled >= 1
+
+
+def test_solver_errors_are_returned_as_outcomes(executor):
+    outcome = executor.solve("triangle", {"a": 3.0})
+    assert outcome.status == "error"
+    assert "Insufficient information" in outcome.error
+    with pytest.raises(SolveExecutorError):
+        outcome.unwrap()
+
+
+def test_pathological_job_times_out_and_worker_recovers(executor):
+    outcome = executor.solve("equation", _eq(SLOW, "1"), timeout_ms=300)
+    assert outcome.status == "timeout"
+    assert outcome.elapsed_ms < 2000
+    assert executor.solve("equation", _eq("2*x", "4")).unwrap()[0] == [2.0]
+
+
+def test_running_job_can_be_cancelled(executor):
+    job = executor.submit("equation", _eq(SLOW, "1"))
+    assert job.cancel()
+    assert job.result(timeout=5).status == "cancelled"
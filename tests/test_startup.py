@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from core.lazy import lazy_module
+from core.profiling import StartupProfiler
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_lazy_module_imports_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_mod.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    proxy = lazy_module("lazy_probe_mod")
+    assert "lazy_probe_mod" not in sys.modules
+    assert proxy.VALUE == 42
+    assert proxy.loaded
+    assert "lazy_probe_mod" in sys.modules
+
+
+def test_profiler_records_new_imports_and_stages(tmp_path, monkeypatch):
+    (tmp_path / "profiled_probe_mod.py").write_text("import json\nX = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler = StartupProfiler().install()
+    try:
+        with profiler.stage("probe"):
+            import profiled_probe_mod  # noqa: F401
+    finally:
+        profiler.uninstall()
+    report = profiler.report()
+    assert [stage["name"] for stage in report["stages"]] == ["probe"]
+    assert "profiled_probe_mod" in {item["module"] for item in report["imports"]}
+    out = tmp_path / "profile.json"
+    profiler.write_json(out)
+    assert out.read_text().startswith("{")
+
+
+def test_importing_entry_point_defers_heavy_modules():
+    code = (
+        "import sys, run\n"
+        "heavy = [m for m in ('cv2', 'numpy', 'matplotlib', 'pydantic', 'torch') if m in sys.modules]\n"
+        "print(','.join(heavy))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == ""
@@ -1,6 +1,13 @@
+import numpy as np
 import pytest
 
-from solve.triangle import TriangleError, solve_triangle
+from solve.triangle import (
+    STATUS_NAMES,
+    STATUS_OK,
+    TriangleError,
+    solve_triangle,
+    solve_triangles,
+)
 
 
 def test_right_triangle():
@@ -28,3 +35,38 @@ def test_insufficient_data():
 def test_inconsistent_law_of_sines_inputs():
     with pytest.raises(TriangleError):
         solve_triangle({"a": 1.0, "A": 30.0, "b": 100.0})
+
+
+def test_batch_matches_scalar_solver():
+    nan = float("nan")
+    batch = solve_triangles(
+        {"a": [3.0, 7.0, nan], "b": [4.0, 8.0, 5.0], "c": [nan, nan, nan], "C": [nan, 30.0, nan],
+         "A": [nan, nan, 40.0], "B": [nan, nan, 60.0]},
+        right_at=["C", None, ""],
+    )
+    assert batch.status.tolist() == [STATUS_OK, STATUS_OK, STATUS_OK]
+    for row, measurements in enumerate(
+        [{"a": 3.0, "b": 4.0, "right_at": "C"}, {"a": 7.0, "b": 8.0, "C": 30.0}]
+    ):
+        expected, _ = solve_triangle(measurements)
+        assert batch.row(row) == pytest.approx(expected)
+    assert batch.row(2)["C"] == pytest.approx(80.0)
+
+
+def test_batch_status_codes():
+    nan = float("nan")
+    batch = solve_triangles(
+        {
+            "a": [6.0, 1.0, 5.0, -1.0, 3.0],
+            "b": [8.0, 100.0, 6.0, 2.0, 4.0],
+            "c": [nan, nan, nan, nan, 5.0],
+            "A": [30.0, 30.0, nan, nan, 10.0],
+        }
+    )
+    assert [STATUS_NAMES[s] for s in batch.status] == [
+        "ambiguous", "inconsistent", "insufficient", "invalid", "inconsistent"
+    ]
+    assert batch.solved.tolist() == [True, False, False, False, False]
+    assert np.isnan(batch.sides[1:]).all()
+    acute = batch.row(0)["B"]
+    assert acute == pytest.approx(41.8103149, rel=1e-6)